@@ -1,6 +1,6 @@
 """Mock authentication endpoints for development (mimics Supertokens API)"""
 
-from fastapi import APIRouter, Response, Request, Cookie
+from fastapi import APIRouter, Response, Request, Cookie, Depends
 from pydantic import BaseModel
 from typing import Optional
 from loguru import logger
@@ -8,7 +8,12 @@ import uuid
 import time
 import json
 import base64
+from datetime import datetime, timedelta
+from app.config import settings
 from app.core.database import db
+from app.core.tokens import issue_access_token, read_access_token
+from app.dependencies import get_session_repository
+from app.repositories.session_repository import SessionRepository
 
 router = APIRouter()
 
@@ -16,9 +21,6 @@ router = APIRouter()
 def get_auth_codes_collection():
     return db.db.auth_codes
 
-def get_sessions_collection():
-    return db.db.sessions
-
 
 class CreateCodeRequest(BaseModel):
     """Request to create a passwordless login code"""
@@ -44,7 +46,7 @@ async def create_passwordless_code(request: CreateCodeRequest):
     Create a passwordless login code (mock for development).
 
     In production, this would send an SMS with the code.
-    For development, we log the code to the console.
+    For development, the code is logged when DEBUG is on.
     """
     logger.info(f"POST /login/signinup/code - phone={request.phoneNumber}")
 
@@ -60,16 +62,19 @@ async def create_passwordless_code(request: CreateCodeRequest):
             "$set": {
                 "code": code,
                 "preAuthSessionId": pre_auth_session_id,
-                "createdAt": time.time()
+                # BSON date so the TTL index on auth_codes can expire it
+                "createdAt": datetime.utcnow()
             }
         },
         upsert=True
     )
 
-    logger.info(f"=== LOGIN CODE FOR {request.phoneNumber} ===")
-    logger.info(f"Code: {code}")
-    logger.info(f"PreAuthSessionId: {pre_auth_session_id}")
-    logger.info(f"=====================================")
+    # Development stand-in for the SMS; never log codes outside DEBUG
+    if settings.DEBUG:
+        logger.debug(
+            f"Login code for {request.phoneNumber}: {code} "
+            f"(preAuthSessionId={pre_auth_session_id})"
+        )
 
     # Also write to file for easy retrieval
     with open("/tmp/otp_latest.json", "w") as f:
@@ -89,7 +94,11 @@ async def create_passwordless_code(request: CreateCodeRequest):
 
 
 @router.post("/signinup/code/consume")
-async def consume_passwordless_code(request: ConsumeCodeRequest, response: Response):
+async def consume_passwordless_code(
+    request: ConsumeCodeRequest,
+    response: Response,
+    sessions: SessionRepository = Depends(get_session_repository)
+):
     """
     Consume/verify a passwordless login code (mock for development).
 
@@ -109,9 +118,21 @@ async def consume_passwordless_code(request: ConsumeCodeRequest, response: Respo
 
     logger.info(f"Found auth code for phone: {stored_data['phoneNumber']}")
 
+    # The TTL monitor only runs once a minute, so check expiry explicitly
+    created_at = stored_data.get("createdAt")
+    if isinstance(created_at, datetime) and datetime.utcnow() - created_at > timedelta(
+        seconds=settings.AUTH_CODE_TTL_SECONDS
+    ):
+        logger.warning(f"Expired code for preAuthSessionId {request.preAuthSessionId}")
+        return {
+            "status": "EXPIRED_USER_INPUT_CODE_ERROR",
+            "failedCodeInputAttemptCount": 0,
+            "maximumCodeInputAttempts": 5
+        }
+
     # Verify the code
     if request.userInputCode != stored_data["code"]:
-        logger.warning(f"Incorrect code. Expected: {stored_data['code']}, Got: {request.userInputCode}")
+        logger.warning(f"Incorrect code for preAuthSessionId {request.preAuthSessionId}")
         return {
             "status": "INCORRECT_USER_INPUT_CODE_ERROR",
             "failedCodeInputAttemptCount": 1,
@@ -123,28 +144,17 @@ async def consume_passwordless_code(request: ConsumeCodeRequest, response: Respo
     user_id = str(uuid.uuid4())
 
     # Store session in MongoDB
-    sessions_col = get_sessions_collection()
-    await sessions_col.update_one(
-        {"sessionId": session_id},
-        {
-            "$set": {
-                "userId": user_id,
-                "phoneNumber": stored_data["phoneNumber"],
-                "createdAt": time.time()
-            }
-        },
-        upsert=True
-    )
+    await sessions.create(session_id, user_id, stored_data["phoneNumber"])
 
     # Remove the used code from MongoDB
     await auth_codes_col.delete_one({"preAuthSessionId": request.preAuthSessionId})
 
     # Create tokens
-    access_token = f"access_{session_id}"
+    access_token = issue_access_token(session_id, user_id)
     refresh_token = f"refresh_{session_id}"
 
     # Create a proper front-token in Supertokens format (JSON structure)
-    expiry_time = int(time.time() * 1000) + 3600000  # 1 hour from now
+    expiry_time = int(time.time() * 1000) + settings.ACCESS_TOKEN_TTL_SECONDS * 1000
     front_token_data = {
         "uid": user_id,
         "ate": expiry_time,
@@ -160,7 +170,7 @@ async def consume_passwordless_code(request: ConsumeCodeRequest, response: Respo
         httponly=True,
         secure=False,  # Set to True in production with HTTPS
         samesite="lax",
-        max_age=3600  # 1 hour
+        max_age=settings.ACCESS_TOKEN_TTL_SECONDS
     )
 
     response.set_cookie(
@@ -176,7 +186,8 @@ async def consume_passwordless_code(request: ConsumeCodeRequest, response: Respo
     # Must manually set to avoid quotes that break atob()
     response.headers.append(
         "Set-Cookie",
-        f"sFrontToken={front_token}; Max-Age=3600; Path=/; SameSite=lax"
+        f"sFrontToken={front_token}; Max-Age={settings.ACCESS_TOKEN_TTL_SECONDS}; "
+        "Path=/; SameSite=lax"
     )
 
     # Also set as headers for frontend JS access
@@ -205,7 +216,8 @@ async def consume_passwordless_code(request: ConsumeCodeRequest, response: Respo
 @router.post("/session/refresh")
 async def refresh_session(
     response: Response,
-    sRefreshToken: Optional[str] = Cookie(None)
+    sRefreshToken: Optional[str] = Cookie(None),
+    sessions: SessionRepository = Depends(get_session_repository)
 ):
     """
     Refresh an authentication session (mock for development).
@@ -221,13 +233,12 @@ async def refresh_session(
     if sRefreshToken.startswith("refresh_"):
         session_id = sRefreshToken.replace("refresh_", "")
 
-        # Find session in MongoDB
-        sessions_col = get_sessions_collection()
-        session_data = await sessions_col.find_one({"sessionId": session_id})
+        # Read the session itself, so a signout on any worker stops renewal
+        session_data = await sessions.find(session_id, cached=False)
 
         if session_data:
             # Refresh the session
-            access_token = f"access_{session_id}"
+            access_token = issue_access_token(session_id, session_data["userId"])
             refresh_token = f"refresh_{session_id}"
 
             response.set_cookie(
@@ -236,11 +247,11 @@ async def refresh_session(
                 httponly=True,
                 secure=False,
                 samesite="lax",
-                max_age=3600
+                max_age=settings.ACCESS_TOKEN_TTL_SECONDS
             )
 
             # Create proper front-token for refresh in Supertokens format (JSON structure)
-            expiry_time = int(time.time() * 1000) + 3600000  # 1 hour from now
+            expiry_time = int(time.time() * 1000) + settings.ACCESS_TOKEN_TTL_SECONDS * 1000
             front_token_data = {
                 "uid": session_data['userId'],
                 "ate": expiry_time,
@@ -266,20 +277,21 @@ async def refresh_session(
 @router.post("/signout")
 async def signout(
     response: Response,
-    sAccessToken: Optional[str] = Cookie(None)
+    sAccessToken: Optional[str] = Cookie(None),
+    sessions: SessionRepository = Depends(get_session_repository)
 ):
     """
     Sign out and destroy session (mock for development).
     """
     logger.info(f"POST /login/signout")
 
-    if sAccessToken and sAccessToken.startswith("access_"):
-        session_id = sAccessToken.replace("access_", "")
-        # Delete session from MongoDB
-        sessions_col = get_sessions_collection()
-        result = await sessions_col.delete_one({"sessionId": session_id})
-        if result.deleted_count > 0:
-            logger.info(f"Session destroyed - sessionId={session_id}")
+    # An expired access token still names the session to end
+    token = read_access_token(sAccessToken, verify_expiry=False)
+    if token:
+        # Delete session from MongoDB and the session cache; signed access
+        # tokens already issued stay valid until they expire
+        if await sessions.delete(token.session_id):
+            logger.info(f"Session destroyed - sessionId={token.session_id}")
 
     # Clear cookies
     response.delete_cookie("sAccessToken")
@@ -291,26 +303,33 @@ async def signout(
 
 
 @router.get("/session/verify")
-async def verify_session(sAccessToken: Optional[str] = Cookie(None)):
+async def verify_session(
+    sAccessToken: Optional[str] = Cookie(None),
+    sessions: SessionRepository = Depends(get_session_repository)
+):
     """
     Verify if a session is valid (mock for development).
     """
     logger.info(f"GET /login/session/verify")
 
-    if not sAccessToken or not sAccessToken.startswith("access_"):
+    token = read_access_token(sAccessToken)
+    if not token:
         return {
             "status": "UNAUTHORISED"
         }
 
-    session_id = sAccessToken.replace("access_", "")
+    # Signed tokens carry the user id and are verified without a session read
+    user_id = token.user_id
+    if user_id is None:
+        session_data = await sessions.find(token.session_id)
+        user_id = session_data["userId"] if session_data else None
 
-    if session_id in sessions:
-        session_data = sessions[session_id]
+    if user_id:
         return {
             "status": "OK",
             "session": {
-                "handle": session_id,
-                "userId": session_data["userId"],
+                "handle": token.session_id,
+                "userId": user_id,
                 "userDataInJWT": {}
             }
         }
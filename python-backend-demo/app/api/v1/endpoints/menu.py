@@ -1,9 +1,10 @@
 """Menu API endpoints"""
 
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request
 from typing import List
 from loguru import logger
 
+from app.core.http_cache import payload_response
 from app.models.schemas.response import ApiResponse
 from app.models.schemas.menu import MenuResponse, MenuSummaryResponse
 from app.models.schemas.restaurant import (
@@ -25,6 +26,7 @@ router = APIRouter()
     description="Retrieve all menus available for a specific restaurant location",
 )
 async def get_menus(
+    request: Request,
     restaurant_id: str = Path(..., description="Restaurant ID"),
     location_id: str = Path(..., description="Location ID"),
     service: MenuService = Depends(get_menu_service),
@@ -41,24 +43,14 @@ async def get_menus(
 
     **Returns:**
     - List of menu summaries with basic information
+
+    The body is served pre-encoded with a strong `ETag`; a matching
+    `If-None-Match` gets `304 Not Modified`.
     """
     logger.info(f"GET /menus - restaurant={restaurant_id}, location={location_id}")
 
-    menus = await service.get_menus_by_location(restaurant_id, location_id)
-
-    # Convert to summary response
-    menu_summaries = [
-        MenuSummaryResponse(
-            id=menu["_id"],
-            menuSlug=menu["menuSlug"],
-            name=menu["name"],
-            description=menu.get("description"),
-            available=menu.get("available", True),
-        )
-        for menu in menus
-    ]
-
-    return ApiResponse(data=menu_summaries)
+    payload = await service.get_menus_payload(restaurant_id, location_id)
+    return payload_response(request, payload)
 
 
 @router.get(
@@ -68,6 +60,7 @@ async def get_menus(
     description="Retrieve complete menu details including categories and items",
 )
 async def get_menu(
+    request: Request,
     restaurant_id: str = Path(..., description="Restaurant ID"),
     location_id: str = Path(..., description="Location ID"),
     menu_id: str = Path(..., description="Menu ID"),
@@ -87,6 +80,10 @@ async def get_menu(
     **Returns:**
     - Complete menu details with categories and items
 
+    The body is served pre-encoded (gzipped when the client accepts it) with a
+    strong `ETag`; a matching `If-None-Match` gets `304 Not Modified` without
+    touching the database.
+
     **Example Response:**
     ```json
     {
@@ -111,9 +108,8 @@ async def get_menu(
         f"GET /menus/{menu_id} - restaurant={restaurant_id}, location={location_id}"
     )
 
-    menu = await service.get_menu(restaurant_id, location_id, menu_id)
-
-    return ApiResponse(data=MenuResponse(**menu))
+    payload = await service.get_menu_payload(restaurant_id, location_id, menu_id)
+    return payload_response(request, payload)
 
 
 @router.get(
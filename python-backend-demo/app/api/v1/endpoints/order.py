@@ -1,6 +1,7 @@
 """Order API endpoints"""
 
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Header, Path, Query, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from loguru import logger
 
@@ -15,6 +16,7 @@ from app.models.schemas.order import (
     UpdateOrderStatusRequest,
     OrderStatus
 )
+from app.core.streaming import NDJSON_MEDIA_TYPE, wants_ndjson
 from app.services.order_service import OrderService
 from app.dependencies import get_order_service
 
@@ -152,9 +154,12 @@ async def update_order_status(
     Update order status.
 
     Allows restaurant staff to update the order status through various stages:
-    - pending → accepted (order confirmed by restaurant)
+    - created → accepted (order confirmed by restaurant)
     - accepted → ready (order is ready for pickup)
-    - ready → picked_up (customer picked up order)
+    - ready → delivered (customer picked up order)
+    - created, accepted or ready → cancelled
+
+    Any other move, including repeating the current status, returns 409.
 
     Socket.IO events are automatically emitted to notify mobile app users.
 
@@ -180,9 +185,15 @@ async def update_order_status(
     description="Get all orders for a restaurant location"
 )
 async def get_restaurant_orders(
+    response: Response,
     restaurant_id: str = Path(..., description="Restaurant ID"),
     location_id: str = Path(..., description="Location ID"),
     status: Optional[OrderStatus] = Query(None, description="Filter by status"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (enables pagination)"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the previous page's X-Next-Cursor header"
+    ),
+    accept: Optional[str] = Header(None),
     service: OrderService = Depends(get_order_service)
 ):
     """
@@ -195,14 +206,31 @@ async def get_restaurant_orders(
     - **restaurant_id**: Restaurant identifier
     - **location_id**: Location identifier
     - **status**: Optional status filter
+    - **limit**: Optional page size; the next page's cursor is returned in
+      the `X-Next-Cursor` header
+    - **cursor**: Resume after the given cursor
+
+    Without `limit` the full list is streamed from the database cursor in
+    batches. Send `Accept: application/x-ndjson` for one order per line.
 
     **Returns:**
     - List of orders
     """
     logger.info(f"GET /restaurants/{restaurant_id}/locations/{location_id}/orders")
 
-    orders = await service.get_restaurant_orders(restaurant_id, location_id, status)
-    return ApiResponse(data=orders)
+    if limit or cursor:
+        orders, next_cursor = await service.get_restaurant_orders_page(
+            restaurant_id, location_id, status, limit or 100, cursor
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return ApiResponse(data=orders)
+
+    ndjson = wants_ndjson(accept)
+    return StreamingResponse(
+        service.stream_restaurant_orders(restaurant_id, location_id, status, ndjson),
+        media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json",
+    )
 
 
 @router.get(
@@ -61,16 +61,14 @@ async def get_restaurant_for_order_app(
 )
 async def get_location_for_order_app(
     restaurant_id: str = Path(..., description="Restaurant ID"),
-    location_id: str = Path(..., description="Location ID")
+    location_id: str = Path(..., description="Location ID"),
+    restaurant_repo: RestaurantRepository = Depends(get_restaurant_repository)
 ):
     """Get location details for order app"""
     logger.info(f"GET /order-app/restaurants/{restaurant_id}/locations/{location_id}")
 
     try:
-        location = await db.db.locations.find_one({
-            "_id": location_id,
-            "restaurantId": restaurant_id
-        })
+        location = await restaurant_repo.find_restaurant_location(restaurant_id, location_id)
 
         if not location:
             return {
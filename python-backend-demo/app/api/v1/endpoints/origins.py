@@ -1,10 +1,12 @@
 """Origins API endpoints"""
 
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Depends, Path
 from loguru import logger
 from bson.objectid import ObjectId
 
 from app.core.database import db
+from app.dependencies import get_restaurant_repository
+from app.repositories.restaurant_repository import RestaurantRepository
 
 router = APIRouter()
 
@@ -16,7 +18,8 @@ router = APIRouter()
 )
 async def get_origins(
     restaurant_id: str = Path(..., description="Restaurant ID"),
-    location_id: str = Path(..., description="Location ID")
+    location_id: str = Path(..., description="Location ID"),
+    restaurant_repo: RestaurantRepository = Depends(get_restaurant_repository)
 ):
     """
     Get all origins for a restaurant location.
@@ -29,17 +32,10 @@ async def get_origins(
     logger.info(f"GET /origins/{restaurant_id}/{location_id}")
 
     try:
-        locations_collection = db.db["locations"]
         origins_collection = db.db["origins"]
 
         # Get location for QR code styling
-        location = await locations_collection.find_one(
-            {
-                "restaurantId": restaurant_id,
-                "_id": location_id
-            },
-            {"qrCodeStyle": 1, "qrCodeImage": 1}
-        )
+        location = await restaurant_repo.find_restaurant_location(restaurant_id, location_id)
 
         # Get all origins (locationId is stored as string)
         cursor = origins_collection.find(
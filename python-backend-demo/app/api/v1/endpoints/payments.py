@@ -5,12 +5,27 @@ from loguru import logger
 from typing import Optional
 import uuid
 
-from app.repositories.order_repository import OrderRepository
-from app.dependencies import get_order_repository
+from app.services.order_service import OrderService
+from app.dependencies import get_order_service
 
 router = APIRouter()
 
 
+async def mock_charge(preview_order_id: str, preview: dict) -> dict:
+    """Mock payment processing (always succeeds for development)
+
+    The previewOrderId is the idempotency key: charging the same preview
+    again returns the same transaction, as a real processor would when
+    given the key.
+    """
+    transaction_id = uuid.uuid5(uuid.NAMESPACE_URL, f"orderbuddy:charge:{preview_order_id}")
+    return {
+        "status": "Approved",
+        "transactionId": f"PAY-{transaction_id.hex[:12].upper()}",
+        "message": "Payment processed successfully"
+    }
+
+
 @router.post(
     "/start-transaction/{restaurant_id}",
     summary="Start payment transaction",
@@ -43,7 +58,7 @@ async def start_transaction(
 )
 async def complete_transaction(
     body: dict = Body(...),
-    order_repo: OrderRepository = Depends(get_order_repository)
+    order_service: OrderService = Depends(get_order_service)
 ):
     """
     Complete a payment transaction.
@@ -59,46 +74,21 @@ async def complete_transaction(
     if not preview_order_id or not transaction_token:
         raise HTTPException(status_code=400, detail="Missing required fields")
 
-    # Retrieve preview order from database
-    preview_order = await order_repo.find_preview_by_id(preview_order_id)
-
-    if not preview_order:
-        raise HTTPException(status_code=404, detail="Preview order not found")
-
-    # Mock payment processing (always succeeds for development)
-    payment_result = {
-        "status": "Approved",
-        "transactionId": f"PAY-{uuid.uuid4().hex[:12].upper()}",
-        "message": "Payment processed successfully"
-    }
-
-    # Create confirmed order from preview data
-    order_data = {
-        "restaurantId": preview_order["restaurantId"],
-        "locationId": preview_order["locationId"],
-        "locationSlug": preview_order.get("locationSlug", ""),
-        "origin": preview_order.get("origin", {}),
-        "customer": preview_order.get("customer", {}),
-        "items": preview_order["items"],
-        "subtotalCents": preview_order["subtotalCents"],
-        "taxCents": preview_order["taxCents"],
-        "totalCents": preview_order["totalPriceCents"],
-        "paymentId": payment_result["transactionId"],
-        "transactionDetails": payment_result,
-        "discount": preview_order.get("discount"),
-    }
+    # Idempotent on previewOrderId: the payment is only taken for a preview
+    # that exists and has no order yet; a repeated request returns the same
+    # order and the payment it was placed with
+    order = await order_service.checkout_preview(preview_order_id, charge=mock_charge)
+    payment_result = order.get("transactionDetails") or {}
 
-    order = await order_repo.create_order(order_data)
-
-    # Delete preview order after successful conversion
-    await order_repo.delete_preview_order(preview_order_id)
-
-    logger.info(f"Created order {order['orderId']} from preview {preview_order_id} with payment")
+    logger.info(
+        f"Checked out preview {preview_order_id} as order {order['orderId']} "
+        f"with payment {order.get('paymentId')}"
+    )
 
     return {
         "transaction": {
-            "resultMessage": payment_result["message"],
-            "resultStatus": payment_result["status"]
+            "resultMessage": payment_result.get("message"),
+            "resultStatus": payment_result.get("status")
         },
         "orderId": order["orderId"]
     }
@@ -111,7 +101,7 @@ async def complete_transaction(
 )
 async def place_order_without_payment(
     body: dict = Body(...),
-    order_repo: OrderRepository = Depends(get_order_repository)
+    order_service: OrderService = Depends(get_order_service)
 ):
     """
     Place an order without payment.
@@ -125,34 +115,13 @@ async def place_order_without_payment(
     if not preview_order_id:
         raise HTTPException(status_code=400, detail="Preview order ID is required")
 
-    # Retrieve preview order from database
-    preview_order = await order_repo.find_preview_by_id(preview_order_id)
-
-    if not preview_order:
-        raise HTTPException(status_code=404, detail="Preview order not found")
-
-    # Create confirmed order from preview data
-    order_data = {
-        "restaurantId": preview_order["restaurantId"],
-        "locationId": preview_order["locationId"],
-        "locationSlug": preview_order.get("locationSlug", ""),
-        "origin": preview_order.get("origin", {}),
-        "customer": preview_order.get("customer", {}),
-        "items": preview_order["items"],
-        "subtotalCents": preview_order["subtotalCents"],
-        "taxCents": preview_order["taxCents"],
-        "totalCents": preview_order["totalPriceCents"],
-        "paymentId": None,
-        "transactionDetails": {"paymentMethod": "cash"},
-        "discount": preview_order.get("discount"),
-    }
-
-    order = await order_repo.create_order(order_data)
-
-    # Delete preview order after successful conversion
-    await order_repo.delete_preview_order(preview_order_id)
+    # Idempotent on previewOrderId: a repeated request returns the same order
+    order = await order_service.checkout_preview(
+        preview_order_id,
+        transaction_details={"paymentMethod": "cash"}
+    )
 
-    logger.info(f"Created order {order['orderId']} from preview {preview_order_id}")
+    logger.info(f"Checked out preview {preview_order_id} as order {order['orderId']}")
 
     return {
         "data": {
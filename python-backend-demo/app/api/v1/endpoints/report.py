@@ -1,37 +1,33 @@
 """Report API endpoints"""
 
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Depends, Path
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from bson.objectid import ObjectId
-from datetime import datetime, timedelta
+from datetime import datetime
 from zoneinfo import ZoneInfo
 from typing import Optional
 
 from app.core.database import db
+from app.core.streaming import dumps, iter_batches, stream_json_array
+from app.dependencies import get_report_service, get_restaurant_repository
+from app.repositories.restaurant_repository import RestaurantRepository
+from app.services.report_service import ReportService
 
 router = APIRouter()
 
-# Tax rate constant (should match NestJS TAX_RATE config)
-TAX_RATE = 0.08
 
-
-def get_day_boundaries_utc(date_str: str, timezone_name: str):
+def get_day_boundaries_utc(date_str: str, tz: ZoneInfo):
     """
-    Convert a date string and timezone to UTC start and end times.
+    Convert a date string in a timezone to UTC start and end times.
 
     Args:
         date_str: ISO format date string (YYYY-MM-DD)
-        timezone_name: IANA timezone name (e.g., 'America/New_York')
+        tz: Location timezone
 
     Returns:
         Tuple of (start_datetime, end_datetime) in UTC
     """
-    try:
-        tz = ZoneInfo(timezone_name)
-    except Exception:
-        logger.warning(f"Invalid timezone {timezone_name}, using UTC")
-        tz = ZoneInfo("UTC")
-
     # Parse and localize date
     local_date = datetime.fromisoformat(date_str).replace(tzinfo=tz)
 
@@ -54,7 +50,8 @@ def get_day_boundaries_utc(date_str: str, timezone_name: str):
 async def get_order_history(
     restaurant_id: str = Path(..., description="Restaurant ID"),
     location_id: str = Path(..., description="Location ID"),
-    date: str = Path(..., description="Date in ISO format (YYYY-MM-DD)")
+    date: str = Path(..., description="Date in ISO format (YYYY-MM-DD)"),
+    restaurant_repo: RestaurantRepository = Depends(get_restaurant_repository)
 ):
     """
     Get order history for a specific date.
@@ -64,26 +61,17 @@ async def get_order_history(
     logger.info(f"GET /report/order_history/{restaurant_id}/{location_id}/{date}")
 
     try:
-        locations_collection = db.db["locations"]
         orders_collection = db.db["orders"]
 
         # Get location timezone
-        location = await locations_collection.find_one(
-            {
-                "_id": location_id,
-                "restaurantId": restaurant_id
-            },
-            {"timezone": 1}
-        )
+        tz = await restaurant_repo.find_location_timezone(restaurant_id, location_id)
 
-        if not location:
+        if not tz:
             logger.warning(f"Location not found: {location_id}")
             return []
 
-        timezone = location.get("timezone", "UTC")
-
         # Get UTC boundaries for the date
-        start_utc, end_utc = get_day_boundaries_utc(date, timezone)
+        start_utc, end_utc = get_day_boundaries_utc(date, tz)
 
         # Query orders using startedAt field (like NestJS)
         cursor = orders_collection.find({
@@ -95,15 +83,13 @@ async def get_order_history(
             }
         })
 
-        orders = []
-        async for order in cursor:
-            order["_id"] = str(order["_id"])
-            orders.append(order)
-
-        logger.debug(f"Found {len(orders)} orders for {date} in {timezone}")
+        logger.debug(f"Streaming orders for {date} in {tz.key}")
 
-        # Return raw array like NestJS (no wrapper)
-        return orders
+        # Return raw array like NestJS (no wrapper), encoded batch by batch
+        return StreamingResponse(
+            stream_json_array(iter_batches(cursor), dumps),
+            media_type="application/json"
+        )
 
     except Exception as e:
         logger.error(f"Error fetching order history: {e}")
@@ -118,101 +104,19 @@ async def get_order_history(
 async def get_sales_summary(
     restaurant_id: str = Path(..., description="Restaurant ID"),
     location_id: str = Path(..., description="Location ID"),
-    days: Optional[int] = 7
+    days: Optional[int] = 7,
+    service: ReportService = Depends(get_report_service)
 ):
     """
     Get sales summary for the last N days (default 7).
 
-    Returns daily aggregated sales with tax calculation.
-    Fills missing dates with zero values.
+    Returns daily aggregated sales with tax calculation, read from the
+    daily sales rollups. Fills missing dates with zero values.
     """
     logger.info(f"GET /report/sales_summary/{restaurant_id}/{location_id}")
 
     try:
-        locations_collection = db.db["locations"]
-        orders_collection = db.db["orders"]
-
-        # Get location timezone
-        location = await locations_collection.find_one(
-            {"_id": location_id, "restaurantId": restaurant_id},
-            {"timezone": 1}
-        )
-
-        timezone = location.get("timezone", "UTC") if location else "UTC"
-        tz = ZoneInfo(timezone)
-
-        # Calculate days ago in UTC
-        now = datetime.now(tz=tz)
-        days_ago = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
-        days_ago_utc = days_ago.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
-
-        # Aggregation pipeline (using endedAt for completed orders like NestJS)
-        pipeline = [
-            {
-                "$match": {
-                    "restaurantId": restaurant_id,
-                    "locationId": location_id,  # Use string directly
-                    "status": "order_delivered",  # OrderCompleted in NestJS
-                    "endedAt": {"$gte": days_ago_utc}
-                }
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "$dateToString": {
-                            "format": "%Y-%m-%d",
-                            "date": "$endedAt",
-                            "timezone": timezone
-                        }
-                    },
-                    "grossSalesCents": {"$sum": "$totalCents"}
-                }
-            },
-            {
-                "$addFields": {
-                    "taxCents": {
-                        "$multiply": [
-                            {"$divide": ["$grossSalesCents", {"$add": [1, TAX_RATE]}]},
-                            TAX_RATE
-                        ]
-                    }
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "date": "$_id",
-                    "grossSales": {"$divide": ["$grossSalesCents", 100]},
-                    "tax": {"$divide": ["$taxCents", 100]}
-                }
-            },
-            {"$sort": {"date": 1}}
-        ]
-
-        sales_data = []
-        async for doc in orders_collection.aggregate(pipeline):
-            sales_data.append(doc)
-
-        # Fill missing dates with zero values
-        all_dates = {}
-        current_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        for i in range(days):
-            date_key = (current_date - timedelta(days=days - 1 - i)).strftime("%Y-%m-%d")
-            all_dates[date_key] = {
-                "date": date_key,
-                "grossSales": 0,
-                "tax": 0
-            }
-
-        # Merge with actual data
-        for day in sales_data:
-            if day["date"] in all_dates:
-                all_dates[day["date"]] = day
-
-        # Return sorted by date with success wrapper
-        result = sorted(all_dates.values(), key=lambda x: x["date"])
-
-        logger.debug(f"Returning {len(result)} days of sales data")
+        result = await service.get_sales_summary(restaurant_id, location_id, days)
 
         return {
             "success": True,
@@ -235,7 +139,8 @@ async def get_sales_summary(
 async def get_sales_by_item(
     restaurant_id: str = Path(..., description="Restaurant ID"),
     location_id: str = Path(..., description="Location ID"),
-    date: str = Path(..., description="Date in ISO format (YYYY-MM-DD)")
+    date: str = Path(..., description="Date in ISO format (YYYY-MM-DD)"),
+    service: ReportService = Depends(get_report_service)
 ):
     """
     Get sales by menu item for a specific date.
@@ -245,64 +150,7 @@ async def get_sales_by_item(
     logger.info(f"GET /report/sales_by_item/{restaurant_id}/{location_id}/{date}")
 
     try:
-        locations_collection = db.db["locations"]
-        orders_collection = db.db["orders"]
-
-        # Get location timezone
-        location = await locations_collection.find_one(
-            {"_id": location_id, "restaurantId": restaurant_id},
-            {"timezone": 1}
-        )
-
-        timezone = location.get("timezone", "UTC") if location else "UTC"
-
-        # Get UTC boundaries for the date
-        start_utc, end_utc = get_day_boundaries_utc(date, timezone)
-
-        # Aggregation pipeline with $unwind on items
-        pipeline = [
-            {
-                "$match": {
-                    "restaurantId": restaurant_id,
-                    "locationId": location_id,  # Use string directly
-                    "status": "order_delivered",  # OrderCompleted
-                    "endedAt": {
-                        "$gte": start_utc,
-                        "$lte": end_utc
-                    }
-                }
-            },
-            {"$unwind": "$items"},
-            {
-                "$group": {
-                    "_id": "$items.menuItemId",
-                    "itemName": {"$first": "$items.name"},
-                    "soldCount": {"$sum": 1},
-                    "grossSalesCents": {"$sum": "$items.price"}
-                }
-            },
-            {
-                "$addFields": {
-                    "grossSales": {"$divide": ["$grossSalesCents", 100]}
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "menuItemId": "$_id",
-                    "itemName": 1,
-                    "soldCount": 1,
-                    "grossSales": 1
-                }
-            },
-            {"$sort": {"grossSales": -1}}
-        ]
-
-        sales_by_item = []
-        async for doc in orders_collection.aggregate(pipeline):
-            sales_by_item.append(doc)
-
-        logger.debug(f"Found sales data for {len(sales_by_item)} items on {date}")
+        sales_by_item = await service.get_sales_by_item(restaurant_id, location_id, date)
 
         return {
             "success": True,
@@ -325,7 +173,8 @@ async def get_sales_by_item(
 async def get_sales_by_origin(
     restaurant_id: str = Path(..., description="Restaurant ID"),
     location_id: str = Path(..., description="Location ID"),
-    date: str = Path(..., description="Date in ISO format (YYYY-MM-DD)")
+    date: str = Path(..., description="Date in ISO format (YYYY-MM-DD)"),
+    service: ReportService = Depends(get_report_service)
 ):
     """
     Get sales by origin for a specific date.
@@ -336,58 +185,7 @@ async def get_sales_by_origin(
     logger.info(f"GET /report/sales_by_origin/{restaurant_id}/{location_id}/{date}")
 
     try:
-        locations_collection = db.db["locations"]
-        orders_collection = db.db["orders"]
-
-        # Get location timezone
-        location = await locations_collection.find_one(
-            {"_id": location_id, "restaurantId": restaurant_id},
-            {"timezone": 1}
-        )
-
-        timezone = location.get("timezone", "UTC") if location else "UTC"
-
-        # Get UTC boundaries for the date
-        start_utc, end_utc = get_day_boundaries_utc(date, timezone)
-
-        # Aggregation pipeline grouping by origin.id
-        pipeline = [
-            {
-                "$match": {
-                    "restaurantId": restaurant_id,
-                    "locationId": location_id,  # Use string directly
-                    "status": "order_delivered",  # OrderCompleted
-                    "endedAt": {
-                        "$gte": start_utc,
-                        "$lte": end_utc
-                    }
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$origin.id",
-                    "name": {"$first": "$origin.name"},
-                    "soldCount": {"$sum": {"$size": "$items"}},  # Total items, not orders
-                    "grossSales": {"$sum": {"$divide": ["$totalCents", 100]}}
-                }
-            },
-            {
-                "$project": {
-                    "_id": 0,
-                    "originId": {"$toString": "$_id"},
-                    "name": 1,
-                    "soldCount": 1,
-                    "grossSales": 1
-                }
-            },
-            {"$sort": {"grossSales": -1}}
-        ]
-
-        sales_by_origin = []
-        async for doc in orders_collection.aggregate(pipeline):
-            sales_by_origin.append(doc)
-
-        logger.debug(f"Found sales data for {len(sales_by_origin)} origins on {date}")
+        sales_by_origin = await service.get_sales_by_origin(restaurant_id, location_id, date)
 
         return {
             "success": True,
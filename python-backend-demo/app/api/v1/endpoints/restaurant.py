@@ -1,6 +1,6 @@
 """Restaurant API endpoints (compatible with mobile app)"""
 
-from fastapi import APIRouter, Depends, Path, Query, Request, Header
+from fastapi import APIRouter, Depends, Path, Query, Request, Header, Response
 from typing import List, Optional
 from loguru import logger
 from datetime import datetime
@@ -11,6 +11,8 @@ from app.models.schemas.response import ApiResponse
 from app.models.schemas.order import OrderStatus
 from app.repositories.order_repository import OrderRepository
 from app.services.order_service import OrderService
+from app.services.active_orders import active_order_board
+from app.services.order_feed import order_feed
 from app.dependencies import get_order_repository, get_order_service
 
 router = APIRouter()
@@ -18,9 +20,18 @@ router = APIRouter()
 from app.repositories.restaurant_repository import RestaurantRepository
 from app.dependencies import get_restaurant_repository
 from app.core.database import db
+from app.core.cache import invalidate_menu
+from app.core.exceptions import BadRequestException, NotFoundException
+from app.core.streaming import dumps
+from app.core.transformers import transform_restaurant_order_compiled
 from bson.objectid import ObjectId
 
 
+def _json(document) -> Response:
+    """Encode order views directly, skipping FastAPI's jsonable_encoder pass"""
+    return Response(dumps(document), media_type="application/json")
+
+
 class OrderStatusUpdateRequest(BaseModel):
     """Order status update request from mobile app"""
     orderId: str
@@ -165,11 +176,16 @@ async def get_restaurants_by_user(
 async def get_today_orders_restaurant(
     restaurant_id: str = Path(..., description="Restaurant ID"),
     location_id: str = Path(..., description="Location ID"),
+    open_only: bool = Query(False, alias="open", description="Only orders still in the kitchen"),
     order_repo: OrderRepository = Depends(get_order_repository)
 ):
     """
     Get today's orders for restaurant dashboard.
 
+    With `open=true` only created, accepted and ready orders are returned,
+    including any still open from earlier days, read from the active order
+    board.
+
     Returns orders in the format expected by the mobile restaurant management app:
     - _id (MongoDB ID)
     - orderCode (order identifier)
@@ -181,51 +197,70 @@ async def get_today_orders_restaurant(
     """
     logger.info(f"GET /restaurant/orders/today/{restaurant_id}/{location_id}")
 
-    # Get today's orders from repository
-    orders = await order_repo.find_today_orders(restaurant_id, location_id)
-
-    # Transform orders to match mobile app format
-    transformed_orders = []
-    for order in orders:
-        # Transform items to use priceCents instead of price
-        transformed_items = []
-        for item in order.get("items", []):
-            transformed_item = {
-                "id": item.get("id"),
-                "menuItemId": item.get("menuItemId"),
-                "name": item.get("name"),
-                "priceCents": item.get("price", 0),  # Convert price to priceCents
-                "notes": item.get("notes"),
-                "modifiers": item.get("modifiers", []),
-                "variants": item.get("variants", []),
-                "stationTags": item.get("stationTags", []),
-                "startedAt": item.get("startedAt"),
-                "completedAt": item.get("completedAt")
+    if open_only:
+        if active_order_board.ready:
+            records = active_order_board.orders(restaurant_id, location_id)
+            return Response(
+                b"[" + b",".join(record.view for record in records) + b"]",
+                media_type="application/json"
+            )
+        orders = await order_repo.find_open_orders(restaurant_id, location_id)
+        return _json([transform_restaurant_order_compiled(order) for order in orders])
+
+    # Served from memory while the order feed keeps the location current
+    if order_feed.running:
+        board = await order_feed.board(restaurant_id, location_id)
+        return _json(board.snapshot() if board else [])
+
+    # MongoDB returns the mobile app format directly
+    views = await order_repo.find_today_order_views(restaurant_id, location_id)
+
+    logger.debug(f"Returning {len(views)} orders for today")
+    return _json(views)
+
+
+@router.get(
+    "/orders/today/{restaurant_id}/{location_id}/changes",
+    summary="Get changes to today's orders (Restaurant App)",
+    description="Today's orders changed since a cursor, for dashboards catching up"
+)
+async def get_today_order_changes(
+    restaurant_id: str = Path(..., description="Restaurant ID"),
+    location_id: str = Path(..., description="Location ID"),
+    cursor: Optional[str] = Query(None, description="Cursor of the last change seen"),
+    order_repo: OrderRepository = Depends(get_order_repository)
+):
+    """
+    Get today's orders changed since a cursor.
+
+    The cursor comes from a previous response or from an `order_changed`
+    Socket.IO event. When `reset` is true the cursor could not be honoured
+    (first call, another server, or too far behind) and `orders` holds all
+    of today's orders; replace the local list instead of merging.
+    """
+    logger.info(f"GET /restaurant/orders/today/{restaurant_id}/{location_id}/changes")
+
+    if not order_feed.running:
+        return _json({
+            "data": {
+                "cursor": None,
+                "reset": True,
+                "orders": await order_repo.find_today_order_views(restaurant_id, location_id)
             }
-            transformed_items.append(transformed_item)
-
-        # Build transformed order in mobile app format
-        transformed_order = {
-            "_id": order.get("_id"),
-            "orderCode": order.get("orderId"),  # Mobile app uses orderCode
-            "paymentId": order.get("paymentId", ""),
-            "restaurant": order.get("restaurantId"),  # Mobile app uses restaurant
-            "meta": {
-                "correlationId": str(uuid.uuid4())  # Generate correlation ID
-            },
-            "customer": order.get("customer", {}),
-            "origin": order.get("origin", {}),
-            "items": transformed_items,
-            "startedAt": order.get("createdAt"),  # Use createdAt as startedAt
-            "totalPriceCents": order.get("totalCents", 0),  # Mobile app uses totalPriceCents
-            "getSms": False,
-            "status": order.get("status"),
-            "endedAt": order.get("pickedUpAt")  # Optional end time
-        }
-        transformed_orders.append(transformed_order)
+        })
 
-    logger.debug(f"Returning {len(transformed_orders)} orders for today")
-    return transformed_orders
+    board = await order_feed.board(restaurant_id, location_id)
+    if board is None:
+        raise NotFoundException("Location", location_id)
+
+    changed = board.changes_since(cursor)
+    return _json({
+        "data": {
+            "cursor": board.cursor,
+            "reset": changed is None,
+            "orders": board.snapshot() if changed is None else changed
+        }
+    })
 
 
 @router.get(
@@ -246,51 +281,13 @@ async def get_single_order_restaurant(
     """
     logger.info(f"GET /restaurant/orders/{restaurant_id}/{location_id}/{order_id}")
 
-    # Get order from repository
-    order = await order_repo.find_by_id(order_id)
-
-    if not order:
-        return {"error": "Order not found"}, 404
-
-    # Transform items to use priceCents instead of price
-    transformed_items = []
-    for item in order.get("items", []):
-        transformed_item = {
-            "id": item.get("id"),
-            "menuItemId": item.get("menuItemId"),
-            "name": item.get("name"),
-            "priceCents": item.get("price", 0),
-            "notes": item.get("notes"),
-            "modifiers": item.get("modifiers", []),
-            "variants": item.get("variants", []),
-            "stationTags": item.get("stationTags", []),
-            "startedAt": item.get("startedAt"),
-            "completedAt": item.get("completedAt")
-        }
-        transformed_items.append(transformed_item)
-
-    # Build transformed order
-    transformed_order = {
-        "_id": order.get("_id"),
-        "orderCode": order.get("orderId"),
-        "paymentId": order.get("paymentId", ""),
-        "restaurant": order.get("restaurantId"),
-        "meta": {
-            "correlationId": str(uuid.uuid4())
-        },
-        "customer": order.get("customer", {}),
-        "origin": order.get("origin", {}),
-        "items": transformed_items,
-        "startedAt": order.get("createdAt"),
-        "totalPriceCents": order.get("totalCents", 0),
-        "getSms": False,
-        "status": order.get("status"),
-        "endedAt": order.get("pickedUpAt")
-    }
+    # MongoDB returns the mobile app format directly
+    view = await order_repo.find_order_view(order_id)
 
-    return {
-        "data": transformed_order
-    }
+    if not view:
+        raise NotFoundException("Order", order_id)
+
+    return _json({"data": view})
 
 
 @router.post(
@@ -310,10 +307,12 @@ async def update_order_status_restaurant(
     and converts them to the internal format.
 
     Status mapping:
-    - OrderCreated -> pending
-    - OrderAccepted -> accepted
-    - ReadyForPickup -> ready
-    - OrderCompleted -> picked_up
+    - OrderAccepted -> order_accepted
+    - ReadyForPickup -> ready_for_pickup
+    - OrderCompleted -> order_delivered
+    - OrderCancelled -> order_cancelled
+
+    Moves the current status does not allow are rejected with 409.
     """
     logger.info(f"POST /restaurant/order-status - order={request.orderId}, status={request.orderStatus}")
 
@@ -322,10 +321,16 @@ async def update_order_status_restaurant(
         "OrderCreated": OrderStatus.ORDER_CREATED,
         "OrderAccepted": OrderStatus.ORDER_ACCEPTED,
         "ReadyForPickup": OrderStatus.READY_FOR_PICKUP,
-        "OrderCompleted": OrderStatus.ORDER_DELIVERED
+        "OrderCompleted": OrderStatus.ORDER_DELIVERED,
+        "OrderCancelled": OrderStatus.ORDER_CANCELLED
     }
 
-    internal_status = status_mapping.get(request.orderStatus, OrderStatus.PENDING)
+    internal_status = status_mapping.get(request.orderStatus)
+    if internal_status is None:
+        raise BadRequestException(
+            "Unknown order status",
+            detail=f"'{request.orderStatus}' is not one of {', '.join(status_mapping)}"
+        )
 
     # Use the existing order service to update status
     from app.models.schemas.order import UpdateOrderStatusRequest
@@ -453,6 +458,7 @@ async def create_menu(
         }
 
         result = await menus_collection.insert_one(menu_doc)
+        invalidate_menu(restaurant_id, location_id, new_menu_id)
 
         logger.info(f"Created new menu: {new_menu_id}")
 
@@ -592,7 +598,8 @@ async def upsert_category(
                 },
                 {
                     '$set': {
-                        'categories.$': category_doc
+                        'categories.$': category_doc,
+                        'updatedAt': datetime.utcnow()
                     }
                 }
             )
@@ -625,12 +632,17 @@ async def upsert_category(
                 {
                     '$push': {
                         'categories': category_doc
+                    },
+                    '$set': {
+                        'updatedAt': datetime.utcnow()
                     }
                 }
             )
 
             logger.info(f"Created new category with ID: {new_category_id}")
 
+        invalidate_menu(restaurant_id, location_id, menu_id)
+
         return {
             "data": True
         }
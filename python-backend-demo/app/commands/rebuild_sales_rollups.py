@@ -0,0 +1,45 @@
+"""Rebuild the daily sales rollups from existing orders
+
+Usage:
+    python -m app.commands.rebuild_sales_rollups [--restaurant ID] [--location ID]
+
+Run it with order deliveries stopped (maintenance window). Reports keep
+reading the previous rollups until each location's rebuild is swapped in,
+but a delivery recorded while its location is rebuilt can be overwritten.
+"""
+
+import argparse
+import asyncio
+
+from loguru import logger
+
+from app.core.database import close_mongo_connection, connect_to_mongo, get_database
+from app.core.indexes import ensure_indexes
+from app.core.logging import setup_logging
+from app.repositories.report_repository import ReportRepository
+
+
+async def rebuild(restaurant_id: str = None, location_id: str = None) -> int:
+    """Rebuild rollups for the selected locations and return how many were rebuilt"""
+    await connect_to_mongo()
+    try:
+        database = get_database()
+        await ensure_indexes(database)
+        return await ReportRepository(database).rebuild(restaurant_id, location_id)
+    finally:
+        await close_mongo_connection()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild daily sales rollups from orders")
+    parser.add_argument("--restaurant", help="Only rebuild this restaurant")
+    parser.add_argument("--location", help="Only rebuild this location")
+    args = parser.parse_args()
+
+    setup_logging()
+    rebuilt = asyncio.run(rebuild(args.restaurant, args.location))
+    logger.info(f"Rebuilt sales rollups for {rebuilt} locations")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
-from typing import List, Union
+from typing import List, Optional, Union
 
 
 class Settings(BaseSettings):
@@ -14,10 +14,99 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     PORT: int = 8000
 
+    # Production server (python -m app.server)
+    SERVER_HOST: str = "0.0.0.0"
+    # Worker processes; 0 = one per available CPU. More than one requires the
+    # redis Socket.IO manager and the MongoDB preview store (see app/server.py)
+    WEB_CONCURRENCY: int = 1
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 75  # Longer than the load balancer's idle timeout
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None  # Per worker; excess requests get 503
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+    # Serve requests before index creation and the order board warm-up finish;
+    # unique indexes are still created first, reads fall back to MongoDB
+    # until the board is ready
+    LAZY_STARTUP: bool = False
+
+    # Logging: the console is written in batches from a background thread
+    # (LOG_BATCH_MAX_BYTES=0 writes each record on the calling thread)
+    LOG_JSON: bool = False
+    LOG_BATCH_MAX_BYTES: int = 65536
+    LOG_BATCH_INTERVAL_SECONDS: float = 0.5
+    LOG_REQUEST_SAMPLE_RATE: float = 1.0  # Share of INFO request-line logs kept
+
     # Database
     DB_CONN_STRING: str = "mongodb://localhost:27017"
     DB_NAME: str = "orderbuddy"
 
+    # Database connection pool
+    DB_MAX_POOL_SIZE: int = 100
+    DB_MIN_POOL_SIZE: int = 0
+    DB_MAX_IDLE_TIME_MS: Optional[int] = None
+    DB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    DB_COMPRESSORS: str = ""  # Comma separated, e.g. "zstd,snappy"
+    DB_READ_PREFERENCE: str = "primary"
+    DB_MONITORING_ENABLED: bool = True
+
+    # Per-route request metrics, exposed on /metrics in Prometheus text format
+    HTTP_METRICS_ENABLED: bool = True
+
+    # Indexes
+    DB_ENSURE_INDEXES: bool = True
+    DB_VERIFY_QUERY_PLANS: bool = False  # Fail startup if a query shape needs a COLLSCAN
+
+    # Menu cache (per worker process)
+    MENU_CACHE_MAX_ENTRIES: int = 512
+    MENU_CACHE_TTL_SECONDS: float = 300.0
+
+    # Location/restaurant metadata cache (per worker process)
+    LOCATION_CACHE_MAX_ENTRIES: int = 1024
+    LOCATION_CACHE_TTL_SECONDS: float = 60.0
+
+    # Order previews and auth codes expire via TTL indexes
+    PREVIEW_ORDER_TTL_SECONDS: int = 3600
+    AUTH_CODE_TTL_SECONDS: int = 600
+
+    # Sessions expire with their refresh token; lookups are cached per worker
+    # for at most one access token lifetime (ACCESS_TOKEN_TTL_SECONDS, lowered
+    # further by SESSION_CACHE_TTL_SECONDS), unknown ids for a short while
+    SESSION_TTL_SECONDS: int = 86400 * 30
+    SESSION_CACHE_MAX_ENTRIES: int = 10000
+    SESSION_CACHE_TTL_SECONDS: float = 3600.0
+    SESSION_NEGATIVE_CACHE_TTL_SECONDS: float = 30.0
+
+    # Access tokens: "opaque" (access_{sessionId}, checked against sessions)
+    # or "jwt" (signed with ACCESS_TOKEN_SECRET and verified in process)
+    ACCESS_TOKEN_MODE: str = "opaque"
+    ACCESS_TOKEN_SECRET: str = ""
+    ACCESS_TOKEN_ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_TTL_SECONDS: int = 900
+    # Keep previews in process and write them to MongoDB in the background
+    PREVIEW_STORE_IN_MEMORY: bool = False
+    PREVIEW_STORE_MAX_ENTRIES: int = 10000
+
+    # Pre-encoded HTTP payloads
+    HTTP_GZIP_PAYLOADS: bool = True
+    HTTP_GZIP_MIN_BYTES: int = 1024
+
+    # Socket.IO client manager: "memory" (single worker), "redis" or "local" (tests)
+    SOCKETIO_MANAGER: str = "memory"
+    SOCKETIO_REDIS_URL: str = "redis://localhost:6379/0"
+    SOCKETIO_CHANNEL: str = "orderbuddy-socketio"
+
+    # Socket.IO event bus
+    SOCKETIO_QUEUE_MAX_EVENTS: int = 10000
+    SOCKETIO_BATCH_MAX_EVENTS: int = 256
+    SOCKETIO_COALESCE_WINDOW_MS: float = 5.0
+    SOCKETIO_PUBLISH_TIMEOUT_MS: float = 50.0  # Wait this long for queue space, then drop
+
+    # Order feed: today's orders per location, kept current from the orders collection
+    ORDER_FEED_ENABLED: bool = True
+    ORDER_FEED_MAX_LOCATIONS: int = 256
+    ORDER_FEED_MAX_CHANGES: int = 1000  # Changes kept per location for cursor catch-up
+    ORDER_FEED_POLL_INTERVAL_SECONDS: float = 1.0  # Fallback without change streams
+
     # CORS
     ALLOWED_ORIGINS: Union[List[str], str] = ["http://localhost:5173", "http://localhost:5174", "http://localhost:5175", "http://localhost:3000"]
 
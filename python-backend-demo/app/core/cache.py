@@ -0,0 +1,230 @@
+"""In-process caching primitives
+
+Caches live for the lifetime of a worker process. Write paths invalidate
+explicitly rather than rely on the TTL, but only in the worker that handled
+the write: other workers keep serving their copy until its TTL runs out
+(see app/server.py).
+"""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Hashable, Optional, Tuple
+
+from app.config import settings
+
+
+class TTLCache:
+    """Bounded LRU cache with per-entry time-to-live and versioned keys.
+
+    `invalidate` stamps a key with a cache-wide counter. Readers take the
+    version before loading from the database and store the value under it,
+    so a load that raced with a write is never served afterwards.
+
+    Only the latest `maxsize` invalidation stamps are kept. Older ones are
+    folded into a floor that applies to every key, which at worst turns an
+    old entry or fill into a miss.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._clock = 0
+        self._invalidated: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._floor = 0
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def version(self, key: Hashable) -> int:
+        """Version stamp to pass to `set` after loading a key"""
+        return self._clock
+
+    def _invalidated_at(self, key: Hashable) -> int:
+        return self._invalidated.get(key, self._floor)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None when missing, expired or stale"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            version, expires_at, value = entry
+            if version < self._invalidated_at(key) or expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self, key: Hashable, value: Any, version: Optional[int] = None, ttl: Optional[float] = None
+    ) -> None:
+        """Store a value, evicting the least recently used entries when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            version: Version stamp taken before the value was loaded. Values
+                loaded under an outdated version are discarded.
+            ttl: Time-to-live for this entry (defaults to the cache TTL)
+        """
+        with self._lock:
+            if version is not None and version < self._invalidated_at(key):
+                return
+
+            expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._data[key] = (self._clock, expires_at, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove and return a live value"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None or entry[1] <= time.monotonic():
+                return None
+            return entry[2]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a key and bump its version so in-flight loads are discarded"""
+        with self._lock:
+            self._data.pop(key, None)
+            self._clock += 1
+            self._invalidated[key] = self._clock
+            self._invalidated.move_to_end(key)
+            while len(self._invalidated) > self.maxsize:
+                self._floor = self._invalidated.popitem(last=False)[1]
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._data.clear()
+            self._invalidated.clear()
+            self._clock = self._floor = 0
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttlSeconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Transformed menus keyed by (restaurantId, locationId, menuId)
+menu_cache = TTLCache(
+    "menus",
+    maxsize=settings.MENU_CACHE_MAX_ENTRIES,
+    ttl=settings.MENU_CACHE_TTL_SECONDS,
+)
+
+
+# Pre-encoded menu responses, keyed like menu_cache plus the menu list per location
+menu_payload_cache = TTLCache(
+    "menu_payloads",
+    maxsize=settings.MENU_CACHE_MAX_ENTRIES,
+    ttl=settings.MENU_CACHE_TTL_SECONDS,
+)
+
+
+# Menu price indexes used by the pricing engine, keyed like menu_cache
+price_index_cache = TTLCache(
+    "menu_price_indexes",
+    maxsize=settings.MENU_CACHE_MAX_ENTRIES,
+    ttl=settings.MENU_CACHE_TTL_SECONDS,
+)
+
+
+# Preview orders held in process when PREVIEW_STORE_IN_MEMORY is enabled
+preview_cache = TTLCache(
+    "order_previews",
+    maxsize=settings.PREVIEW_STORE_MAX_ENTRIES,
+    ttl=settings.PREVIEW_ORDER_TTL_SECONDS,
+)
+
+
+# Location documents keyed by locationId, restaurant documents by restaurantId
+location_cache = TTLCache(
+    "locations",
+    maxsize=settings.LOCATION_CACHE_MAX_ENTRIES,
+    ttl=settings.LOCATION_CACHE_TTL_SECONDS,
+)
+restaurant_cache = TTLCache(
+    "restaurants",
+    maxsize=settings.LOCATION_CACHE_MAX_ENTRIES,
+    ttl=settings.LOCATION_CACHE_TTL_SECONDS,
+)
+
+
+# Sessions keyed by sessionId, including negative entries for unknown ids
+session_cache = TTLCache(
+    "sessions",
+    maxsize=settings.SESSION_CACHE_MAX_ENTRIES,
+    ttl=settings.SESSION_CACHE_TTL_SECONDS,
+)
+
+
+def menu_cache_key(restaurant_id: str, location_id: str, menu_id: str) -> tuple:
+    """Cache key for a single menu"""
+    return (restaurant_id, location_id, menu_id)
+
+
+def menu_list_cache_key(restaurant_id: str, location_id: str) -> tuple:
+    """Cache key for the menu summaries of a location"""
+    return (restaurant_id, location_id, None)
+
+
+def invalidate_menu(restaurant_id: str, location_id: str, menu_id: str) -> None:
+    """Invalidate a cached menu and its location's menu list after a write"""
+    key = menu_cache_key(restaurant_id, location_id, menu_id)
+    menu_cache.invalidate(key)
+    menu_payload_cache.invalidate(key)
+    price_index_cache.invalidate(key)
+    menu_payload_cache.invalidate(menu_list_cache_key(restaurant_id, location_id))
+
+
+def invalidate_location(location_id: str) -> None:
+    """Invalidate a cached location after it is modified"""
+    location_cache.invalidate(location_id)
+
+
+def invalidate_restaurant(restaurant_id: str) -> None:
+    """Invalidate a cached restaurant after it is modified"""
+    restaurant_cache.invalidate(restaurant_id)
+
+
+def cache_stats() -> list:
+    """Stats for every registered cache"""
+    return [
+        menu_cache.stats(),
+        menu_payload_cache.stats(),
+        price_index_cache.stats(),
+        preview_cache.stats(),
+        location_cache.stats(),
+        restaurant_cache.stats(),
+        session_cache.stats(),
+    ]
@@ -12,6 +12,9 @@ class Collections:
     USERS = "users"
     SUBSCRIPTIONS = "subscriptions"
     CAMPAIGNS = "campaigns"
+    AUTH_CODES = "auth_codes"
+    SESSIONS = "sessions"
+    SALES_ROLLUPS = "sales_rollups"
 
 
 # Order Status (aligned with NestJS)
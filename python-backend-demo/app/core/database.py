@@ -1,23 +1,63 @@
 """Database connection and management"""
 
+import os
+
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 from app.config import settings
+from app.core.mongo_monitoring import CommandMetricsListener, PoolMetricsListener
 from loguru import logger
 
 
 class Database:
     client: AsyncIOMotorClient = None
     db: AsyncIOMotorDatabase = None
+    pid: int = None  # Process that created the client
 
 
 db = Database()
 
 
+def client_options() -> dict:
+    """Driver options for the connection pool, built from settings"""
+    options = {
+        "maxPoolSize": settings.DB_MAX_POOL_SIZE,
+        "minPoolSize": settings.DB_MIN_POOL_SIZE,
+        "readPreference": settings.DB_READ_PREFERENCE,
+    }
+
+    if settings.DB_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.DB_MAX_IDLE_TIME_MS
+    if settings.DB_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = settings.DB_WAIT_QUEUE_TIMEOUT_MS
+
+    compressors = [c.strip() for c in settings.DB_COMPRESSORS.split(",") if c.strip()]
+    if compressors:
+        options["compressors"] = compressors
+
+    if settings.DB_MONITORING_ENABLED:
+        options["event_listeners"] = [
+            PoolMetricsListener(settings.DB_MAX_POOL_SIZE),
+            CommandMetricsListener(),
+        ]
+
+    return options
+
+
 async def connect_to_mongo() -> None:
-    """Connect to MongoDB"""
-    logger.info("Connecting to MongoDB...")
-    db.client = AsyncIOMotorClient(settings.DB_CONN_STRING)
+    """Connect to MongoDB
+
+    Called from each worker's lifespan. A client inherited from a parent
+    process (a fork after connecting) is dropped, not reused: its pooled
+    sockets and monitor threads belong to the parent.
+    """
+    if db.client is not None and db.pid != os.getpid():
+        logger.warning(f"Discarding MongoDB client created by process {db.pid}")
+        db.client = db.db = None
+
+    logger.info(f"Connecting to MongoDB (pid {os.getpid()})...")
+    db.client = AsyncIOMotorClient(settings.DB_CONN_STRING, **client_options())
     db.db = db.client[settings.DB_NAME]
+    db.pid = os.getpid()
 
     # Test connection
     try:
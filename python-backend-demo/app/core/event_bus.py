@@ -0,0 +1,170 @@
+"""Background event bus for Socket.IO fan-out
+
+Publishers enqueue events and return immediately; a single dispatcher task
+drains the queue in batches, drops duplicate events queued for the same
+rooms within a batch, and emits each event once to all of its rooms.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.core.metrics import Counter, Gauge
+
+events_published = Counter(
+    "socketio_events_published_total",
+    "Events accepted by the event bus",
+    labelnames=("event",),
+)
+events_coalesced = Counter(
+    "socketio_events_coalesced_total",
+    "Events superseded by a later identical event in the same batch",
+    labelnames=("event",),
+)
+events_dropped = Counter(
+    "socketio_events_dropped_total",
+    "Events dropped because the queue stayed full",
+    labelnames=("event",),
+)
+queue_depth = Gauge("socketio_event_queue_depth", "Events waiting to be emitted")
+
+
+@dataclass
+class Event:
+    """One event to emit to a set of rooms"""
+
+    name: str
+    data: dict
+    rooms: Tuple[str, ...]
+    local: bool = False  # Only this worker's clients, skipping the pub/sub manager
+
+    @property
+    def coalesce_key(self) -> tuple:
+        return (self.name, self.rooms, self.data.get("orderId"), self.local)
+
+
+# emit(event, data, rooms), called with local=True for local events
+EmitFunction = Callable[..., Awaitable[None]]
+
+
+class EventBus:
+    """Bounded queue with a background dispatcher
+
+    When the dispatcher is not running (tests, scripts) events are emitted
+    inline so nothing is lost.
+    """
+
+    def __init__(
+        self,
+        emit: EmitFunction,
+        maxsize: int,
+        batch_size: int,
+        coalesce_window: float,
+        publish_timeout: float,
+    ):
+        self._emit = emit
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.coalesce_window = coalesce_window
+        self.publish_timeout = publish_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the dispatcher on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._task = asyncio.create_task(self._dispatch())
+        logger.info(f"Socket.IO event bus started (queue size {self.maxsize})")
+
+    async def stop(self) -> None:
+        """Emit everything still queued, then stop the dispatcher"""
+        if not self.running:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+        logger.info("Socket.IO event bus stopped")
+
+    async def publish(self, name: str, data: dict, rooms: List[str], local: bool = False) -> bool:
+        """Queue an event for the given rooms
+
+        Waits at most `publish_timeout` for queue space (backpressure), then
+        drops the event rather than hold up the caller.
+
+        Args:
+            name: Event name
+            data: Event payload
+            rooms: Rooms to emit to
+            local: Emit to this worker's clients only. For events every
+                worker produces itself, which would otherwise reach clients
+                once per worker through the pub/sub manager.
+
+        Returns:
+            False if the event was dropped
+        """
+        event = Event(name, data, tuple(dict.fromkeys(room for room in rooms if room)), local)
+        events_published.inc(event=name)
+
+        if not self.running:
+            await self._send([event])
+            return True
+
+        try:
+            await asyncio.wait_for(self._queue.put(event), timeout=self.publish_timeout)
+        except asyncio.TimeoutError:
+            events_dropped.inc(event=name)
+            logger.warning(f"Socket.IO event queue full, dropped {name} for {event.rooms}")
+            return False
+
+        queue_depth.set(self._queue.qsize())
+        return True
+
+    async def _dispatch(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self.coalesce_window:
+                # Let a burst accumulate so duplicates can be merged
+                await asyncio.sleep(self.coalesce_window)
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            queue_depth.set(self._queue.qsize())
+
+            try:
+                await self._send(coalesce(batch))
+            except Exception as e:
+                logger.error(f"Error emitting Socket.IO events: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _send(self, events: List[Event]) -> None:
+        for event in events:
+            if not event.rooms:
+                continue
+            if event.local:
+                await self._emit(event.name, event.data, list(event.rooms), local=True)
+            else:
+                await self._emit(event.name, event.data, list(event.rooms))
+
+
+def coalesce(batch: List[Event]) -> List[Event]:
+    """Keep the latest of identical events, preserving first-seen order"""
+    latest: Dict[tuple, Event] = {}
+    for event in batch:
+        if event.coalesce_key in latest:
+            events_coalesced.inc(event=event.name)
+        latest[event.coalesce_key] = event
+    return list(latest.values())
@@ -32,6 +32,15 @@ class BadRequestException(AppException):
         )
 
 
+class ConflictException(AppException):
+    """Conflicting state exception"""
+
+    def __init__(self, message: str, detail: str = None):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT, message=message, detail=detail
+        )
+
+
 class UnauthorizedException(AppException):
     """Unauthorized exception"""
 
@@ -0,0 +1,79 @@
+"""Pre-encoded HTTP payloads with strong ETags
+
+Responses that are read far more often than they change are encoded once,
+hashed for an ETag and optionally gzipped, then served as raw bytes.
+"""
+
+import gzip
+import hashlib
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class EncodedPayload:
+    """JSON body encoded once, with its ETag and optional gzip variant"""
+
+    body: bytes
+    etag: str
+    gzip_body: Optional[bytes] = None
+
+
+def encode_payload(body: bytes) -> EncodedPayload:
+    """Build an EncodedPayload from JSON bytes
+
+    Args:
+        body: Encoded JSON response body
+
+    Returns:
+        Payload with a strong ETag derived from the body content
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    gzip_body = None
+    if settings.HTTP_GZIP_PAYLOADS and len(body) >= settings.HTTP_GZIP_MIN_BYTES:
+        gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+    return EncodedPayload(body=body, etag=etag, gzip_body=gzip_body)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response when the client already holds this ETag"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+    return None
+
+
+def payload_response(request: Request, payload: EncodedPayload) -> Response:
+    """Serve a pre-encoded payload, answering 304 on a matching If-None-Match"""
+    cached = not_modified(request, payload.etag)
+    if cached is not None:
+        return cached
+
+    headers = _cache_headers(payload.etag)
+    accept_encoding = request.headers.get("accept-encoding", "")
+    if payload.gzip_body is not None and "gzip" in accept_encoding:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=payload.gzip_body, media_type="application/json", headers=headers)
+
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
+def _cache_headers(etag: str) -> dict:
+    return {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
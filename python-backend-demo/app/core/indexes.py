@@ -0,0 +1,321 @@
+"""MongoDB index declarations and query plan verification
+
+Every query shape issued by the repositories and endpoints is listed in
+QUERY_SHAPES, and every index backing them in INDEXES. `ensure_indexes`
+runs at startup; `verify_query_plans` explains each shape and reports any
+that would fall back to a collection scan.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from app.config import settings
+from app.core.constants import Collections
+
+# Server error code for an existing index whose options differ
+INDEX_OPTIONS_CONFLICT = 85
+
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    Collections.ORDERS: [
+        IndexModel([("orderId", ASCENDING)], name="orderId_unique", unique=True),
+        # One order per preview; orders created without a preview are exempt
+        IndexModel(
+            [("previewOrderId", ASCENDING)],
+            name="previewOrderId_unique",
+            unique=True,
+            partialFilterExpression={"previewOrderId": {"$type": "string"}},
+        ),
+        IndexModel(
+            [("restaurantId", ASCENDING), ("locationId", ASCENDING), ("createdAt", DESCENDING)],
+            name="location_createdAt",
+        ),
+        IndexModel(
+            [
+                ("restaurantId", ASCENDING),
+                ("locationId", ASCENDING),
+                ("status", ASCENDING),
+                ("endedAt", ASCENDING),
+            ],
+            name="location_status_endedAt",
+        ),
+        IndexModel(
+            [("restaurantId", ASCENDING), ("locationId", ASCENDING), ("startedAt", ASCENDING)],
+            name="location_startedAt",
+        ),
+        # Order feed polling fallback (standalone mongod)
+        IndexModel([("updatedAt", ASCENDING)], name="updatedAt"),
+        # Active order board warm-up: open orders across all locations
+        IndexModel([("status", ASCENDING)], name="status"),
+    ],
+    Collections.ORDERS_PREVIEW: [
+        IndexModel([("previewOrderId", ASCENDING)], name="previewOrderId_unique", unique=True),
+        IndexModel(
+            [("createdAt", ASCENDING)],
+            name="createdAt_ttl",
+            expireAfterSeconds=settings.PREVIEW_ORDER_TTL_SECONDS,
+        ),
+    ],
+    Collections.MENUS: [
+        IndexModel([("restaurantId", ASCENDING), ("locationId", ASCENDING)], name="location"),
+    ],
+    Collections.LOCATIONS: [
+        IndexModel([("restaurantId", ASCENDING)], name="restaurantId"),
+    ],
+    Collections.ORIGINS: [
+        IndexModel([("restaurantId", ASCENDING), ("locationId", ASCENDING)], name="location"),
+    ],
+    Collections.STATIONS: [
+        IndexModel([("restaurantId", ASCENDING), ("locationId", ASCENDING)], name="location"),
+    ],
+    Collections.CAMPAIGNS: [
+        IndexModel(
+            [("restaurantId", ASCENDING), ("locationId", ASCENDING), ("createdAt", DESCENDING)],
+            name="location_createdAt",
+        ),
+    ],
+    Collections.USERS: [
+        IndexModel([("userId", ASCENDING)], name="userId"),
+    ],
+    Collections.AUTH_CODES: [
+        IndexModel([("phoneNumber", ASCENDING)], name="phoneNumber_unique", unique=True),
+        IndexModel([("preAuthSessionId", ASCENDING)], name="preAuthSessionId"),
+        IndexModel(
+            [("createdAt", ASCENDING)],
+            name="createdAt_ttl",
+            expireAfterSeconds=settings.AUTH_CODE_TTL_SECONDS,
+        ),
+    ],
+    Collections.SESSIONS: [
+        IndexModel([("sessionId", ASCENDING)], name="sessionId_unique", unique=True),
+        IndexModel(
+            [("createdAt", ASCENDING)],
+            name="createdAt_ttl",
+            expireAfterSeconds=settings.SESSION_TTL_SECONDS,
+        ),
+    ],
+    Collections.SALES_ROLLUPS: [
+        IndexModel(
+            [
+                ("restaurantId", ASCENDING),
+                ("locationId", ASCENDING),
+                ("kind", ASCENDING),
+                ("date", ASCENDING),
+            ],
+            name="location_kind_date",
+        ),
+    ],
+}
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """A filter (and optional sort) issued against a collection"""
+
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[List[Tuple[str, int]]] = field(default=None)
+
+
+_DAY = {"$gte": datetime(2024, 1, 1), "$lte": datetime(2024, 1, 2)}
+
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("order_by_id", Collections.ORDERS, {"orderId": "ORD-1"}),
+    QueryShape("order_by_preview_id", Collections.ORDERS, {"previewOrderId": "PREV-1"}),
+    QueryShape(
+        "orders_by_location",
+        Collections.ORDERS,
+        {"restaurantId": "r", "locationId": "l"},
+        [("createdAt", DESCENDING)],
+    ),
+    QueryShape(
+        "orders_by_location_and_status",
+        Collections.ORDERS,
+        {"restaurantId": "r", "locationId": "l", "status": "order_created"},
+        [("createdAt", DESCENDING)],
+    ),
+    QueryShape(
+        "today_orders",
+        Collections.ORDERS,
+        {"restaurantId": "r", "locationId": "l", "createdAt": _DAY},
+        [("createdAt", DESCENDING)],
+    ),
+    QueryShape(
+        "report_completed_orders",
+        Collections.ORDERS,
+        {"restaurantId": "r", "locationId": "l", "status": "order_delivered", "endedAt": _DAY},
+    ),
+    QueryShape(
+        "report_order_history",
+        Collections.ORDERS,
+        {"restaurantId": "r", "locationId": "l", "startedAt": _DAY},
+    ),
+    QueryShape(
+        "orders_updated_since",
+        Collections.ORDERS,
+        {"updatedAt": {"$gte": datetime(2024, 1, 1)}},
+        [("updatedAt", ASCENDING)],
+    ),
+    QueryShape(
+        "open_orders",
+        Collections.ORDERS,
+        {"status": {"$in": ["order_created", "order_accepted", "ready_for_pickup"]}},
+        [("createdAt", DESCENDING)],
+    ),
+    QueryShape(
+        "open_orders_by_location",
+        Collections.ORDERS,
+        {
+            "restaurantId": "r",
+            "locationId": "l",
+            "status": {"$in": ["order_created", "order_accepted", "ready_for_pickup"]},
+        },
+        [("createdAt", DESCENDING)],
+    ),
+    QueryShape("preview_by_id", Collections.ORDERS_PREVIEW, {"previewOrderId": "PREV-1"}),
+    QueryShape(
+        "menu_by_id",
+        Collections.MENUS,
+        {"_id": "m", "restaurantId": "r", "locationId": "l"},
+    ),
+    QueryShape("menus_by_location", Collections.MENUS, {"restaurantId": "r", "locationId": "l"}),
+    QueryShape("location_by_id", Collections.LOCATIONS, {"_id": "l", "restaurantId": "r"}),
+    QueryShape("locations_by_restaurant", Collections.LOCATIONS, {"restaurantId": "r"}),
+    QueryShape("origin_by_id", Collections.ORIGINS, {"_id": "o"}),
+    QueryShape(
+        "origins_by_location", Collections.ORIGINS, {"restaurantId": "r", "locationId": "l"}
+    ),
+    QueryShape(
+        "stations_by_location", Collections.STATIONS, {"restaurantId": "r", "locationId": "l"}
+    ),
+    QueryShape(
+        "campaigns_by_location",
+        Collections.CAMPAIGNS,
+        {"restaurantId": "r", "locationId": "l"},
+        [("createdAt", DESCENDING)],
+    ),
+    QueryShape("user_by_id", Collections.USERS, {"userId": "u"}),
+    QueryShape("auth_code_by_phone", Collections.AUTH_CODES, {"phoneNumber": "+1"}),
+    QueryShape("auth_code_by_pre_auth", Collections.AUTH_CODES, {"preAuthSessionId": "p"}),
+    QueryShape("session_by_id", Collections.SESSIONS, {"sessionId": "s"}),
+    QueryShape(
+        "sales_rollup_days",
+        Collections.SALES_ROLLUPS,
+        {"kind": "day", "restaurantId": "r", "locationId": "l", "date": {"$gte": "2024-01-01"}},
+        [("date", ASCENDING)],
+    ),
+    QueryShape(
+        "sales_rollup_breakdown",
+        Collections.SALES_ROLLUPS,
+        {"kind": "item", "restaurantId": "r", "locationId": "l", "date": "2024-01-01"},
+        [("grossSalesCents", DESCENDING)],
+    ),
+]
+
+
+async def ensure_indexes(database: AsyncIOMotorDatabase, unique_only: bool = False) -> None:
+    """Create every declared index (no-op for indexes that already exist)
+
+    Collections are handled concurrently, so startup pays roughly one
+    round trip instead of one per collection.
+
+    Args:
+        database: Database to index
+        unique_only: Only create the unique indexes, which write paths rely
+            on for correctness (e.g. one order per previewOrderId)
+    """
+    selected = {
+        collection: [index for index in indexes if index.document.get("unique") or not unique_only]
+        for collection, indexes in INDEXES.items()
+    }
+    selected = {collection: indexes for collection, indexes in selected.items() if indexes}
+    await asyncio.gather(
+        *(
+            _ensure_collection_indexes(database, collection, indexes)
+            for collection, indexes in selected.items()
+        )
+    )
+    kind = "unique indexes" if unique_only else "indexes"
+    logger.info(f"Ensured {kind} on {len(selected)} collections")
+
+
+async def _ensure_collection_indexes(
+    database: AsyncIOMotorDatabase, collection: str, indexes: List[IndexModel]
+) -> None:
+    try:
+        names = await database[collection].create_indexes(indexes)
+        logger.debug(f"Ensured indexes on {collection}: {names}")
+    except OperationFailure as e:
+        if e.code == INDEX_OPTIONS_CONFLICT and await _sync_ttl(database, collection, indexes):
+            return
+        # Any other conflicting index must be fixed by hand
+        logger.error(f"Failed to ensure indexes on {collection}: {e}")
+
+
+async def _sync_ttl(
+    database: AsyncIOMotorDatabase, collection: str, indexes: List[IndexModel]
+) -> bool:
+    """Apply a changed expireAfterSeconds to existing TTL indexes via collMod"""
+    ttl_indexes = [i.document for i in indexes if "expireAfterSeconds" in i.document]
+    if not ttl_indexes:
+        return False
+
+    try:
+        for index in ttl_indexes:
+            await database.command({
+                "collMod": collection,
+                "index": {"name": index["name"], "expireAfterSeconds": index["expireAfterSeconds"]},
+            })
+            logger.info(
+                f"Updated TTL of {collection}.{index['name']} to {index['expireAfterSeconds']}s"
+            )
+
+        # Create whatever else was skipped by the conflict
+        await database[collection].create_indexes(indexes)
+    except OperationFailure as e:
+        logger.error(f"Failed to update TTL indexes on {collection}: {e}")
+        return False
+
+    return True
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """Flatten the stage names of an explain plan tree"""
+    stages = [plan.get("stage", "")]
+    if "inputStage" in plan:
+        stages.extend(_plan_stages(plan["inputStage"]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    if "queryPlan" in plan:
+        stages.extend(_plan_stages(plan["queryPlan"]))
+    return stages
+
+
+async def explain_shape(database: AsyncIOMotorDatabase, shape: QueryShape) -> List[str]:
+    """Return the winning plan stages for a query shape"""
+    command: Dict[str, Any] = {"find": shape.collection, "filter": shape.filter}
+    if shape.sort:
+        command["sort"] = dict(shape.sort)
+
+    result = await database.command({"explain": command, "verbosity": "queryPlanner"})
+    return _plan_stages(result["queryPlanner"]["winningPlan"])
+
+
+async def verify_query_plans(database: AsyncIOMotorDatabase) -> List[str]:
+    """Explain every query shape and return the names of those using COLLSCAN"""
+    collection_scans = []
+    for shape in QUERY_SHAPES:
+        stages = await explain_shape(database, shape)
+        if "COLLSCAN" in stages:
+            logger.error(f"Query shape '{shape.name}' falls back to COLLSCAN: {stages}")
+            collection_scans.append(shape.name)
+
+    return collection_scans
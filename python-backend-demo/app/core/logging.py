@@ -1,30 +1,159 @@
-"""Logging configuration"""
+"""Logging configuration
 
+The console sink queues formatted records in memory and a writer thread
+writes them in batches, so sink I/O never runs on the event loop. It can
+emit one JSON object per line, and INFO request-line logs ("GET /menus/...")
+can be sampled down on busy workers. The error file is written, rotated and
+cleaned up by loguru's queue thread.
+"""
+
+import json
+import random
+import re
 import sys
+import threading
+import traceback
+from typing import List, Optional, TextIO
+
 from loguru import logger
 from app.config import settings
 
+CONSOLE_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+FILE_FORMAT = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}"
+
+# Handlers open with a request line, e.g. logger.info(f"GET /orders/{order_id}")
+REQUEST_LINE = re.compile(r"(GET|POST|PUT|PATCH|DELETE) /")
+
+
+class BatchedStream:
+    """Text stream wrapper that writes from a background thread
+
+    `write` only appends to an in-memory batch; a writer thread writes the
+    batch with one call every `interval` seconds, or as soon as `max_bytes`
+    are pending, so sink I/O never runs on the event loop.
+    """
+
+    def __init__(self, stream: TextIO, max_bytes: int = 65536, interval: float = 0.5):
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+        self._full = threading.Event()
+        self._stopped = False
+        self._writer = threading.Thread(
+            target=self._write_periodically, name="log-writer", daemon=True
+        )
+        self._writer.start()
+
+    def write(self, message: str) -> None:
+        with self._lock:
+            self._pending.append(message)
+            self._pending_bytes += len(message)
+            if self._pending_bytes >= self.max_bytes:
+                self._full.set()
+
+    def _take(self) -> str:
+        with self._lock:
+            batch = "".join(self._pending)
+            self._pending.clear()
+            self._pending_bytes = 0
+            self._full.clear()
+        return batch
+
+    def _write_batch(self) -> None:
+        batch = self._take()
+        if batch:
+            try:
+                self.stream.write(batch)
+                self.stream.flush()
+            except (OSError, ValueError):
+                # Closed or broken stream: drop the batch but keep the writer alive,
+                # or records would pile up in memory
+                pass
+
+    def _write_periodically(self) -> None:
+        while not self._stopped:
+            self._full.wait(self.interval)
+            self._write_batch()
 
-def setup_logging() -> None:
-    """Configure application logging"""
+    def stop(self) -> None:
+        """Write what is pending; called by loguru when the sink is removed"""
+        self._stopped = True
+        self._full.set()
+        self._writer.join()
+        self._write_batch()
+
+
+def json_format(record) -> str:
+    """Format a record as one compact JSON object per line"""
+    payload = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+    }
+    if record["extra"]:
+        payload["extra"] = record["extra"]
+    if record["exception"]:
+        error_type, error, trace = record["exception"]
+        payload["exception"] = "".join(traceback.format_exception(error_type, error, trace))
+    record["extra"]["_json"] = json.dumps(payload, default=str, ensure_ascii=False)
+    return "{extra[_json]}\n"
+
+
+def request_log_filter(sample_rate: float):
+    """Filter that keeps `sample_rate` of INFO request-line records"""
+
+    def keep(record) -> bool:
+        if record["level"].name != "INFO" or not REQUEST_LINE.match(record["message"]):
+            return True
+        return random.random() < sample_rate
+
+    return keep
+
+
+def setup_logging(stream: Optional[TextIO] = None) -> None:
+    """Configure application logging
+
+    Args:
+        stream: Console stream (defaults to stdout)
+    """
     # Remove default handler
     logger.remove()
 
-    # Add console handler with colors
+    level = "DEBUG" if settings.DEBUG else "INFO"
+    console = stream or sys.stdout
+    if settings.LOG_BATCH_MAX_BYTES > 0:
+        console = BatchedStream(
+            console, settings.LOG_BATCH_MAX_BYTES, settings.LOG_BATCH_INTERVAL_SECONDS
+        )
+    sample_rate = settings.LOG_REQUEST_SAMPLE_RATE
+
+    # Add console handler, colorized text or JSON lines
     logger.add(
-        sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="DEBUG" if settings.DEBUG else "INFO",
-        colorize=True,
+        console,
+        format=json_format if settings.LOG_JSON else CONSOLE_FORMAT,
+        level=level,
+        colorize=not settings.LOG_JSON,
+        filter=request_log_filter(sample_rate) if sample_rate < 1.0 else None,
     )
 
-    # Add file handler for errors
+    # Add file handler for errors. Only ERROR records reach it, so loguru's
+    # per-record queue is cheap here and keeps file I/O and rotation off the loop
     logger.add(
         "logs/error.log",
         rotation="100 MB",
         retention="10 days",
         level="ERROR",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {name}:{function}:{line} - {message}",
+        format=FILE_FORMAT,
+        enqueue=True,
     )
 
-    logger.info(f"Logging configured - Level: {'DEBUG' if settings.DEBUG else 'INFO'}")
+    logger.info(f"Logging configured - Level: {level}")
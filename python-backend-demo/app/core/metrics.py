@@ -0,0 +1,192 @@
+"""Lightweight in-process metrics
+
+Counters, gauges and bucketed histograms with optional labels. Values are
+kept per worker process; there is no background aggregation. `render_text`
+writes the registry in the Prometheus text exposition format.
+"""
+
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds (Prometheus client defaults plus sub-millisecond)
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, description: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, description, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Bucketed distribution with sum and count"""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self.values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self.values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self.values[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        entry = self.values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def quantile(self, q: float, **labels: str) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it"""
+        entry = self.values.get(self._key(labels))
+        if not entry:
+            return 0.0
+        counts = entry[0]
+        target = q * sum(counts)
+        running = 0
+        for index, bucket_count in enumerate(counts):
+            running += bucket_count
+            if running >= target and bucket_count:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+REGISTRY: List[_Metric] = []
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _render_metric(metric: _Metric) -> List[str]:
+    lines = [
+        f"# HELP {metric.name} {_escape_help(metric.description)}",
+        f"# TYPE {metric.name} {metric.type_name}",
+    ]
+    with metric._lock:
+        if isinstance(metric, Histogram):
+            values = {key: (list(counts), total) for key, (counts, total) in metric.values.items()}
+        else:
+            values = dict(metric.values)
+
+    if not isinstance(metric, Histogram):
+        for key, value in values.items():
+            lines.append(f"{metric.name}{_labels(metric.labelnames, key)} {_format_value(value)}")
+        return lines
+
+    names = metric.labelnames + ("le",)
+    for key, (counts, total) in values.items():
+        running = 0
+        bounds = [_format_value(bucket) for bucket in metric.buckets] + ["+Inf"]
+        for bound, bucket_count in zip(bounds, counts):
+            running += bucket_count
+            lines.append(f"{metric.name}_bucket{_labels(names, key + (bound,))} {running}")
+        labels = _labels(metric.labelnames, key)
+        lines.append(f"{metric.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{metric.name}_count{labels} {running}")
+    return lines
+
+
+def render_text(registry: Optional[Sequence[_Metric]] = None) -> str:
+    """Render metrics in the Prometheus text exposition format
+
+    Args:
+        registry: Metrics to render (defaults to every metric in this process)
+
+    Returns:
+        Exposition text; each metric name is written once
+    """
+    lines: List[str] = []
+    seen = set()
+    for metric in REGISTRY if registry is None else registry:
+        if metric.name in seen:
+            continue
+        seen.add(metric.name)
+        lines.extend(_render_metric(metric))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,186 @@
+"""MongoDB driver monitoring
+
+pymongo event listeners that separate time spent waiting for a pooled
+connection from time spent executing commands on the server, and add each
+command's server time to the request that issued it.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from pymongo import monitoring
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+checkout_wait_seconds = Histogram(
+    "mongo_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    labelnames=("address",),
+)
+checkout_failures = Counter(
+    "mongo_pool_checkout_failures_total",
+    "Connection checkouts that failed, by reason",
+    labelnames=("address", "reason"),
+)
+connections_in_use = Gauge(
+    "mongo_pool_connections_in_use",
+    "Connections currently checked out of the pool",
+    labelnames=("address",),
+)
+connections_open = Gauge(
+    "mongo_pool_connections_open",
+    "Connections currently open in the pool",
+    labelnames=("address",),
+)
+pool_saturation = Gauge(
+    "mongo_pool_saturation_ratio",
+    "Checked out connections divided by maxPoolSize",
+    labelnames=("address",),
+)
+command_seconds = Histogram(
+    "mongo_command_duration_seconds",
+    "Server round-trip time per command",
+    labelnames=("command",),
+)
+command_failures = Counter(
+    "mongo_command_failures_total",
+    "Commands that returned an error",
+    labelnames=("command",),
+)
+
+
+# Motor runs driver calls in a copy of the caller's context, so commands see
+# the accumulator installed by the request; a one-element list so they can add to it
+_request_mongo_seconds: ContextVar[Optional[List[float]]] = ContextVar(
+    "request_mongo_seconds", default=None
+)
+
+
+@contextmanager
+def request_timer() -> Iterator[List[float]]:
+    """Accumulate command time for the current request
+
+    Yields:
+        One-element list holding the request's MongoDB time in seconds
+    """
+    accumulator = [0.0]
+    token = _request_mongo_seconds.set(accumulator)
+    try:
+        yield accumulator
+    finally:
+        _request_mongo_seconds.reset(token)
+
+
+def _add_request_time(seconds: float) -> None:
+    accumulator = _request_mongo_seconds.get()
+    if accumulator is not None:
+        accumulator[0] += seconds
+
+
+def _address(address) -> str:
+    host, port = address
+    return f"{host}:{port}"
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """Records checkout wait time and pool saturation per server address"""
+
+    def __init__(self, max_pool_size: int):
+        self.max_pool_size = max_pool_size
+        self._in_use: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Checkouts happen on the calling thread; older drivers do not report duration
+        self._local = threading.local()
+
+    def _adjust_in_use(self, address: str, delta: int) -> None:
+        with self._lock:
+            in_use = max(self._in_use.get(address, 0) + delta, 0)
+            self._in_use[address] = in_use
+        connections_in_use.set(in_use, address=address)
+        if self.max_pool_size:
+            pool_saturation.set(in_use / self.max_pool_size, address=address)
+
+    def connection_check_out_started(self, event) -> None:
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        duration = getattr(event, "duration", None)
+        if duration is None:
+            started = getattr(self._local, "started", None)
+            duration = time.perf_counter() - started if started else 0.0
+        address = _address(event.address)
+        checkout_wait_seconds.observe(duration, address=address)
+        self._adjust_in_use(address, 1)
+
+    def connection_check_out_failed(self, event) -> None:
+        checkout_failures.inc(address=_address(event.address), reason=str(event.reason))
+
+    def connection_checked_in(self, event) -> None:
+        self._adjust_in_use(_address(event.address), -1)
+
+    def connection_created(self, event) -> None:
+        connections_open.inc(address=_address(event.address))
+
+    def connection_closed(self, event) -> None:
+        connections_open.dec(address=_address(event.address))
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """Records per-command latency histograms"""
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        seconds = event.duration_micros / 1_000_000
+        command_seconds.observe(seconds, command=event.command_name)
+        _add_request_time(seconds)
+
+    def failed(self, event) -> None:
+        seconds = event.duration_micros / 1_000_000
+        command_seconds.observe(seconds, command=event.command_name)
+        command_failures.inc(command=event.command_name)
+        _add_request_time(seconds)
+
+
+def pool_stats() -> dict:
+    """Snapshot of pool and command metrics for status endpoints"""
+    return {
+        "pools": {
+            address[0]: {
+                "inUse": connections_in_use.values.get(address, 0),
+                "open": connections_open.values.get(address, 0),
+                "saturation": round(pool_saturation.values.get(address, 0.0), 4),
+                "checkouts": checkout_wait_seconds.count(address=address[0]),
+                "checkoutWaitP50Seconds": checkout_wait_seconds.quantile(0.5, address=address[0]),
+                "checkoutWaitP99Seconds": checkout_wait_seconds.quantile(0.99, address=address[0]),
+            }
+            for address in connections_in_use.values
+        },
+        "commands": {
+            labels[0]: {
+                "count": command_seconds.count(command=labels[0]),
+                "p50Seconds": command_seconds.quantile(0.5, command=labels[0]),
+                "p99Seconds": command_seconds.quantile(0.99, command=labels[0]),
+            }
+            for labels in command_seconds.values
+        },
+    }
@@ -0,0 +1,67 @@
+"""Socket.IO client managers for running more than one worker
+
+With the default in-memory manager an emit only reaches clients connected
+to the same worker. The pub/sub managers forward every emit and room change
+to all workers listening on the same channel.
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+import socketio
+from socketio.async_pubsub_manager import AsyncPubSubManager
+from loguru import logger
+
+from app.config import settings
+
+
+class LocalPubSubManager(AsyncPubSubManager):
+    """Pub/sub manager backed by an in-process broker
+
+    Every Socket.IO server in the process that uses the same channel shares
+    messages, which lets tests run several servers side by side as if they
+    were separate workers. Messages go through JSON like they would over
+    Redis, so payloads that would not survive a real backend fail here too.
+    """
+
+    name = "local"
+
+    # channel -> subscriber queues, shared by all instances in the process
+    _subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    async def _publish(self, data):
+        message = self.json.dumps(data)
+        for queue in list(self._subscribers.get(self.channel, [])):
+            queue.put_nowait(message)
+
+    async def _listen(self):
+        queue: asyncio.Queue = asyncio.Queue()
+        subscribers = self._subscribers.setdefault(self.channel, [])
+        subscribers.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            subscribers.remove(queue)
+
+
+def create_client_manager() -> Optional[socketio.AsyncManager]:
+    """Build the client manager selected by SOCKETIO_MANAGER
+
+    Returns:
+        A pub/sub manager, or None to use Socket.IO's in-memory default
+    """
+    backend = settings.SOCKETIO_MANAGER.lower()
+
+    if backend == "memory":
+        return None
+    if backend == "local":
+        return LocalPubSubManager(channel=settings.SOCKETIO_CHANNEL)
+    if backend == "redis":
+        # Requires the `redis` package (poetry install -E redis)
+        logger.info(f"Socket.IO using Redis pub/sub on channel {settings.SOCKETIO_CHANNEL}")
+        return socketio.AsyncRedisManager(
+            settings.SOCKETIO_REDIS_URL, channel=settings.SOCKETIO_CHANNEL
+        )
+
+    raise ValueError(f"Unknown SOCKETIO_MANAGER '{settings.SOCKETIO_MANAGER}'")
@@ -0,0 +1,88 @@
+"""Per-route HTTP request metrics
+
+Pure ASGI middleware that records latency, response size and MongoDB time
+per route template, plus the number of requests in flight. Routes are
+labelled by their template (`/orders/{order_id}`), never the raw path, so
+label cardinality stays bounded by the route table.
+"""
+
+import time
+
+from app.core.metrics import Gauge, Histogram
+from app.core.mongo_monitoring import request_timer
+
+# Response sizes in bytes, 100B to 10MB
+RESPONSE_SIZE_BUCKETS = (
+    100, 500, 1_000, 5_000, 10_000, 50_000, 100_000, 500_000, 1_000_000, 5_000_000, 10_000_000,
+)
+
+# Label for requests no route matched (404s, probes for unknown paths)
+UNMATCHED_ROUTE = "unmatched"
+
+request_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving the request to sending the last response byte",
+    labelnames=("method", "route", "status"),
+)
+request_mongo_seconds = Histogram(
+    "http_request_mongo_seconds",
+    "MongoDB server time spent by each request",
+    labelnames=("method", "route"),
+)
+response_size_bytes = Histogram(
+    "http_response_size_bytes",
+    "Response body size",
+    labelnames=("method", "route"),
+    buckets=RESPONSE_SIZE_BUCKETS,
+)
+requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    labelnames=("method",),
+)
+
+
+def route_label(scope: dict) -> str:
+    """Route template the router matched, or UNMATCHED_ROUTE"""
+    return getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """Records per-route latency, response size and MongoDB time
+
+    The router stores the matched route in the request scope, so the route
+    label is read once the response has been sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        body_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status_code, body_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        requests_in_flight.inc(method=method)
+        started = time.perf_counter()
+        try:
+            with request_timer() as mongo_seconds:
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            requests_in_flight.dec(method=method)
+            route = route_label(scope)
+            request_seconds.observe(elapsed, method=method, route=route, status=str(status_code))
+            request_mongo_seconds.observe(mongo_seconds[0], method=method, route=route)
+            response_size_bytes.observe(body_bytes, method=method, route=route)
@@ -3,9 +3,13 @@
 import socketio
 from loguru import logger
 from app.config import settings
+from app.core.event_bus import EventBus
+from app.core.pubsub import create_client_manager
 
+# Pub/sub manager so emits reach clients connected to other workers
 sio = socketio.AsyncServer(
     async_mode='asgi',
+    client_manager=create_client_manager(),
     cors_allowed_origins=[
         settings.STORE_ENDPOINT,
         settings.API_ENDPOINT,
@@ -72,25 +76,49 @@ async def store_joined(sid, data):
         logger.info(f"Store client {sid} joined location room: {location_room}")
 
 
-async def emit_order_completed(order_id: str, restaurant_id: str, data: dict):
-    """
-    Broadcast order_completed event to order room and restaurant room
+async def disconnect_all_clients():
+    """Disconnect every client of this worker so it reconnects elsewhere
+
+    Called when the worker is asked to stop, before uvicorn waits for open
+    connections; long-polling requests return at once instead of holding
+    the shutdown open.
     """
-    logger.info(f"Broadcasting order_completed for order: {order_id}")
+    count = len(sio.eio.sockets)
+    if count:
+        logger.info(f"Disconnecting {count} Socket.IO clients before shutdown")
+        await sio.eio.disconnect()
+    await sio.shutdown()
+
+
+async def _emit_to_rooms(event: str, data: dict, rooms: list, local: bool = False):
+    """Emit one packet to every client in any of the rooms"""
+    await sio.emit(event, data, to=rooms, ignore_queue=local)
 
-    # Emit to order room (mobile app clients)
-    await sio.emit('order_completed', {
-        'orderId': order_id,
-        'restaurantId': restaurant_id,
-        **data
-    }, room=order_id)
 
-    # Emit to restaurant room (store/dashboard clients)
-    await sio.emit('order_completed', {
+event_bus = EventBus(
+    _emit_to_rooms,
+    maxsize=settings.SOCKETIO_QUEUE_MAX_EVENTS,
+    batch_size=settings.SOCKETIO_BATCH_MAX_EVENTS,
+    coalesce_window=settings.SOCKETIO_COALESCE_WINDOW_MS / 1000,
+    publish_timeout=settings.SOCKETIO_PUBLISH_TIMEOUT_MS / 1000,
+)
+
+
+async def _publish_order_event(event: str, order_id: str, restaurant_id: str, data: dict):
+    """Queue an order event for the order room and the restaurant room"""
+    await event_bus.publish(event, {
         'orderId': order_id,
         'restaurantId': restaurant_id,
         **data
-    }, room=restaurant_id)
+    }, rooms=[order_id, restaurant_id])
+
+
+async def emit_order_completed(order_id: str, restaurant_id: str, data: dict):
+    """
+    Broadcast order_completed event to order room and restaurant room
+    """
+    logger.info(f"Broadcasting order_completed for order: {order_id}")
+    await _publish_order_event('order_completed', order_id, restaurant_id, data)
 
 
 async def emit_order_ready_for_pickup(order_id: str, restaurant_id: str, data: dict):
@@ -98,20 +126,7 @@ async def emit_order_ready_for_pickup(order_id: str, restaurant_id: str, data: d
     Broadcast order_ready_for_pickup event to order room and restaurant room
     """
     logger.info(f"Broadcasting order_ready_for_pickup for order: {order_id}")
-
-    # Emit to order room (mobile app clients)
-    await sio.emit('order_ready_for_pickup', {
-        'orderId': order_id,
-        'restaurantId': restaurant_id,
-        **data
-    }, room=order_id)
-
-    # Emit to restaurant room (store/dashboard clients)
-    await sio.emit('order_ready_for_pickup', {
-        'orderId': order_id,
-        'restaurantId': restaurant_id,
-        **data
-    }, room=restaurant_id)
+    await _publish_order_event('order_ready_for_pickup', order_id, restaurant_id, data)
 
 
 async def emit_order_accepted(order_id: str, restaurant_id: str, data: dict):
@@ -119,15 +134,19 @@ async def emit_order_accepted(order_id: str, restaurant_id: str, data: dict):
     Broadcast order_accepted event
     """
     logger.info(f"Broadcasting order_accepted for order: {order_id}")
+    await _publish_order_event('order_accepted', order_id, restaurant_id, data)
 
-    await sio.emit('order_accepted', {
-        'orderId': order_id,
-        'restaurantId': restaurant_id,
-        **data
-    }, room=order_id)
 
-    await sio.emit('order_accepted', {
-        'orderId': order_id,
-        'restaurantId': restaurant_id,
-        **data
-    }, room=restaurant_id)
+async def emit_location_order_changed(restaurant_id: str, location_id: str, data: dict):
+    """
+    Push an order change to the store clients of a location
+
+    Every worker's order feed sees every change, so this only reaches the
+    clients connected to this worker.
+    """
+    await event_bus.publish(
+        'order_changed',
+        {'restaurantId': restaurant_id, 'locationId': location_id, **data},
+        rooms=[f"{restaurant_id}_{location_id}"],
+        local=True
+    )
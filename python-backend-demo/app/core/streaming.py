@@ -0,0 +1,143 @@
+"""Streaming JSON encoders and keyset pagination cursors
+
+Large result sets are encoded batch by batch straight from the Motor cursor,
+so memory stays flat regardless of how many documents match.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from bson import ObjectId
+from loguru import logger
+
+from app.core.exceptions import BadRequestException
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def json_default(value: Any) -> Any:
+    """Encode BSON/driver types the way FastAPI's jsonable_encoder does"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(document: Any) -> bytes:
+    """Compact JSON encoding for raw MongoDB documents"""
+    return json.dumps(
+        document, default=json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def encode_cursor(created_at: datetime, document_id: Any) -> str:
+    """Opaque keyset cursor for the (createdAt, _id) sort order"""
+    raw = json.dumps([created_at.isoformat(), str(document_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """Decode a cursor produced by encode_cursor
+
+    Raises:
+        BadRequestException: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, document_id = json.loads(base64.urlsafe_b64decode(padded))
+        if ObjectId.is_valid(document_id):
+            document_id = ObjectId(document_id)
+        return datetime.fromisoformat(created_at), document_id
+    except Exception:
+        raise BadRequestException("Invalid cursor", detail=f"Cursor '{cursor}' is malformed")
+
+
+def keyset_after(created_at: datetime, document_id: Any) -> dict:
+    """Filter for documents after a cursor in (createdAt desc, _id desc) order"""
+    return {
+        "$or": [
+            {"createdAt": {"$lt": created_at}},
+            {"createdAt": created_at, "_id": {"$lt": document_id}},
+        ]
+    }
+
+
+async def iter_batches(cursor, batch_size: int = 500) -> AsyncIterator[List[dict]]:
+    """Yield documents from a Motor cursor in lists of `batch_size`
+
+    `_id` is converted to a string, as the repositories do for single reads.
+    """
+    batch = []
+    async for document in cursor.batch_size(batch_size):
+        document["_id"] = str(document["_id"])
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _encode_batch(batch: List[Any], encode: Callable[[Any], bytes]) -> List[bytes]:
+    """Encode a batch, skipping (and logging) documents that fail to encode"""
+    encoded = []
+    for document in batch:
+        try:
+            encoded.append(encode(document))
+        except Exception as e:
+            document_id = document.get("_id") if isinstance(document, dict) else None
+            logger.error(f"Skipped document {document_id} that failed to encode: {e}")
+    return encoded
+
+
+async def stream_json_array(
+    batches: AsyncIterator[List[Any]],
+    encode: Callable[[Any], bytes],
+    prefix: bytes = b"",
+    suffix: bytes = b"",
+) -> AsyncIterator[bytes]:
+    """Yield a JSON array (optionally wrapped) one batch at a time
+
+    A document that fails to encode is skipped and logged. An error from
+    `batches` (e.g. the cursor) propagates: headers are already sent, so the
+    connection is aborted and the client sees an incomplete body rather
+    than a truncated result reported as a success.
+
+    Args:
+        batches: Async iterator of document batches
+        encode: Encodes one document to JSON bytes
+        prefix: Bytes written before the opening bracket, e.g. an envelope
+        suffix: Bytes written after the closing bracket
+    """
+    yield prefix + b"["
+    first = True
+    async for batch in batches:
+        encoded = _encode_batch(batch, encode)
+        if not encoded:
+            continue
+        chunk = b",".join(encoded)
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b"]" + suffix
+
+
+async def stream_ndjson(
+    batches: AsyncIterator[List[Any]], encode: Callable[[Any], bytes]
+) -> AsyncIterator[bytes]:
+    """Yield newline-delimited JSON one batch at a time
+
+    Bad documents and source errors are handled as in `stream_json_array`.
+    """
+    async for batch in batches:
+        encoded = _encode_batch(batch, encode)
+        if encoded:
+            yield b"\n".join(encoded) + b"\n"
+
+
+def wants_ndjson(accept: Optional[str]) -> bool:
+    """Check whether the client asked for NDJSON"""
+    return bool(accept) and NDJSON_MEDIA_TYPE in accept
@@ -0,0 +1,118 @@
+"""Access tokens for the development auth endpoints
+
+With ACCESS_TOKEN_MODE=opaque (the default) an access token is
+`access_{sessionId}` and every check reads the session. With
+ACCESS_TOKEN_MODE=jwt it is an HMAC-signed JWT carrying the session handle
+and user id, verified in process with a key built once per worker.
+
+Refresh tokens stay opaque and are checked against the sessions collection,
+bypassing the per-worker session cache, in both modes, so signing out stops
+renewal at once on every worker. An access token that was already issued
+can outlive a signout by up to ACCESS_TOKEN_TTL_SECONDS: a signed one until
+it expires, an opaque one while other workers still cache the session.
+That is why the lifetime is short.
+"""
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from app.config import settings
+
+OPAQUE_PREFIX = "access_"
+
+
+@dataclass(frozen=True)
+class AccessToken:
+    """Claims of a verified access token"""
+
+    session_id: str
+    user_id: Optional[str]  # Not carried by opaque tokens
+    expires_at: Optional[int] = None  # Epoch seconds
+
+
+class AccessTokenSigner:
+    """Issues and verifies signed access tokens with one prepared key"""
+
+    def __init__(self, secret: str, algorithm: str, ttl_seconds: int):
+        if not secret:
+            raise ValueError("ACCESS_TOKEN_SECRET must be set when ACCESS_TOKEN_MODE=jwt")
+
+        # python-jose is only needed in jwt mode
+        from jose import jwk, jwt
+        from jose.exceptions import JWTError
+
+        self._jwt = jwt
+        self._error = JWTError
+        self.algorithm = algorithm
+        self.ttl_seconds = ttl_seconds
+        # Building the key validates and encodes the secret; do it once, not per token
+        self._key = jwk.construct(secret, algorithm)
+
+    def sign(self, session_id: str, user_id: str) -> str:
+        now = int(time.time())
+        claims = {"sid": session_id, "sub": user_id, "iat": now, "exp": now + self.ttl_seconds}
+        return self._jwt.encode(claims, self._key, algorithm=self.algorithm)
+
+    def decode(self, value: str, verify_expiry: bool = True) -> Optional[AccessToken]:
+        try:
+            claims = self._jwt.decode(
+                value,
+                self._key,
+                algorithms=[self.algorithm],
+                options={"verify_exp": verify_expiry},
+            )
+        except self._error:
+            return None
+        if not claims.get("sid"):
+            return None
+        return AccessToken(
+            session_id=claims["sid"], user_id=claims.get("sub"), expires_at=claims.get("exp")
+        )
+
+
+@lru_cache(maxsize=None)
+def access_token_signer() -> AccessTokenSigner:
+    """Signer built from settings, once per worker process"""
+    return AccessTokenSigner(
+        settings.ACCESS_TOKEN_SECRET,
+        settings.ACCESS_TOKEN_ALGORITHM,
+        settings.ACCESS_TOKEN_TTL_SECONDS,
+    )
+
+
+def signed_access_tokens() -> bool:
+    """Whether access tokens are signed JWTs rather than opaque session ids"""
+    return settings.ACCESS_TOKEN_MODE.lower() == "jwt"
+
+
+def issue_access_token(session_id: str, user_id: str) -> str:
+    """Create an access token for a session in the configured mode"""
+    if signed_access_tokens():
+        return access_token_signer().sign(session_id, user_id)
+    return f"{OPAQUE_PREFIX}{session_id}"
+
+
+def read_access_token(value: Optional[str], verify_expiry: bool = True) -> Optional[AccessToken]:
+    """Parse an access token
+
+    Signed tokens are verified locally and carry the user id. Opaque tokens
+    only carry the session handle; the caller must still look the session up.
+    Opaque tokens are accepted in jwt mode too, so sessions issued before a
+    switch keep working until they are refreshed.
+
+    Args:
+        value: Token from the sAccessToken cookie
+        verify_expiry: False to accept an expired signed token (signout)
+
+    Returns:
+        Token claims, or None when missing, malformed, forged or expired
+    """
+    if not value:
+        return None
+    if value.startswith(OPAQUE_PREFIX):
+        return AccessToken(session_id=value[len(OPAQUE_PREFIX):], user_id=None)
+    if signed_access_tokens():
+        return access_token_signer().decode(value, verify_expiry)
+    return None
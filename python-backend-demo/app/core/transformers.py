@@ -4,7 +4,7 @@ This module provides utilities to transform data from MongoDB format
 to the format expected by mobile clients.
 """
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 
 def to_multilingual(value: Union[str, Dict[str, str], None]) -> Dict[str, str]:
@@ -175,3 +175,288 @@ def transform_menu_summary(menu: Dict[str, Any]) -> Dict[str, Any]:
         "name": to_multilingual(menu.get("name")),
         "description": to_multilingual(menu.get("description")) if menu.get("description") else None,
     }
+
+
+def transform_restaurant_order_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform order item to restaurant app format.
+
+    Args:
+        item: Order item as stored in MongoDB
+
+    Returns:
+        Order item with priceCents instead of price
+    """
+    return {
+        "id": item.get("id"),
+        "menuItemId": item.get("menuItemId"),
+        "name": item.get("name"),
+        "priceCents": item.get("price", 0),
+        "notes": item.get("notes"),
+        "modifiers": item.get("modifiers", []),
+        "variants": item.get("variants", []),
+        "stationTags": item.get("stationTags", []),
+        "startedAt": item.get("startedAt"),
+        "completedAt": item.get("completedAt"),
+    }
+
+
+def correlation_id(order: Dict[str, Any]) -> str:
+    """Stable correlation id of an order: the same on every poll and every server
+
+    Also computed by the `$project` stage of the order view, so both paths
+    agree.
+    """
+    return order.get("correlationId") or str(order.get("_id"))
+
+
+def transform_restaurant_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform order to the format expected by the restaurant app.
+
+    Args:
+        order: Order as stored in MongoDB
+
+    Returns:
+        Order with orderCode, restaurant, totalPriceCents and startedAt
+    """
+    return {
+        "_id": order.get("_id"),
+        "orderCode": order.get("orderId"),
+        "paymentId": order.get("paymentId", ""),
+        "restaurant": order.get("restaurantId"),
+        "meta": {"correlationId": correlation_id(order)},
+        "customer": order.get("customer", {}),
+        "origin": order.get("origin", {}),
+        "items": [transform_restaurant_order_item(item) for item in order.get("items") or []],
+        "startedAt": order.get("createdAt"),
+        "totalPriceCents": order.get("totalCents", 0),
+        "getSms": False,
+        "status": order.get("status"),
+        "endedAt": order.get("pickedUpAt"),
+    }
+
+
+# Compiled transformers
+#
+# The functions above are the reference implementation. For large menus the
+# per-field function calls dominate, so the same shapes are described once
+# as field specs and compiled into a single function made of nested dict
+# literals and comprehensions. The output is identical to the reference.
+
+_VALUE = "value"  # source.get(key, default)
+_TEXT = "text"  # to_multilingual(source.get(key))
+_LIST = "list"  # [<nested spec> for element in source.get(key, [])]
+_RENAMED = "renamed"  # source.get(source_key, default); argument is (source_key, default)
+_CONSTANT = "constant"  # argument, whatever the source holds
+_OBJECT = "object"  # <nested spec> applied to the same source
+_ITEMS = "items"  # [<nested spec> for element in source.get(key) or []]
+_CORRELATION = "correlation"  # correlation_id(source)
+
+FieldSpec = Tuple[str, str, Any]
+
+MODIFIER_OPTION_FIELDS: List[FieldSpec] = [
+    ("id", _VALUE, ""),
+    ("name", _TEXT, None),
+    ("priceCents", _VALUE, 0),
+]
+
+MODIFIER_FIELDS: List[FieldSpec] = [
+    ("id", _VALUE, ""),
+    ("name", _TEXT, None),
+    ("type", _VALUE, "standard"),
+    ("required", _VALUE, False),
+    ("selectionMode", _VALUE, "single"),
+    ("maxChoices", _VALUE, 1),
+    ("freeChoices", _VALUE, 1),
+    ("extraChoicePriceCents", _VALUE, 0),
+    ("options", _LIST, MODIFIER_OPTION_FIELDS),
+]
+
+VARIANT_FIELDS: List[FieldSpec] = [
+    ("id", _VALUE, ""),
+    ("name", _VALUE, ""),
+    ("priceCents", _VALUE, 0),
+    ("default", _VALUE, False),
+]
+
+MENU_ITEM_FIELDS: List[FieldSpec] = [
+    ("id", _VALUE, ""),
+    ("name", _TEXT, None),
+    ("description", _TEXT, None),
+    ("imageUrls", _VALUE, []),
+    ("categoryId", _VALUE, ""),
+    ("priceCents", _VALUE, 0),
+    ("makingCostCents", _VALUE, 0),
+    ("isAvailable", _VALUE, True),
+    ("stationTags", _VALUE, []),
+    ("variants", _LIST, VARIANT_FIELDS),
+    ("modifiers", _LIST, MODIFIER_FIELDS),
+]
+
+CATEGORY_FIELDS: List[FieldSpec] = [
+    ("id", _VALUE, ""),
+    ("name", _TEXT, None),
+    ("description", _TEXT, None),
+    ("sortOrder", _VALUE, 0),
+    ("emoji", _VALUE, None),
+]
+
+MENU_FIELDS: List[FieldSpec] = [
+    ("_id", _VALUE, ""),
+    ("restaurantId", _VALUE, ""),
+    ("locationId", _VALUE, ""),
+    ("menuSlug", _VALUE, ""),
+    ("name", _TEXT, None),
+    ("categories", _LIST, CATEGORY_FIELDS),
+    ("items", _LIST, MENU_ITEM_FIELDS),
+    ("salesTax", _VALUE, 0.0),
+]
+
+
+def _dict_expression(fields: List[FieldSpec], source: str, depth: int) -> str:
+    """Python expression building the output dict for one spec level"""
+    entries = []
+    for key, kind, argument in fields:
+        if kind == _VALUE:
+            value = f"{source}.get({key!r}, {argument!r})"
+        elif kind == _TEXT:
+            # to_multilingual inlined for the common dict case
+            text = f"t{depth}"
+            value = (
+                f"({{'en': {text}.get('en', ''), 'es': {text}.get('es', ''), "
+                f"'pt': {text}.get('pt', '')}} "
+                f"if isinstance({text} := {source}.get({key!r}), dict) else _text({text}))"
+            )
+        elif kind == _LIST:
+            element = f"e{depth}"
+            nested = _dict_expression(argument, element, depth + 1)
+            value = f"[{nested} for {element} in {source}.get({key!r}, [])]"
+        elif kind == _RENAMED:
+            source_key, default = argument
+            value = f"{source}.get({source_key!r}, {default!r})"
+        elif kind == _CONSTANT:
+            value = repr(argument)
+        elif kind == _OBJECT:
+            value = _dict_expression(argument, source, depth)
+        elif kind == _ITEMS:
+            element = f"e{depth}"
+            nested = _dict_expression(argument, element, depth + 1)
+            value = f"[{nested} for {element} in ({source}.get({key!r}) or [])]"
+        elif kind == _CORRELATION:
+            value = f"({source}.get('correlationId') or str({source}.get('_id')))"
+        else:
+            raise ValueError(f"Unknown field kind '{kind}' for '{key}'")
+        entries.append(f"{key!r}: {value}")
+    return "{" + ", ".join(entries) + "}"
+
+
+def compile_transformer(
+    fields: List[FieldSpec], name: str
+) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Compile field specs into a single transformation function
+
+    Args:
+        fields: Field specs of the top-level document
+        name: Function name, shown in tracebacks and profiles
+
+    Returns:
+        Function taking the raw document and returning the wire shape. The
+        generated source is available as its `source` attribute.
+    """
+    source = f"def {name}(document):\n    return {_dict_expression(fields, 'document', 0)}\n"
+    namespace: Dict[str, Any] = {"_text": to_multilingual}
+    exec(compile(source, f"<compiled {name}>", "exec"), namespace)
+    function = namespace[name]
+    function.source = source
+    return function
+
+
+transform_menu_compiled = compile_transformer(MENU_FIELDS, "transform_menu_compiled")
+
+
+# Restaurant app order view
+#
+# Compiled like the menu, and also translated into a `$project` stage so
+# MongoDB can return the restaurant app shape directly.
+
+ORDER_VIEW_ITEM_FIELDS: List[FieldSpec] = [
+    ("id", _VALUE, None),
+    ("menuItemId", _VALUE, None),
+    ("name", _VALUE, None),
+    ("priceCents", _RENAMED, ("price", 0)),
+    ("notes", _VALUE, None),
+    ("modifiers", _VALUE, []),
+    ("variants", _VALUE, []),
+    ("stationTags", _VALUE, []),
+    ("startedAt", _VALUE, None),
+    ("completedAt", _VALUE, None),
+]
+
+ORDER_VIEW_FIELDS: List[FieldSpec] = [
+    ("_id", _VALUE, None),
+    ("orderCode", _RENAMED, ("orderId", None)),
+    ("paymentId", _VALUE, ""),
+    ("restaurant", _RENAMED, ("restaurantId", None)),
+    ("meta", _OBJECT, [("correlationId", _CORRELATION, None)]),
+    ("customer", _VALUE, {}),
+    ("origin", _VALUE, {}),
+    ("items", _ITEMS, ORDER_VIEW_ITEM_FIELDS),
+    ("startedAt", _RENAMED, ("createdAt", None)),
+    ("totalPriceCents", _RENAMED, ("totalCents", 0)),
+    ("getSms", _CONSTANT, False),
+    ("status", _VALUE, None),
+    ("endedAt", _RENAMED, ("pickedUpAt", None)),
+]
+
+
+def _field_or_default(path: str, default: Any) -> Dict[str, Any]:
+    """Aggregation expression with the semantics of dict.get(key, default)
+
+    A stored null stays null; only a missing field takes the default.
+    """
+    return {"$cond": [{"$eq": [{"$type": path}, "missing"]}, {"$literal": default}, path]}
+
+
+def _project_expression(fields: List[FieldSpec], prefix: str) -> Dict[str, Any]:
+    """Aggregation object expression building one spec level"""
+    document: Dict[str, Any] = {}
+    for key, kind, argument in fields:
+        if kind == _VALUE:
+            value = _field_or_default(f"{prefix}{key}", argument)
+        elif kind == _RENAMED:
+            source_key, default = argument
+            value = _field_or_default(f"{prefix}{source_key}", default)
+        elif kind == _CONSTANT:
+            value = {"$literal": argument}
+        elif kind == _OBJECT:
+            value = _project_expression(argument, prefix)
+        elif kind == _ITEMS:
+            value = {
+                "$map": {
+                    "input": {"$ifNull": [f"{prefix}{key}", []]},
+                    "as": "element",
+                    "in": _project_expression(argument, "$$element."),
+                }
+            }
+        elif kind == _CORRELATION:
+            value = {"$ifNull": [f"{prefix}correlationId", {"$toString": f"{prefix}_id"}]}
+        else:
+            raise ValueError(f"Field kind '{kind}' of '{key}' has no aggregation equivalent")
+        document[key] = value
+    return document
+
+
+def compile_project_stage(fields: List[FieldSpec]) -> Dict[str, Any]:
+    """`$project` stage producing the same documents as `compile_transformer`
+
+    `_id` is returned as a string, as the repositories do for raw reads.
+    """
+    document = _project_expression(fields, "$")
+    if "_id" in document:
+        document["_id"] = {"$toString": "$_id"}
+    return {"$project": document}
+
+
+transform_restaurant_order_compiled = compile_transformer(
+    ORDER_VIEW_FIELDS, "transform_restaurant_order_compiled"
+)
+ORDER_VIEW_STAGE = compile_project_stage(ORDER_VIEW_FIELDS)
@@ -5,9 +5,12 @@ from fastapi import Depends
 from app.core.database import get_database
 from app.repositories.menu_repository import MenuRepository
 from app.repositories.order_repository import OrderRepository
+from app.repositories.report_repository import ReportRepository
 from app.repositories.restaurant_repository import RestaurantRepository
+from app.repositories.session_repository import SessionRepository
 from app.services.menu_service import MenuService
 from app.services.order_service import OrderService
+from app.services.report_service import ReportService
 from app.services.restaurant_service import RestaurantService
 
 
@@ -30,12 +33,26 @@ def get_order_repository() -> OrderRepository:
     return OrderRepository(db)
 
 
+def get_report_repository() -> ReportRepository:
+    """Get report repository instance"""
+    db = get_database()
+    return ReportRepository(db)
+
+
+def get_report_service(
+    repository: ReportRepository = Depends(get_report_repository),
+) -> ReportService:
+    """Get report service instance"""
+    return ReportService(repository)
+
+
 def get_order_service(
     order_repo: OrderRepository = Depends(get_order_repository),
     menu_repo: MenuRepository = Depends(get_menu_repository),
+    report_repo: ReportRepository = Depends(get_report_repository),
 ) -> OrderService:
     """Get order service instance"""
-    return OrderService(order_repo, menu_repo)
+    return OrderService(order_repo, menu_repo, report_repo)
 
 
 def get_restaurant_repository() -> RestaurantRepository:
@@ -49,3 +66,9 @@ def get_restaurant_service(
 ) -> RestaurantService:
     """Get restaurant service instance"""
     return RestaurantService(repository)
+
+
+def get_session_repository() -> SessionRepository:
+    """Get session repository instance"""
+    db = get_database()
+    return SessionRepository(db)
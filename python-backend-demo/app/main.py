@@ -2,16 +2,27 @@
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, List
 from loguru import logger
+import asyncio
 import socketio
 
 from app.config import settings
-from app.core.database import connect_to_mongo, close_mongo_connection
+from app.core.database import connect_to_mongo, close_mongo_connection, get_database
+from app.core.indexes import ensure_indexes, verify_query_plans
+from app.repositories.order_repository import OrderRepository, flush_preview_writes
+from app.services.active_orders import active_order_board
+from app.services.order_feed import order_feed
 from app.core.logging import setup_logging
 from app.core.exceptions import AppException
-from app.core.socketio import socket_app, sio
+from app.core.cache import cache_stats
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, render_text
+from app.core.mongo_monitoring import pool_stats
+from app.core.request_metrics import RequestMetricsMiddleware
+from app.core.socketio import event_bus, socket_app, sio
+from app.core.tokens import access_token_signer, signed_access_tokens
 from app.api.v1.api import api_router
 
 
@@ -19,15 +30,62 @@ from app.api.v1.api import api_router
 setup_logging()
 
 
+async def _logged(step: Callable[[], Awaitable], description: str) -> None:
+    """Run a startup step, logging instead of raising when it fails"""
+    try:
+        await step()
+    except Exception as e:
+        logger.error(f"{description} failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
     # Startup
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
     await connect_to_mongo()
+    # With LAZY_STARTUP, steps the API can serve without run after startup
+    background: List[asyncio.Task] = []
+    if settings.DB_ENSURE_INDEXES:
+        # Query plans can only be verified once the indexes exist
+        if settings.LAZY_STARTUP and not settings.DB_VERIFY_QUERY_PLANS:
+            # Unique indexes keep checkouts idempotent, so they exist before serving
+            await ensure_indexes(get_database(), unique_only=True)
+            ensure = _logged(lambda: ensure_indexes(get_database()), "Ensuring indexes")
+            background.append(asyncio.create_task(ensure))
+        else:
+            await ensure_indexes(get_database())
+    if settings.DB_VERIFY_QUERY_PLANS:
+        collection_scans = await verify_query_plans(get_database())
+        if collection_scans:
+            raise RuntimeError(f"Query shapes without a usable index: {collection_scans}")
+    if signed_access_tokens():
+        # Fail at startup, not on the first sign-in, when the secret is missing
+        access_token_signer()
+    event_bus.start()
+    if settings.ORDER_FEED_ENABLED:
+        order_repo = OrderRepository(get_database())
+        # The feed keeps the board current with writes from every worker
+        order_feed.add_listener(active_order_board.apply)
+        order_feed.start(order_repo)
+        # Until warmed, open orders are read from MongoDB
+        warm = _logged(
+            lambda: active_order_board.warm(order_repo), "Warming the active order board"
+        )
+        if settings.LAZY_STARTUP:
+            background.append(asyncio.create_task(warm))
+        else:
+            await warm
     yield
     # Shutdown
     logger.info("Shutting down application...")
+    for task in background:
+        task.cancel()
+    await asyncio.gather(*background, return_exceptions=True)
+    await order_feed.stop()
+    active_order_board.clear()
+    await event_bus.stop()
+    await flush_preview_writes()
     await close_mongo_connection()
 
 
@@ -51,6 +109,10 @@ app.add_middleware(
     expose_headers=["front-token", "st-access-token", "st-refresh-token"],  # Headers for auth
 )
 
+# Per-route latency, response size and MongoDB time (outermost, so CORS is timed too)
+if settings.HTTP_METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware)
+
 
 # Exception handlers
 @app.exception_handler(AppException)
@@ -128,17 +190,40 @@ async def socket_status():
     }
 
 
+# Cache status endpoint
+@app.get("/cache-status", tags=["Health"])
+async def cache_status():
+    """In-process cache hit/miss/eviction counters"""
+    return {"caches": cache_stats()}
+
+
+# Database pool status endpoint
+@app.get("/db-status", tags=["Health"])
+async def db_status():
+    """MongoDB pool checkout wait, saturation and command latency"""
+    return pool_stats()
+
+
+# Prometheus metrics endpoint
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics():
+    """Request, event bus and MongoDB metrics for this worker process only"""
+    return Response(content=render_text(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 # Wrap the FastAPI app with Socket.IO
 app = socketio.ASGIApp(sio, other_asgi_app=app)
 
 
 if __name__ == "__main__":
-    import uvicorn
-
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=settings.PORT,
-        reload=settings.DEBUG,
-        log_level="debug" if settings.DEBUG else "info",
-    )
+    # Development: python -m app.main; production: python -m app.server
+    if settings.DEBUG:
+        import uvicorn
+
+        uvicorn.run(
+            "app.main:app", host="0.0.0.0", port=settings.PORT, reload=True, log_level="debug"
+        )
+    else:
+        from app.server import main
+
+        main()
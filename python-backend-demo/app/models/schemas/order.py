@@ -15,6 +15,24 @@ class OrderStatus(str, Enum):
     ORDER_CANCELLED = "order_cancelled"
 
 
+# Orders a kitchen still has to work on
+OPEN_ORDER_STATUSES = (
+    OrderStatus.ORDER_CREATED,
+    OrderStatus.ORDER_ACCEPTED,
+    OrderStatus.READY_FOR_PICKUP,
+)
+
+# Statuses an order may move to each status from:
+# created -> accepted -> ready -> delivered, cancelled from any open status
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.ORDER_CREATED: (),
+    OrderStatus.ORDER_ACCEPTED: (OrderStatus.ORDER_CREATED,),
+    OrderStatus.READY_FOR_PICKUP: (OrderStatus.ORDER_ACCEPTED,),
+    OrderStatus.ORDER_DELIVERED: (OrderStatus.READY_FOR_PICKUP,),
+    OrderStatus.ORDER_CANCELLED: OPEN_ORDER_STATUSES,
+}
+
+
 class OriginInput(BaseModel):
     """Origin information"""
     id: str
@@ -69,6 +87,7 @@ class CreateOrderRequest(BaseModel):
     restaurantId: str
     locationId: str
     locationSlug: str
+    menuId: Optional[str] = None  # Prices are checked against this menu when given
     origin: OriginInput
     customer: CustomerInput
     items: List[OrderItemInput]
@@ -123,8 +142,9 @@ class OrderResponse(BaseModel):
     restaurantId: str
     locationId: str
     locationSlug: str
-    origin: OriginInput
-    customer: CustomerInput
+    # Missing on orders checked out from previews placed without them
+    origin: Optional[OriginInput] = None
+    customer: Optional[CustomerInput] = None
     items: List[OrderItemResponse]
     status: OrderStatus
     subtotalCents: int
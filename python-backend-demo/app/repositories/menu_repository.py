@@ -1,12 +1,26 @@
 """Menu repository for database operations"""
 
-from typing import Optional, List
+from typing import Mapping, Optional, List
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from loguru import logger
 
 from app.core.constants import Collections
-from app.models.domain.menu import Menu
+
+# Fields the pricing engine indexes: item, variant and modifier prices and
+# the sales tax. Pass as `projection` to skip names, images and descriptions.
+MENU_PRICING_VIEW: Mapping[str, int] = {
+    "salesTax": 1,
+    "items.id": 1,
+    "items.priceCents": 1,
+    "items.variants.id": 1,
+    "items.variants.priceCents": 1,
+    "items.modifiers.id": 1,
+    "items.modifiers.freeChoices": 1,
+    "items.modifiers.extraChoicePriceCents": 1,
+    "items.modifiers.options.id": 1,
+    "items.modifiers.options.priceCents": 1,
+}
 
 
 class MenuRepository:
@@ -16,9 +30,18 @@ class MenuRepository:
         self.collection = db[Collections.MENUS]
 
     async def find_by_id(
-        self, restaurant_id: str, location_id: str, menu_id: str
+        self,
+        restaurant_id: str,
+        location_id: str,
+        menu_id: str,
+        projection: Optional[Mapping[str, int]] = None,
     ) -> Optional[dict]:
-        """Find menu by restaurant ID, location ID, and menu ID"""
+        """Find menu by restaurant ID, location ID, and menu ID
+
+        Args:
+            projection: Fields to read, e.g. MENU_PRICING_VIEW; the whole
+                document when None
+        """
         try:
             # Try as ObjectId first, then as string
             try:
@@ -31,7 +54,8 @@ class MenuRepository:
                     "_id": query_id,
                     "restaurantId": restaurant_id,
                     "locationId": location_id,
-                }
+                },
+                projection,
             )
 
             if menu:
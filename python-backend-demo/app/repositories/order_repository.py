@@ -1,13 +1,77 @@
 """Order repository for database operations"""
 
-from typing import Optional, List
-from datetime import datetime
+from typing import AsyncIterator, Dict, Mapping, Optional, List, Tuple
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from loguru import logger
+import asyncio
 import uuid
 
+from app.config import settings
+from app.core.cache import preview_cache
 from app.core.constants import Collections
-from app.models.schemas.order import OrderStatus
+from app.core.streaming import iter_batches, keyset_after
+from app.core.transformers import ORDER_VIEW_STAGE
+from app.repositories.restaurant_repository import RestaurantRepository
+from app.models.schemas.order import (
+    OPEN_ORDER_STATUSES,
+    ORDER_STATUS_TRANSITIONS,
+    OrderResponse,
+    OrderStatus,
+)
+
+Projection = Mapping[str, int]
+
+# Named projections for reads that need part of an order. Pass one as
+# `projection`; None reads the whole document.
+
+# Order status polling (`OrderStatusResponse`)
+ORDER_STATUS_VIEW: Projection = {
+    "orderId": 1,
+    "status": 1,
+    "updatedAt": 1,
+    "estimatedReadyAt": 1,
+}
+
+# Restaurant app / kitchen display (`transform_restaurant_order`), plus the
+# fields the order feed orders and files changes by
+ORDER_KITCHEN_VIEW: Projection = {
+    "orderId": 1,
+    "correlationId": 1,
+    "restaurantId": 1,
+    "locationId": 1,
+    "paymentId": 1,
+    "customer": 1,
+    "origin": 1,
+    "items": 1,
+    "status": 1,
+    "totalCents": 1,
+    "createdAt": 1,
+    "updatedAt": 1,
+    "pickedUpAt": 1,
+}
+
+# Customer-facing order details (`OrderResponse`)
+ORDER_RECEIPT_VIEW: Projection = {
+    field.alias or name: 1 for name, field in OrderResponse.model_fields.items()
+}
+
+# Background preview inserts (write-behind), keyed by previewOrderId
+_pending_preview_writes: Dict[str, asyncio.Task] = {}
+
+# Background deletes of checked-out previews, keyed by previewOrderId
+_pending_preview_deletes: Dict[str, asyncio.Task] = {}
+
+
+async def flush_preview_writes() -> None:
+    """Wait for outstanding background preview writes (called on shutdown)"""
+    pending = [*_pending_preview_writes.values(), *_pending_preview_deletes.values()]
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
 
 
 class OrderRepository:
@@ -16,6 +80,7 @@ class OrderRepository:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.collection = db[Collections.ORDERS]
         self.preview_collection = db[Collections.ORDERS_PREVIEW]
+        self.restaurant_repo = RestaurantRepository(db)
 
     async def create_order(self, order_data: dict) -> dict:
         """Create a new order"""
@@ -41,10 +106,77 @@ class OrderRepository:
             logger.error(f"Error creating order: {e}")
             raise
 
-    async def find_by_id(self, order_id: str) -> Optional[dict]:
-        """Find order by ID"""
+    async def create_order_for_preview(
+        self, preview_id: str, order_data: dict
+    ) -> Tuple[dict, bool]:
+        """Create the order for a preview, at most once
+
+        A single upsert on the unique previewOrderId index either inserts
+        the order or returns the one an earlier checkout created.
+
+        Returns:
+            The order and whether this call created it
+        """
+        order_id = f"ORD-{uuid.uuid4().hex[:8].upper()}"
+        now = datetime.utcnow()
+        order_doc = {
+            **order_data,
+            "previewOrderId": preview_id,
+            "orderId": order_id,
+            "status": OrderStatus.ORDER_CREATED,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+
+        try:
+            order = await self.collection.find_one_and_update(
+                {"previewOrderId": preview_id},
+                {"$setOnInsert": order_doc},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # A concurrent checkout of the same preview inserted first
+            order = await self.collection.find_one({"previewOrderId": preview_id})
+
+        order["_id"] = str(order["_id"])
+        created = order["orderId"] == order_id
+
+        if created:
+            logger.info(f"Created order {order_id} from preview {preview_id}")
+        else:
+            logger.info(f"Preview {preview_id} already checked out as {order['orderId']}")
+
+        return order, created
+
+    async def find_by_preview_id(self, preview_id: str) -> Optional[dict]:
+        """Find the order created from a preview"""
+        try:
+            order = await self.collection.find_one({"previewOrderId": preview_id})
+
+            if order:
+                order["_id"] = str(order["_id"])
+
+            return order
+
+        except Exception as e:
+            logger.error(f"Error finding order for preview {preview_id}: {e}")
+            return None
+
+    async def find_by_id(
+        self,
+        order_id: str,
+        projection: Optional[Projection] = None
+    ) -> Optional[dict]:
+        """Find order by ID
+
+        Args:
+            order_id: The order identifier
+            projection: Fields to read, e.g. ORDER_STATUS_VIEW; the whole
+                document when None
+        """
         try:
-            order = await self.collection.find_one({"orderId": order_id})
+            order = await self.collection.find_one({"orderId": order_id}, projection)
 
             if order:
                 order["_id"] = str(order["_id"])
@@ -62,26 +194,40 @@ class OrderRepository:
         status: OrderStatus,
         estimated_minutes: Optional[int] = None
     ) -> Optional[dict]:
-        """Update order status"""
+        """Move an order to a new status in one conditional update
+
+        The filter only matches orders whose current status may move to
+        `status` (ORDER_STATUS_TRANSITIONS), so concurrent taps cannot both
+        apply the same transition.
+
+        Returns:
+            The updated order, or None when no order matched: either it
+            does not exist or its current status does not allow the move
+        """
         try:
+            now = datetime.utcnow()
             update_data = {
                 "status": status,
-                "updatedAt": datetime.utcnow(),
+                "updatedAt": now,
             }
 
             # Set timestamps based on status
-            if status == OrderStatus.ACCEPTED and estimated_minutes:
-                update_data["estimatedReadyAt"] = datetime.utcnow()
-                # Add estimated minutes logic here if needed
-            elif status == OrderStatus.READY:
-                update_data["readyAt"] = datetime.utcnow()
-            elif status == OrderStatus.PICKED_UP:
-                update_data["pickedUpAt"] = datetime.utcnow()
+            if status == OrderStatus.ORDER_ACCEPTED and estimated_minutes:
+                update_data["estimatedReadyAt"] = now + timedelta(minutes=estimated_minutes)
+            elif status == OrderStatus.READY_FOR_PICKUP:
+                update_data["readyAt"] = now
+            elif status == OrderStatus.ORDER_DELIVERED:
+                # Reports bucket completed orders by endedAt
+                update_data["pickedUpAt"] = now
+                update_data["endedAt"] = now
 
             result = await self.collection.find_one_and_update(
-                {"orderId": order_id},
+                {
+                    "orderId": order_id,
+                    "status": {"$in": list(ORDER_STATUS_TRANSITIONS[status])},
+                },
                 {"$set": update_data},
-                return_document=True
+                return_document=ReturnDocument.AFTER
             )
 
             if result:
@@ -92,25 +238,54 @@ class OrderRepository:
 
         except Exception as e:
             logger.error(f"Error updating order {order_id} status: {e}")
-            return None
+            raise
+
+    def _location_query(
+        self,
+        restaurant_id: str,
+        location_id: str,
+        status: Optional[OrderStatus] = None,
+        after: Optional[tuple] = None
+    ) -> dict:
+        """Filter for a location's orders, optionally after a keyset cursor"""
+        query = {
+            "restaurantId": restaurant_id,
+            "locationId": location_id
+        }
+
+        if status:
+            query["status"] = status
+
+        if after:
+            query.update(keyset_after(*after))
+
+        return query
 
     async def find_by_restaurant_and_location(
         self,
         restaurant_id: str,
         location_id: str,
-        status: Optional[OrderStatus] = None
+        status: Optional[OrderStatus] = None,
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None
     ) -> List[dict]:
-        """Find orders by restaurant and location"""
+        """Find orders by restaurant and location
+
+        Args:
+            restaurant_id: The restaurant identifier
+            location_id: The location identifier
+            status: Optional status filter
+            limit: Maximum number of orders to return (page size)
+            after: Decoded keyset cursor (createdAt, _id) to resume after
+
+        Returns:
+            Orders sorted newest first
+        """
         try:
-            query = {
-                "restaurantId": restaurant_id,
-                "locationId": location_id
-            }
-
-            if status:
-                query["status"] = status
-
-            cursor = self.collection.find(query).sort("createdAt", -1)
+            query = self._location_query(restaurant_id, location_id, status, after)
+            cursor = self.collection.find(query).sort([("createdAt", -1), ("_id", -1)])
+            if limit:
+                cursor = cursor.limit(limit)
 
             orders = []
             async for order in cursor:
@@ -124,86 +299,226 @@ class OrderRepository:
             logger.error(f"Error finding orders: {e}")
             return []
 
+    async def iter_by_restaurant_and_location(
+        self,
+        restaurant_id: str,
+        location_id: str,
+        status: Optional[OrderStatus] = None,
+        batch_size: int = 500
+    ) -> AsyncIterator[List[dict]]:
+        """Yield a location's orders in batches straight from the cursor
+
+        Only one batch is held in memory at a time, however many orders
+        the location has accumulated.
+        """
+        query = self._location_query(restaurant_id, location_id, status)
+        cursor = self.collection.find(query).sort([("createdAt", -1), ("_id", -1)])
+
+        async for batch in iter_batches(cursor, batch_size):
+            yield batch
+
+    def watch_changes(self, resume_after: Optional[dict] = None):
+        """Change stream of inserted, updated and replaced orders
+
+        Needs a replica set. Each change carries the order as it is after
+        the write (`fullDocument`).
+        """
+        return self.collection.watch(
+            [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}],
+            full_document="updateLookup",
+            resume_after=resume_after
+        )
+
+    async def find_updated_since(self, since: datetime, limit: int = 1000) -> List[dict]:
+        """Orders written at or after `since`, oldest write first"""
+        cursor = (
+            self.collection.find({"updatedAt": {"$gte": since}}).sort("updatedAt", 1).limit(limit)
+        )
+
+        orders = []
+        async for order in cursor:
+            order["_id"] = str(order["_id"])
+            orders.append(order)
+
+        return orders
+
+    async def find_open_orders(
+        self,
+        restaurant_id: Optional[str] = None,
+        location_id: Optional[str] = None
+    ) -> List[dict]:
+        """Orders not delivered or cancelled yet, newest first
+
+        Without a location, the open orders of every location.
+        """
+        query = {"status": {"$in": [status.value for status in OPEN_ORDER_STATUSES]}}
+        if restaurant_id and location_id:
+            query.update(restaurantId=restaurant_id, locationId=location_id)
+
+        cursor = self.collection.find(query).sort([("createdAt", -1), ("_id", -1)])
+
+        orders = []
+        async for order in cursor:
+            order["_id"] = str(order["_id"])
+            orders.append(order)
+
+        return orders
+
     async def find_today_orders(
         self,
         restaurant_id: str,
-        location_id: str
+        location_id: str,
+        projection: Optional[Projection] = None
     ) -> List[dict]:
-        """Find today's orders for a restaurant location (timezone-aware)"""
+        """Find today's orders for a restaurant location (timezone-aware)
+
+        Errors are logged and read as no orders; use `load_today_orders`
+        where a failed read must not look like an empty day.
+
+        Args:
+            restaurant_id: The restaurant identifier
+            location_id: The location identifier
+            projection: Fields to read, e.g. ORDER_KITCHEN_VIEW; the whole
+                document when None
+        """
         try:
-            # Get location to retrieve timezone
-            from app.core.database import db
-            location = await db.db.locations.find_one({
-                "_id": location_id,
-                "restaurantId": restaurant_id
-            })
-
-            if not location:
-                logger.error(f"Location not found: {location_id}")
-                return []
+            return await self.load_today_orders(restaurant_id, location_id, projection)
+        except Exception as e:
+            logger.error(f"Error finding today's orders: {e}")
+            return []
 
-            # Get location timezone (default to UTC if not set)
-            from zoneinfo import ZoneInfo
-            from datetime import date, time
-
-            tz_name = location.get("timezone", "UTC")
-            try:
-                tz = ZoneInfo(tz_name)
-            except Exception:
-                logger.warning(f"Invalid timezone {tz_name}, using UTC")
-                tz = ZoneInfo("UTC")
-
-            # Calculate today's date range in location timezone
-            now_local = datetime.now(tz)
-            today_start_local = datetime.combine(now_local.date(), time.min).replace(tzinfo=tz)
-            today_end_local = datetime.combine(now_local.date(), time.max).replace(tzinfo=tz)
-
-            # Convert to UTC for database query
-            today_start_utc = today_start_local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
-            today_end_utc = today_end_local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
-
-            logger.debug(f"Querying orders for {tz_name}: {today_start_local} to {today_end_local}")
-
-            query = {
-                "restaurantId": restaurant_id,
-                "locationId": location_id,
-                "createdAt": {
-                    "$gte": today_start_utc,
-                    "$lte": today_end_utc
-                }
-            }
+    async def load_today_orders(
+        self,
+        restaurant_id: str,
+        location_id: str,
+        projection: Optional[Projection] = None
+    ) -> List[dict]:
+        """Today's orders for a restaurant location, raising on database errors"""
+        query = await self._today_query(restaurant_id, location_id)
+        if query is None:
+            return []
 
-            cursor = self.collection.find(query).sort("createdAt", -1)
+        cursor = self.collection.find(query, projection).sort("createdAt", -1)
 
-            orders = []
-            async for order in cursor:
-                order["_id"] = str(order["_id"])
-                orders.append(order)
+        orders = []
+        async for order in cursor:
+            order["_id"] = str(order["_id"])
+            orders.append(order)
 
-            logger.debug(f"Found {len(orders)} orders today for {restaurant_id}/{location_id}")
-            return orders
+        logger.debug(f"Found {len(orders)} orders today for {restaurant_id}/{location_id}")
+        return orders
+
+    async def find_today_order_views(self, restaurant_id: str, location_id: str) -> List[dict]:
+        """Today's orders in the restaurant app format, shaped by MongoDB
+
+        Same documents as `transform_restaurant_order` over
+        `find_today_orders`, built by a `$project` stage instead of Python.
+        """
+        try:
+            query = await self._today_query(restaurant_id, location_id)
+            if query is None:
+                return []
+
+            pipeline = [{"$match": query}, {"$sort": {"createdAt": -1}}, ORDER_VIEW_STAGE]
+            views = [view async for view in self.collection.aggregate(pipeline)]
+
+            logger.debug(f"Found {len(views)} orders today for {restaurant_id}/{location_id}")
+            return views
 
         except Exception as e:
             logger.error(f"Error finding today's orders: {e}")
             return []
 
+    async def find_order_view(self, order_id: str) -> Optional[dict]:
+        """One order in the restaurant app format, shaped by MongoDB"""
+        try:
+            pipeline = [{"$match": {"orderId": order_id}}, {"$limit": 1}, ORDER_VIEW_STAGE]
+            async for view in self.collection.aggregate(pipeline):
+                return view
+            return None
+
+        except Exception as e:
+            logger.error(f"Error finding order {order_id}: {e}")
+            return None
+
+    async def _today_query(self, restaurant_id: str, location_id: str) -> Optional[dict]:
+        """Filter for the orders created today in the location's timezone
+
+        Returns:
+            None when the location does not exist
+        """
+        # Location timezone from the metadata cache
+        tz = await self.restaurant_repo.find_location_timezone(restaurant_id, location_id)
+
+        if not tz:
+            logger.error(f"Location not found: {location_id}")
+            return None
+
+        # Calculate today's date range in location timezone
+        now_local = datetime.now(tz)
+        today_start_local = datetime.combine(now_local.date(), time.min).replace(tzinfo=tz)
+        today_end_local = datetime.combine(now_local.date(), time.max).replace(tzinfo=tz)
+
+        # Convert to UTC for database query
+        today_start_utc = today_start_local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+        today_end_utc = today_end_local.astimezone(ZoneInfo("UTC")).replace(tzinfo=None)
+
+        logger.debug(f"Querying orders for {tz.key}: {today_start_local} to {today_end_local}")
+
+        return {
+            "restaurantId": restaurant_id,
+            "locationId": location_id,
+            "createdAt": {
+                "$gte": today_start_utc,
+                "$lte": today_end_utc
+            }
+        }
+
     async def save_preview_order(self, preview_data: dict) -> dict:
-        """Save preview order to temporary collection"""
+        """Save preview order to temporary collection
+
+        Recent previews are kept in process for checkout. With
+        PREVIEW_STORE_IN_MEMORY the MongoDB insert also happens in the
+        background; the TTL index on createdAt expires abandoned previews
+        either way.
+        """
         try:
             preview_data["createdAt"] = datetime.utcnow()
-            result = await self.preview_collection.insert_one(preview_data)
-            preview_data["_id"] = str(result.inserted_id)
+            document = {**preview_data, "_id": ObjectId()}
+            preview_data["_id"] = str(document["_id"])
+            preview_id = preview_data["previewOrderId"]
+
+            if settings.PREVIEW_STORE_IN_MEMORY:
+                task = asyncio.create_task(self._write_preview(preview_id, document))
+                _pending_preview_writes[preview_id] = task
+                task.add_done_callback(lambda _: _pending_preview_writes.pop(preview_id, None))
+            else:
+                await self.preview_collection.insert_one(document)
+
+            preview_cache.set(preview_id, preview_data)
 
-            logger.info(f"Saved preview order: {preview_data['previewOrderId']}")
+            logger.info(f"Saved preview order: {preview_id}")
             return preview_data
 
         except Exception as e:
             logger.error(f"Error saving preview order: {e}")
             raise
 
+    async def _write_preview(self, preview_id: str, document: dict) -> None:
+        """Write-behind insert of an in-memory preview"""
+        try:
+            await self.preview_collection.insert_one(document)
+        except Exception as e:
+            logger.error(f"Error writing preview order {preview_id} to MongoDB: {e}")
+
     async def find_preview_by_id(self, preview_id: str) -> Optional[dict]:
         """Find preview order by ID"""
         try:
+            cached = preview_cache.get(preview_id)
+            if cached is not None:
+                logger.debug(f"Found preview order in memory: {preview_id}")
+                return dict(cached)
+
             preview = await self.preview_collection.find_one({"previewOrderId": preview_id})
 
             if preview:
@@ -218,9 +533,42 @@ class OrderRepository:
             logger.error(f"Error finding preview order {preview_id}: {e}")
             return None
 
+    async def claim_preview_checkout(self, preview_id: str) -> bool:
+        """Mark a preview as being checked out
+
+        Atomic across processes: of several concurrent callers, only one
+        gets True and may take the payment. False means the preview is
+        already claimed or gone.
+        """
+        # The claim is made on the stored preview, so land our own insert first
+        pending = _pending_preview_writes.get(preview_id)
+        if pending is not None:
+            await asyncio.gather(pending, return_exceptions=True)
+
+        result = await self.preview_collection.update_one(
+            {"previewOrderId": preview_id, "checkoutStartedAt": {"$exists": False}},
+            {"$set": {"checkoutStartedAt": datetime.utcnow()}},
+        )
+        return result.modified_count == 1
+
+    async def release_preview_checkout(self, preview_id: str) -> None:
+        """Clear a checkout claim so the preview can be paid for again"""
+        try:
+            await self.preview_collection.update_one(
+                {"previewOrderId": preview_id}, {"$unset": {"checkoutStartedAt": ""}}
+            )
+        except Exception as e:
+            logger.error(f"Error releasing checkout of preview {preview_id}: {e}")
+
     async def delete_preview_order(self, preview_id: str):
         """Delete preview order after conversion to real order"""
         try:
+            preview_cache.pop(preview_id)
+            # Never let a pending write-behind insert resurrect the preview
+            pending = _pending_preview_writes.get(preview_id)
+            if pending is not None:
+                await asyncio.gather(pending, return_exceptions=True)
+
             result = await self.preview_collection.delete_one({"previewOrderId": preview_id})
 
             if result.deleted_count > 0:
@@ -230,3 +578,17 @@ class OrderRepository:
 
         except Exception as e:
             logger.error(f"Error deleting preview order {preview_id}: {e}")
+
+    def discard_preview_order(self, preview_id: str) -> None:
+        """Delete a checked-out preview in the background
+
+        The order already records the preview id, so the delete is off the
+        checkout path; a failed delete is left to the TTL index.
+        """
+        preview_cache.pop(preview_id)
+        if preview_id in _pending_preview_deletes:
+            return
+
+        task = asyncio.create_task(self.delete_preview_order(preview_id))
+        _pending_preview_deletes[preview_id] = task
+        task.add_done_callback(lambda _: _pending_preview_deletes.pop(preview_id, None))
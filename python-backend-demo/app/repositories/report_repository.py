@@ -0,0 +1,298 @@
+"""Report repository for sales rollup data access"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+import uuid
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, UpdateOne
+from loguru import logger
+
+from app.core.constants import Collections, OrderStatus
+from app.repositories.restaurant_repository import RestaurantRepository, resolve_timezone
+
+
+# Rollups copied from the staging collection per bulk write
+REBUILD_BATCH_SIZE = 1000
+
+
+class RollupKind:
+    """Kinds of documents stored in the sales rollup collection"""
+    DAY = "day"
+    ITEM = "item"
+    ORIGIN = "origin"
+
+
+def rollup_id(kind: str, restaurant_id: str, location_id: str, date: str, key: str = "") -> str:
+    """Deterministic rollup document ID"""
+    return f"{kind}|{restaurant_id}|{location_id}|{date}|{key}"
+
+
+class ReportRepository:
+    """Repository for per-location, per-local-day sales rollups
+
+    One collection holds three kinds of documents per location and local
+    day: a day total, one per menu item and one per order origin. They are
+    maintained incrementally as orders are delivered and can be rebuilt
+    from the orders collection.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.collection = db[Collections.SALES_ROLLUPS]
+        self.orders_collection = db[Collections.ORDERS]
+        self.locations_collection = db[Collections.LOCATIONS]
+        self.restaurant_repo = RestaurantRepository(db)
+
+    async def find_timezone(self, restaurant_id: str, location_id: str) -> ZoneInfo:
+        """Location timezone from the metadata cache, UTC when unknown"""
+        tz = await self.restaurant_repo.find_location_timezone(restaurant_id, location_id)
+        return tz or ZoneInfo("UTC")
+
+    async def record_delivered_order(self, order: dict) -> None:
+        """Add a delivered order to the rollups for its local day
+
+        Args:
+            order: Order document, including items, origin, totalCents and endedAt
+        """
+        restaurant_id = order["restaurantId"]
+        location_id = order["locationId"]
+        tz = await self.find_timezone(restaurant_id, location_id)
+        ended_at = order.get("endedAt") or datetime.utcnow()
+        date = ended_at.replace(tzinfo=ZoneInfo("UTC")).astimezone(tz).strftime("%Y-%m-%d")
+        base = {"restaurantId": restaurant_id, "locationId": location_id, "date": date}
+        items = order.get("items", [])
+
+        operations = [
+            UpdateOne(
+                {"_id": rollup_id(RollupKind.DAY, restaurant_id, location_id, date)},
+                {
+                    "$setOnInsert": {**base, "kind": RollupKind.DAY},
+                    "$inc": {"grossSalesCents": order.get("totalCents", 0), "orderCount": 1},
+                },
+                upsert=True,
+            )
+        ]
+
+        # Aggregate lines per item first so each item is one upsert
+        item_totals = defaultdict(lambda: {"soldCount": 0, "grossSalesCents": 0, "itemName": None})
+        for item in items:
+            totals = item_totals[item.get("menuItemId")]
+            totals["soldCount"] += 1
+            totals["grossSalesCents"] += item.get("price", 0)
+            if totals["itemName"] is None:
+                totals["itemName"] = item.get("name")
+
+        for menu_item_id, totals in item_totals.items():
+            operations.append(UpdateOne(
+                {
+                    "_id": rollup_id(
+                        RollupKind.ITEM, restaurant_id, location_id, date, str(menu_item_id)
+                    )
+                },
+                {
+                    "$setOnInsert": {
+                        **base,
+                        "kind": RollupKind.ITEM,
+                        "menuItemId": menu_item_id,
+                        "itemName": totals["itemName"],
+                    },
+                    "$inc": {
+                        "soldCount": totals["soldCount"],
+                        "grossSalesCents": totals["grossSalesCents"],
+                    },
+                },
+                upsert=True,
+            ))
+
+        origin = order.get("origin") or {}
+        origin_id = origin.get("id")
+        operations.append(UpdateOne(
+            {"_id": rollup_id(RollupKind.ORIGIN, restaurant_id, location_id, date, str(origin_id))},
+            {
+                "$setOnInsert": {
+                    **base,
+                    "kind": RollupKind.ORIGIN,
+                    "originId": str(origin_id) if origin_id is not None else None,
+                    "name": origin.get("name"),
+                },
+                "$inc": {"soldCount": len(items), "grossSalesCents": order.get("totalCents", 0)},
+            },
+            upsert=True,
+        ))
+
+        await self.collection.bulk_write(operations, ordered=False)
+        logger.debug(f"Recorded order {order.get('orderId')} in sales rollups for {date}")
+
+    async def find_days(
+        self, restaurant_id: str, location_id: str, start_date: str
+    ) -> List[dict]:
+        """Day totals from start_date (inclusive, YYYY-MM-DD) onwards"""
+        cursor = self.collection.find({
+            "kind": RollupKind.DAY,
+            "restaurantId": restaurant_id,
+            "locationId": location_id,
+            "date": {"$gte": start_date},
+        }).sort("date", 1)
+        return [doc async for doc in cursor]
+
+    async def find_breakdown(
+        self, kind: str, restaurant_id: str, location_id: str, date: str
+    ) -> List[dict]:
+        """Item or origin rollups for one local day, highest sales first"""
+        cursor = self.collection.find({
+            "kind": kind,
+            "restaurantId": restaurant_id,
+            "locationId": location_id,
+            "date": date,
+        }).sort("grossSalesCents", -1)
+        return [doc async for doc in cursor]
+
+    async def rebuild(
+        self,
+        restaurant_id: Optional[str] = None,
+        location_id: Optional[str] = None,
+    ) -> int:
+        """Rebuild rollups from delivered orders
+
+        Each location is rebuilt into a staging collection and then swapped
+        in, so reports never read an empty or half-built location. The
+        rebuild must still run with deliveries stopped (maintenance
+        window): a delivery recorded while a location is rebuilt can be
+        overwritten by the swap.
+
+        Args:
+            restaurant_id: Limit the rebuild to one restaurant
+            location_id: Limit the rebuild to one location
+
+        Returns:
+            Number of locations rebuilt
+        """
+        query = {}
+        if restaurant_id:
+            query["restaurantId"] = restaurant_id
+        if location_id:
+            query["_id"] = location_id
+
+        rebuilt = 0
+        projection = {"restaurantId": 1, "timezone": 1}
+        async for location in self.locations_collection.find(query, projection):
+            timezone = resolve_timezone(location.get("timezone")).key
+            await self._rebuild_location(location["restaurantId"], str(location["_id"]), timezone)
+            rebuilt += 1
+
+        return rebuilt
+
+    async def _rebuild_location(self, restaurant_id: str, location_id: str, timezone: str) -> None:
+        """Replace one location's rollups with aggregates computed server-side
+
+        The three kinds are aggregated from the same orders (delivered
+        before the rebuild started) into a staging collection, then copied
+        over the live documents; live documents the rebuild did not produce
+        are removed last.
+        """
+        rebuild_id = uuid.uuid4().hex
+        staging = self.db[f"{self.collection.name}_rebuild_{rebuild_id}"]
+        location = {"restaurantId": restaurant_id, "locationId": location_id}
+
+        match = {
+            "$match": {
+                **location,
+                "status": OrderStatus.ORDER_DELIVERED,
+                "endedAt": {"$ne": None, "$lt": datetime.utcnow()},
+            }
+        }
+        local_date = {
+            "$dateToString": {"format": "%Y-%m-%d", "date": "$endedAt", "timezone": timezone}
+        }
+        merge = {"$merge": {"into": staging.name, "whenMatched": "replace"}}
+
+        def document_id(kind: str, key) -> dict:
+            return {"$concat": [
+                f"{kind}|{restaurant_id}|{location_id}|", "$_id.date", "|", {"$toString": key},
+            ]}
+
+        base = {
+            "restaurantId": {"$literal": restaurant_id},
+            "locationId": {"$literal": location_id},
+            "date": "$_id.date",
+            "rebuildId": {"$literal": rebuild_id},
+        }
+
+        days = [
+            match,
+            {"$group": {
+                "_id": {"date": local_date},
+                "grossSalesCents": {"$sum": "$totalCents"},
+                "orderCount": {"$sum": 1},
+            }},
+            {"$project": {
+                **base,
+                "_id": document_id(RollupKind.DAY, ""),
+                "kind": {"$literal": RollupKind.DAY},
+                "grossSalesCents": 1,
+                "orderCount": 1,
+            }},
+            merge,
+        ]
+        items = [
+            match,
+            {"$unwind": "$items"},
+            {"$group": {
+                "_id": {"date": local_date, "menuItemId": "$items.menuItemId"},
+                "itemName": {"$first": "$items.name"},
+                "soldCount": {"$sum": 1},
+                "grossSalesCents": {"$sum": "$items.price"},
+            }},
+            {"$project": {
+                **base,
+                "_id": document_id(RollupKind.ITEM, {"$ifNull": ["$_id.menuItemId", "None"]}),
+                "kind": {"$literal": RollupKind.ITEM},
+                "menuItemId": "$_id.menuItemId",
+                "itemName": 1,
+                "soldCount": 1,
+                "grossSalesCents": 1,
+            }},
+            merge,
+        ]
+        origins = [
+            match,
+            {"$group": {
+                "_id": {"date": local_date, "originId": "$origin.id"},
+                "name": {"$first": "$origin.name"},
+                "soldCount": {"$sum": {"$size": {"$ifNull": ["$items", []]}}},
+                "grossSalesCents": {"$sum": "$totalCents"},
+            }},
+            {"$project": {
+                **base,
+                "_id": document_id(RollupKind.ORIGIN, {"$ifNull": ["$_id.originId", "None"]}),
+                "kind": {"$literal": RollupKind.ORIGIN},
+                "originId": {"$toString": "$_id.originId"},
+                "name": 1,
+                "soldCount": 1,
+                "grossSalesCents": 1,
+            }},
+            merge,
+        ]
+
+        try:
+            for pipeline in (days, items, origins):
+                async for _ in self.orders_collection.aggregate(pipeline):
+                    pass
+
+            # Swap in: replace live documents, then drop the ones not rebuilt
+            batch = []
+            async for rollup in staging.find({}):
+                batch.append(ReplaceOne({"_id": rollup["_id"]}, rollup, upsert=True))
+                if len(batch) >= REBUILD_BATCH_SIZE:
+                    await self.collection.bulk_write(batch, ordered=False)
+                    batch = []
+            if batch:
+                await self.collection.bulk_write(batch, ordered=False)
+            await self.collection.delete_many({**location, "rebuildId": {"$ne": rebuild_id}})
+        finally:
+            await staging.drop()
+
+        logger.info(f"Rebuilt sales rollups for {restaurant_id}/{location_id} ({timezone})")
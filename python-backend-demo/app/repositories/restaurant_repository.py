@@ -1,10 +1,29 @@
 """Restaurant repository for database operations"""
 
+from functools import lru_cache
 from typing import Optional
+from zoneinfo import ZoneInfo
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from loguru import logger
 
+from app.core.cache import (
+    invalidate_location,
+    invalidate_restaurant,
+    location_cache,
+    restaurant_cache,
+)
+
+
+@lru_cache(maxsize=None)
+def resolve_timezone(timezone: Optional[str]) -> ZoneInfo:
+    """Resolve a location timezone, falling back to UTC when missing or invalid"""
+    try:
+        return ZoneInfo(timezone or "UTC")
+    except Exception:
+        logger.warning(f"Invalid timezone {timezone}, using UTC")
+        return ZoneInfo("UTC")
+
 
 class RestaurantRepository:
     """Repository for restaurant and location data access"""
@@ -67,7 +86,13 @@ class RestaurantRepository:
         Returns:
             Restaurant document, or None
         """
+        cached = restaurant_cache.get(restaurant_id)
+        if cached is not None:
+            return dict(cached)
+
         try:
+            version = restaurant_cache.version(restaurant_id)
+
             # Query by _id as that's the primary identifier
             restaurant = await self.restaurants_collection.find_one(
                 {"_id": restaurant_id}
@@ -75,11 +100,12 @@ class RestaurantRepository:
 
             if restaurant:
                 restaurant["_id"] = str(restaurant["_id"])
+                restaurant_cache.set(restaurant_id, restaurant, version)
                 logger.debug(f"Found restaurant: {restaurant_id}")
-            else:
-                logger.warning(f"Restaurant not found: {restaurant_id}")
+                return dict(restaurant)
 
-            return restaurant
+            logger.warning(f"Restaurant not found: {restaurant_id}")
+            return None
         except Exception as e:
             logger.error(f"Error finding restaurant {restaurant_id}: {e}")
             return None
@@ -89,6 +115,9 @@ class RestaurantRepository:
     ) -> Optional[dict]:
         """Find location by restaurant ID and location ID
 
+        Location documents are served from the metadata cache; call
+        `invalidate_location` after modifying one.
+
         Args:
             restaurant_id: The restaurant identifier
             location_id: The location identifier
@@ -96,7 +125,13 @@ class RestaurantRepository:
         Returns:
             Location document, or None
         """
+        cached = location_cache.get(location_id)
+        if cached is not None:
+            return dict(cached)
+
         try:
+            version = location_cache.version(location_id)
+
             # Try with string _id first
             location = await self.locations_collection.find_one({
                 "_id": location_id
@@ -113,15 +148,43 @@ class RestaurantRepository:
 
             if location:
                 location["_id"] = str(location["_id"])
+                location_cache.set(location_id, location, version)
                 logger.debug(f"Found location: {location_id}")
-            else:
-                logger.warning(f"Location not found: {location_id}")
+                return dict(location)
 
-            return location
+            logger.warning(f"Location not found: {location_id}")
+            return None
         except Exception as e:
             logger.error(f"Error finding location {location_id}: {e}")
             return None
 
+    async def find_restaurant_location(
+        self, restaurant_id: str, location_id: str
+    ) -> Optional[dict]:
+        """Find a location only if it belongs to the restaurant (cached)"""
+        location = await self.find_location_by_id(restaurant_id, location_id)
+        if location and location.get("restaurantId") != restaurant_id:
+            logger.warning(f"Location {location_id} does not belong to restaurant {restaurant_id}")
+            return None
+        return location
+
+    async def find_location_timezone(
+        self, restaurant_id: str, location_id: str
+    ) -> Optional[ZoneInfo]:
+        """Resolved timezone of a location, or None if the location does not exist"""
+        location = await self.find_restaurant_location(restaurant_id, location_id)
+        if not location:
+            return None
+        return resolve_timezone(location.get("timezone"))
+
+    def invalidate_location(self, location_id: str) -> None:
+        """Drop a cached location after it is modified"""
+        invalidate_location(location_id)
+
+    def invalidate_restaurant(self, restaurant_id: str) -> None:
+        """Drop a cached restaurant after it is modified"""
+        invalidate_restaurant(restaurant_id)
+
     async def find_locations_by_restaurant(self, restaurant_id: str) -> list[dict]:
         """Find all locations for a restaurant
 
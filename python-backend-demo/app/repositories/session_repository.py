@@ -0,0 +1,106 @@
+"""Session repository for the development auth endpoints"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config import settings
+from app.core.cache import session_cache
+from app.core.constants import Collections
+
+# Cached in place of sessions that do not exist, so repeated lookups of an
+# unknown or signed-out id do not reach MongoDB either
+_MISSING = object()
+
+
+class SessionRepository:
+    """Session store backed by the sessions collection and session_cache
+
+    Lookups are cached per worker process for at most one access token
+    lifetime and never past the session's own expiry. Signing out invalidates
+    the entry in this worker; other workers keep serving it until it expires,
+    so checks that must see a signout at once pass `cached=False`.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.collection = db[Collections.SESSIONS]
+
+    @staticmethod
+    def _expires_at(session: dict) -> Optional[datetime]:
+        created_at = session.get("createdAt")
+        if not isinstance(created_at, datetime):
+            # Sessions written before createdAt was a date never expire
+            return None
+        return created_at + timedelta(seconds=settings.SESSION_TTL_SECONDS)
+
+    async def create(self, session_id: str, user_id: str, phone_number: str) -> dict:
+        """Store a new session
+
+        Args:
+            session_id: Session handle carried by the access and refresh tokens
+            user_id: User the session belongs to
+            phone_number: Phone number the user signed in with
+
+        Returns:
+            Session document
+        """
+        session = {
+            "sessionId": session_id,
+            "userId": user_id,
+            "phoneNumber": phone_number,
+            # BSON date so the TTL index on sessions can expire it
+            "createdAt": datetime.utcnow(),
+        }
+        await self.collection.update_one({"sessionId": session_id}, {"$set": session}, upsert=True)
+        session_cache.invalidate(session_id)
+        return session
+
+    async def find(self, session_id: str, cached: bool = True) -> Optional[dict]:
+        """Find a live session
+
+        Args:
+            session_id: Session handle
+            cached: Serve from this worker's cache when possible. With False
+                the session is always read (and the cache refreshed).
+
+        Returns:
+            Session document, or None when unknown, signed out or expired
+        """
+        if cached:
+            entry = session_cache.get(session_id)
+            if entry is _MISSING:
+                return None
+            if entry is not None:
+                return dict(entry)
+
+        version = session_cache.version(session_id)
+        session = await self.collection.find_one({"sessionId": session_id}, {"_id": 0})
+
+        now = datetime.utcnow()
+        expires_at = self._expires_at(session) if session else None
+        # The TTL monitor only runs once a minute, so check expiry explicitly
+        if session is None or (expires_at is not None and expires_at <= now):
+            session_cache.set(
+                session_id, _MISSING, version, ttl=settings.SESSION_NEGATIVE_CACHE_TTL_SECONDS
+            )
+            return None
+
+        ttl = min(settings.SESSION_CACHE_TTL_SECONDS, settings.ACCESS_TOKEN_TTL_SECONDS)
+        if expires_at is not None:
+            ttl = min(ttl, (expires_at - now).total_seconds())
+        session_cache.set(session_id, session, version, ttl=ttl)
+        logger.debug(f"Found session: {session_id}")
+        return dict(session)
+
+    async def delete(self, session_id: str) -> bool:
+        """Delete a session and drop it from this worker's cache
+
+        Returns:
+            True if a session was deleted
+        """
+        result = await self.collection.delete_one({"sessionId": session_id})
+        # After the delete, so a lookup racing with it cannot re-cache the session
+        session_cache.invalidate(session_id)
+        return result.deleted_count > 0
@@ -0,0 +1,152 @@
+"""Production server launcher
+
+Usage:
+    python -m app.server
+
+Runs uvicorn with WEB_CONCURRENCY worker processes (0 for one per
+available CPU), uvloop and httptools when installed, and keep-alive,
+backlog and shutdown timeouts from settings. Each worker imports the app
+and connects to MongoDB in its own lifespan, so no client crosses a
+process boundary.
+
+Some state lives in each worker process only. Several workers therefore
+need SOCKETIO_MANAGER=redis, so emits reach every worker's clients, and
+previews stored in MongoDB (PREVIEW_STORE_IN_MEMORY off), so any worker
+can check them out; the launcher refuses to start otherwise. The in-process
+caches (menus, prices, locations, sessions) are only invalidated in the
+worker that handled a write, so other workers serve the old value for up
+to the cache's TTL. Lower MENU_CACHE_TTL_SECONDS and
+LOCATION_CACHE_TTL_SECONDS accordingly. /metrics reports the worker that
+answers the scrape.
+
+On SIGTERM or SIGINT each worker first disconnects its Socket.IO clients
+so they reconnect elsewhere. Then uvicorn stops accepting connections and
+lets in-flight requests finish for up to SERVER_GRACEFUL_SHUTDOWN_SECONDS.
+"""
+
+import asyncio
+import importlib.util
+import os
+from typing import Optional
+
+import uvicorn
+from loguru import logger
+from uvicorn.supervisors import Multiprocess
+
+from app.config import settings
+
+APP = "app.main:app"
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects taskset/cpuset limits)"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS/Windows
+        return os.cpu_count() or 1
+
+
+def worker_count() -> int:
+    """WEB_CONCURRENCY, or one worker per available CPU when it is 0"""
+    return settings.WEB_CONCURRENCY or available_cpus()
+
+
+def check_worker_settings(workers: int) -> None:
+    """Refuse settings that only work within a single worker process
+
+    Raises:
+        RuntimeError: With several workers and per-process Socket.IO rooms
+            or preview store
+    """
+    if workers <= 1:
+        return
+
+    problems = []
+    if settings.SOCKETIO_MANAGER.lower() != "redis":
+        problems.append(
+            f"SOCKETIO_MANAGER={settings.SOCKETIO_MANAGER} only reaches clients of the "
+            "emitting worker (use redis)"
+        )
+    if settings.PREVIEW_STORE_IN_MEMORY:
+        problems.append(
+            "PREVIEW_STORE_IN_MEMORY keeps previews in the worker that priced them, "
+            "so checkouts on other workers cannot find them"
+        )
+    if problems:
+        raise RuntimeError(f"Cannot run {workers} workers: {'; '.join(problems)}")
+
+    logger.warning(
+        f"Running {workers} workers: menus, prices and locations are cached per worker "
+        f"and may be served up to {settings.MENU_CACHE_TTL_SECONDS}s "
+        f"/ {settings.LOCATION_CACHE_TTL_SECONDS}s after a change"
+    )
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def server_config(workers: Optional[int] = None) -> uvicorn.Config:
+    """uvicorn configuration built from settings"""
+    return uvicorn.Config(
+        APP,
+        host=settings.SERVER_HOST,
+        port=settings.PORT,
+        workers=workers or worker_count(),
+        loop="uvloop" if _installed("uvloop") else "asyncio",
+        http="httptools" if _installed("httptools") else "h11",
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        limit_concurrency=settings.SERVER_LIMIT_CONCURRENCY,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.SERVER_FORWARDED_ALLOW_IPS,
+        log_level="debug" if settings.DEBUG else "info",
+        access_log=False,  # Handlers log their own request lines
+    )
+
+
+class DrainingServer(uvicorn.Server):
+    """uvicorn server that disconnects Socket.IO clients before shutting down
+
+    Long-polling Socket.IO requests would otherwise hold the graceful
+    shutdown open until they time out.
+    """
+
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def serve(self, sockets=None) -> None:
+        self._loop = asyncio.get_running_loop()
+        await super().serve(sockets=sockets)
+
+    def handle_exit(self, sig, frame) -> None:
+        if self._loop is not None and not self.should_exit:
+            from app.core.socketio import disconnect_all_clients
+
+            self._loop.call_soon_threadsafe(
+                lambda: self._loop.create_task(disconnect_all_clients())
+            )
+        super().handle_exit(sig, frame)
+
+
+def main() -> None:
+    """Run the API with settings-derived workers and tuning"""
+    config = server_config()
+    check_worker_settings(config.workers)
+    logger.info(
+        f"Starting {config.workers} worker(s) on {config.host}:{config.port} "
+        f"(loop={config.loop}, http={config.http})"
+    )
+
+    server = DrainingServer(config)
+    if config.workers == 1:
+        server.run()
+        return
+
+    # Same as uvicorn.run with workers, but every worker runs a DrainingServer
+    sock = config.bind_socket()
+    Multiprocess(config, target=server.run, sockets=[sock]).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""In-memory board of open orders per location
+
+Kitchen views only care about open orders (created, accepted, ready), a
+few dozen per location at most. The board holds each of them as a compact
+slotted record with the fields kitchens filter and sort on, plus the
+order's `OrderResponse` and restaurant app JSON encoded once per write, so
+listing a location's open orders needs neither a query nor serialization.
+
+The board is warmed from MongoDB at startup and then kept current by the
+order feed, which sees every write to the orders collection, and by the
+order service for writes made in this process. Records are built from the
+raw fields, so every open order has one even if it no longer encodes as an
+`OrderResponse` (`encoded` is then None and response lists skip it, as
+they do when reading from MongoDB).
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from app.core.streaming import dumps
+from app.core.transformers import transform_restaurant_order_compiled
+from app.models.schemas.order import OPEN_ORDER_STATUSES, OrderResponse, OrderStatus
+from app.repositories.order_repository import OrderRepository
+
+
+def encode_order_response(order: dict) -> bytes:
+    """JSON of an order as `OrderResponse`"""
+    return OrderResponse(**order).model_dump_json(by_alias=True).encode()
+
+
+class ItemSummary:
+    """One line of an open order, as a kitchen displays it"""
+
+    __slots__ = ("name", "quantity", "notes", "station_tags", "completed")
+
+    def __init__(self, item: dict):
+        self.name: str = item.get("name", "")
+        self.quantity: int = item.get("quantity", 1)
+        self.notes: Optional[str] = item.get("notes")
+        self.station_tags: Tuple[str, ...] = tuple(item.get("stationTags") or ())
+        self.completed: bool = item.get("completedAt") is not None
+
+
+class ActiveOrder:
+    """One open order"""
+
+    __slots__ = (
+        "id",
+        "order_id",
+        "status",
+        "created_at",
+        "updated_at",
+        "estimated_ready_at",
+        "ready_at",
+        "station_tags",
+        "items",
+        "encoded",
+        "view",
+    )
+
+    def __init__(self, order: dict):
+        self.id: str = str(order["_id"])
+        self.order_id: str = order["orderId"]
+        self.status: str = order.get("status")
+        self.updated_at: datetime = order.get("updatedAt") or order.get("createdAt") or datetime.min
+        self.created_at: datetime = order.get("createdAt") or self.updated_at
+        self.estimated_ready_at: Optional[datetime] = order.get("estimatedReadyAt")
+        self.ready_at: Optional[datetime] = order.get("readyAt")
+        self.items: Tuple[ItemSummary, ...] = tuple(
+            ItemSummary(item) for item in order.get("items") or ()
+        )
+        self.station_tags: Tuple[str, ...] = tuple(
+            dict.fromkeys(tag for item in self.items for tag in item.station_tags)
+        )
+        self.view: bytes = dumps(transform_restaurant_order_compiled(order))
+        self.encoded: Optional[bytes] = None
+        try:
+            self.encoded = encode_order_response(order)
+        except ValueError as e:
+            logger.warning(f"Open order {self.order_id} does not encode as OrderResponse: {e}")
+
+
+class ActiveOrderBoard:
+    """Open orders keyed by location, then orderId"""
+
+    def __init__(self):
+        self._locations: Dict[Tuple[str, str], Dict[str, ActiveOrder]] = {}
+        self._index: Dict[str, Tuple[str, str]] = {}  # orderId -> location
+        self._warming = False
+        self._pending: List[dict] = []
+        self.ready = False
+
+    async def warm(self, repository: OrderRepository) -> None:
+        """Load every open order; writes seen meanwhile are applied afterwards"""
+        self._warming = True
+        try:
+            orders = await repository.find_open_orders()
+            for order in orders:
+                try:
+                    self._apply(order)
+                except Exception as e:
+                    # One bad document must not leave the whole board disabled
+                    logger.error(f"Active order board failed to load {order.get('orderId')}: {e}")
+            self.ready = True
+        finally:
+            self._warming = False
+            pending, self._pending = self._pending, []
+
+        for order in pending:
+            self.apply(order)
+        logger.info(f"Active order board warmed with {len(self._index)} open orders")
+
+    def clear(self) -> None:
+        """Forget every order and stop serving"""
+        self._locations.clear()
+        self._index.clear()
+        self._pending = []
+        self.ready = False
+
+    def apply(self, order: dict) -> None:
+        """Record a written order: open orders are upserted, others removed"""
+        if self._warming:
+            self._pending.append(order)
+        elif self.ready:
+            try:
+                self._apply(order)
+            except Exception as e:
+                logger.error(f"Active order board failed to apply {order.get('orderId')}: {e}")
+
+    def _apply(self, order: dict) -> None:
+        order_id = order.get("orderId")
+        if not order_id:
+            return
+
+        location = (order.get("restaurantId"), order.get("locationId"))
+        orders = self._locations.get(location)
+        current = orders.get(order_id) if orders else None
+        updated_at = order.get("updatedAt") or order.get("createdAt")
+        if current is not None and updated_at is not None and current.updated_at > updated_at:
+            return  # Older than what the board holds
+
+        if order.get("status") not in OPEN_ORDER_STATUSES:
+            if current is not None:
+                del orders[order_id]
+                self._index.pop(order_id, None)
+                if not orders:
+                    del self._locations[location]
+            return
+
+        self._locations.setdefault(location, {})[order_id] = ActiveOrder(order)
+        self._index[order_id] = location
+
+    def orders(
+        self, restaurant_id: str, location_id: str, status: Optional[OrderStatus] = None
+    ) -> List[ActiveOrder]:
+        """A location's open orders, newest first, optionally of one status"""
+        orders = self._locations.get((restaurant_id, location_id))
+        if not orders:
+            return []
+
+        records = [
+            record for record in orders.values() if status is None or record.status == status
+        ]
+        records.sort(key=lambda record: (record.created_at, record.id), reverse=True)
+        return records
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+active_order_board = ActiveOrderBoard()
@@ -2,17 +2,46 @@
 
 from typing import Optional, List
 from loguru import logger
+from pydantic import TypeAdapter
 
 from app.repositories.menu_repository import MenuRepository
+from app.core.cache import (
+    TTLCache,
+    menu_cache,
+    menu_cache_key,
+    menu_list_cache_key,
+    menu_payload_cache,
+)
 from app.core.exceptions import NotFoundException
-from app.core.transformers import transform_menu, transform_menu_summary
+from app.core.http_cache import EncodedPayload, encode_payload
+from app.core.transformers import transform_menu_compiled, transform_menu_summary
+from app.models.schemas.menu import MenuResponse, MenuSummaryResponse
+from app.models.schemas.response import ApiResponse
+
+# Built once; validating and encoding through one adapter skips the
+# per-call generic model lookup and the intermediate MenuResponse instance
+menu_response_adapter = TypeAdapter(ApiResponse[MenuResponse])
+
+
+def encode_menu_response(menu: dict) -> bytes:
+    """Validate a transformed menu and encode it as `ApiResponse[MenuResponse]` JSON"""
+    return menu_response_adapter.dump_json(
+        menu_response_adapter.validate_python({"data": menu}), by_alias=True
+    )
 
 
 class MenuService:
     """Service for menu business logic"""
 
-    def __init__(self, repository: MenuRepository):
+    def __init__(
+        self,
+        repository: MenuRepository,
+        cache: TTLCache = menu_cache,
+        payload_cache: TTLCache = menu_payload_cache,
+    ):
         self.repository = repository
+        self.cache = cache
+        self.payload_cache = payload_cache
 
     async def get_menu(
         self, restaurant_id: str, location_id: str, menu_id: str
@@ -22,6 +51,14 @@ class MenuService:
             f"Fetching menu: restaurant={restaurant_id}, location={location_id}, menu={menu_id}"
         )
 
+        key = menu_cache_key(restaurant_id, location_id, menu_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.debug(f"Menu cache hit: {menu_id}")
+            return cached
+
+        # Take the version before reading so a concurrent write wins
+        version = self.cache.version(key)
         menu = await self.repository.find_by_id(restaurant_id, location_id, menu_id)
 
         if not menu:
@@ -29,9 +66,11 @@ class MenuService:
             raise NotFoundException("Menu", menu_id)
 
         # Transform menu data to expected format
-        transformed_menu = transform_menu(menu)
+        transformed_menu = transform_menu_compiled(menu)
         logger.debug("Menu data transformed to expected format")
 
+        self.cache.set(key, transformed_menu, version=version)
+
         return transformed_menu
 
     async def get_menus_by_location(
@@ -49,3 +88,50 @@ class MenuService:
         logger.debug(f"Transformed {len(transformed_menus)} menu summaries")
 
         return transformed_menus
+
+    async def get_menu_payload(
+        self, restaurant_id: str, location_id: str, menu_id: str
+    ) -> EncodedPayload:
+        """Get the encoded `ApiResponse[MenuResponse]` body for a menu
+
+        The body is validated and encoded once per cache fill, so repeat
+        requests cost neither a database read nor serialization.
+        """
+        key = menu_cache_key(restaurant_id, location_id, menu_id)
+        payload = self.payload_cache.get(key)
+        if payload is not None:
+            return payload
+
+        version = self.payload_cache.version(key)
+        menu = await self.get_menu(restaurant_id, location_id, menu_id)
+        payload = encode_payload(encode_menu_response(menu))
+
+        self.payload_cache.set(key, payload, version=version)
+        return payload
+
+    async def get_menus_payload(self, restaurant_id: str, location_id: str) -> EncodedPayload:
+        """Get the encoded `ApiResponse[List[MenuSummaryResponse]]` body for a location"""
+        key = menu_list_cache_key(restaurant_id, location_id)
+        payload = self.payload_cache.get(key)
+        if payload is not None:
+            return payload
+
+        version = self.payload_cache.version(key)
+        menus = await self.get_menus_by_location(restaurant_id, location_id)
+        menu_summaries = [
+            MenuSummaryResponse(
+                id=menu["_id"],
+                menuSlug=menu["menuSlug"],
+                name=menu["name"],
+                description=menu.get("description"),
+                available=menu.get("available", True),
+            )
+            for menu in menus
+        ]
+        body = ApiResponse[List[MenuSummaryResponse]](data=menu_summaries).model_dump_json(
+            by_alias=True
+        )
+        payload = encode_payload(body.encode())
+
+        self.payload_cache.set(key, payload, version=version)
+        return payload
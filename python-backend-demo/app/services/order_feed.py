@@ -0,0 +1,354 @@
+"""Change feed of today's orders per location
+
+Store dashboards used to poll `/restaurant/orders/today`, which re-queried
+and re-transformed every order of the day on each poll. The feed keeps each
+location's orders for today in memory, already in the restaurant app
+format, and applies every write to the orders collection as it happens:
+
+- With a replica set, writes come from a MongoDB change stream.
+- On a standalone mongod (tests, local development) the feed polls for
+  orders by `updatedAt` instead.
+
+Each applied change is pushed to the location's Socket.IO room
+(`{restaurantId}_{locationId}`), and clients that missed some can catch up
+with the cursor of the last change they saw.
+
+A location is tracked from the first time its orders are requested. Every
+worker runs its own feed, so cursors carry the board's epoch and a cursor
+from another worker or an older board asks the client to reset.
+
+Listeners (the active order board) receive every written order, whether
+or not its location is tracked.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+import uuid
+
+from loguru import logger
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.config import settings
+from app.core.socketio import emit_location_order_changed
+from app.core.streaming import dumps
+from app.core.transformers import transform_restaurant_order_compiled
+from app.repositories.order_repository import ORDER_KITCHEN_VIEW, OrderRepository
+
+# Server error code when change streams are not available (standalone mongod)
+CHANGE_STREAMS_UNSUPPORTED = 40573
+
+# Seconds to wait before reopening a failed change stream
+RESTART_DELAY_SECONDS = 1.0
+
+EmitFunction = Callable[[str, str, dict], Awaitable[None]]
+Listener = Callable[[dict], None]
+
+
+def local_day(moment: datetime, tz: ZoneInfo) -> str:
+    """Date in the location's timezone of a naive UTC datetime"""
+    return moment.replace(tzinfo=ZoneInfo("UTC")).astimezone(tz).strftime("%Y-%m-%d")
+
+
+class LocationBoard:
+    """Today's orders of one location and a log of recent changes"""
+
+    def __init__(self, restaurant_id: str, location_id: str, tz: ZoneInfo, max_changes: int):
+        self.restaurant_id = restaurant_id
+        self.location_id = location_id
+        self.tz = tz
+        self.day = local_day(datetime.utcnow(), tz)
+        self.epoch = uuid.uuid4().hex[:8]
+        self.seq = 0
+        # orderId -> (updatedAt, restaurant app view)
+        self.orders: Dict[str, Tuple[datetime, dict]] = {}
+        self.changes: Deque[Tuple[int, str]] = deque(maxlen=max_changes)
+        self.loaded = asyncio.Event()
+        # Changes that arrived while the initial load was running
+        self.pending: List[dict] = []
+
+    @property
+    def cursor(self) -> str:
+        return f"{self.epoch}.{self.seq}"
+
+    @property
+    def expired(self) -> bool:
+        """True once the location's day has rolled over"""
+        return local_day(datetime.utcnow(), self.tz) != self.day
+
+    def is_today(self, order: dict) -> bool:
+        created_at = order.get("createdAt")
+        return isinstance(created_at, datetime) and local_day(created_at, self.tz) == self.day
+
+    def load(self, orders: List[dict]) -> None:
+        """Fill the board with the orders read at startup, then replay buffered changes"""
+        for order in orders:
+            self._store(order)
+        self.loaded.set()
+
+        pending, self.pending = self.pending, []
+        for order in pending:
+            self.apply(order)
+
+    def apply(self, order: dict) -> Optional[dict]:
+        """Record a written order
+
+        Returns:
+            The order's view if it changed the board, None for orders from
+            another day and writes older than the stored version
+        """
+        if not self.loaded.is_set():
+            self.pending.append(order)
+            return None
+        if not self.is_today(order):
+            return None
+
+        view = self._store(order)
+        if view is not None:
+            self.seq += 1
+            self.changes.append((self.seq, order["orderId"]))
+        return view
+
+    def _store(self, order: dict) -> Optional[dict]:
+        order_id = order.get("orderId")
+        if not order_id:
+            return None
+
+        updated_at = order.get("updatedAt") or order.get("createdAt") or datetime.min
+        stored = self.orders.get(order_id)
+        if stored is not None and stored[0] > updated_at:
+            return None
+
+        view = transform_restaurant_order_compiled(order)
+        self.orders[order_id] = (updated_at, view)
+        return view
+
+    def snapshot(self) -> List[dict]:
+        """Today's orders, newest first"""
+        views = [view for _, view in self.orders.values()]
+        views.sort(key=lambda view: view["startedAt"], reverse=True)
+        return views
+
+    def changes_since(self, cursor: Optional[str]) -> Optional[List[dict]]:
+        """Orders changed after `cursor`, or None when the client must reset
+
+        A reset is needed for a missing or malformed cursor, a cursor from
+        another board, and one older than the retained change log.
+        """
+        if not cursor:
+            return None
+        epoch, _, seq = cursor.partition(".")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+
+        since = int(seq)
+        if since > self.seq:
+            return None
+        # The log must still hold every change after `since`
+        if since < self.seq and self.changes[0][0] > since + 1:
+            return None
+
+        changed = dict.fromkeys(order_id for seq, order_id in self.changes if seq > since)
+        return [self.orders[order_id][1] for order_id in changed]
+
+
+class OrderFeed:
+    """Keeps location boards current from the orders collection"""
+
+    def __init__(
+        self,
+        max_locations: int,
+        max_changes: int,
+        poll_interval: float,
+        emit: Optional[EmitFunction] = None,
+    ):
+        self.max_locations = max_locations
+        self.max_changes = max_changes
+        self.poll_interval = poll_interval
+        self._emit = emit
+        self._boards: "OrderedDict[Tuple[str, str], LocationBoard]" = OrderedDict()
+        self._listeners: List[Listener] = []
+        self._repository: Optional[OrderRepository] = None
+        self._task: Optional[asyncio.Task] = None
+        self.mode: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def add_listener(self, listener: Listener) -> None:
+        """Call `listener` with every written order"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def start(self, repository: OrderRepository) -> None:
+        """Start following the orders collection on the running event loop"""
+        if self.running:
+            return
+        self._repository = repository
+        self._task = asyncio.create_task(self._follow())
+
+    async def stop(self) -> None:
+        """Stop following and forget every board"""
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._boards.clear()
+        logger.info("Order feed stopped")
+
+    async def board(self, restaurant_id: str, location_id: str) -> Optional[LocationBoard]:
+        """The location's board, loaded on first use and after the day rolls over
+
+        Returns:
+            None when the location does not exist
+        """
+        key = (restaurant_id, location_id)
+        board = self._boards.get(key)
+
+        if board is None or board.expired:
+            tz = await self._repository.restaurant_repo.find_location_timezone(
+                restaurant_id, location_id
+            )
+            if tz is None:
+                return None
+
+            board = LocationBoard(restaurant_id, location_id, tz, self.max_changes)
+            # Registered before loading so writes made during the load are kept
+            self._boards[key] = board
+            while len(self._boards) > self.max_locations:
+                self._boards.popitem(last=False)
+
+            try:
+                orders = await self._repository.load_today_orders(
+                    restaurant_id, location_id, projection=ORDER_KITCHEN_VIEW
+                )
+            except Exception:
+                self._boards.pop(key, None)
+                board.loaded.set()
+                raise
+            board.load(orders)
+            logger.debug(f"Order feed tracking {restaurant_id}/{location_id}: {len(orders)} orders")
+
+        await board.loaded.wait()
+        if self._boards.get(key) is not board:
+            # The load failed or the board was evicted meanwhile
+            return await self.board(restaurant_id, location_id)
+
+        self._boards.move_to_end(key)
+        return board
+
+    async def apply(self, order: dict) -> None:
+        """Apply one written order to its location's board and notify the room"""
+        for listener in self._listeners:
+            listener(order)
+
+        board = self._boards.get((order.get("restaurantId"), order.get("locationId")))
+        if board is None or board.expired:
+            return
+
+        try:
+            view = board.apply(order)
+            if view is not None and self._emit is not None:
+                # Socket.IO encodes packets with the stdlib json module, so
+                # datetimes must be ISO strings (as in the HTTP responses)
+                await self._emit(
+                    board.restaurant_id,
+                    board.location_id,
+                    {
+                        "orderId": order["orderId"],
+                        "cursor": board.cursor,
+                        "order": json.loads(dumps(view)),
+                    },
+                )
+        except Exception as e:
+            # One bad document must not stop the feed
+            logger.error(f"Order feed failed to apply order {order.get('orderId')}: {e}")
+
+    async def _follow(self) -> None:
+        try:
+            await self._watch()
+        except (OperationFailure, NotImplementedError) as e:
+            # NotImplementedError comes from in-memory MongoDB fakes
+            if isinstance(e, OperationFailure) and e.code != CHANGE_STREAMS_UNSUPPORTED:
+                raise
+            logger.info("Change streams unavailable, order feed falls back to polling")
+            await self._poll()
+
+    async def _watch(self) -> None:
+        """Follow the orders change stream, resuming after errors"""
+        self.mode = "change_stream"
+        logger.info("Order feed following the orders change stream")
+        resume_token = None
+
+        while True:
+            try:
+                async with self._repository.watch_changes(resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        order = change.get("fullDocument")
+                        if order:
+                            order["_id"] = str(order["_id"])
+                            await self.apply(order)
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAMS_UNSUPPORTED:
+                    raise
+                logger.error(f"Order change stream failed: {e}")
+            except PyMongoError as e:
+                logger.error(f"Order change stream failed: {e}")
+            await asyncio.sleep(RESTART_DELAY_SECONDS)
+
+    async def _poll(self) -> None:
+        """Poll for orders written since the last poll
+
+        Each poll reaches back one poll interval before the newest
+        updatedAt seen. A write stamped earlier but committed after the
+        previous poll (another worker, clock skew) is still picked up.
+        Orders already applied at the same updatedAt are skipped.
+        """
+        self.mode = "poll"
+        overlap = timedelta(seconds=self.poll_interval)
+        since = datetime.utcnow()
+        # updatedAt of orders applied within the overlap window
+        applied: Dict[str, datetime] = {}
+
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._boards and not self._listeners:
+                # Boards read every order when they load, so idle polls can skip ahead
+                since, applied = datetime.utcnow(), {}
+                continue
+            try:
+                orders = await self._repository.find_updated_since(since - overlap)
+            except PyMongoError as e:
+                logger.error(f"Order feed poll failed: {e}")
+                continue
+
+            for order in orders:
+                order_id, updated_at = order["orderId"], order["updatedAt"]
+                if order_id in applied and applied[order_id] >= updated_at:
+                    continue
+                applied[order_id] = updated_at
+                since = max(since, updated_at)
+                await self.apply(order)
+
+            applied = {
+                order_id: updated_at
+                for order_id, updated_at in applied.items()
+                if updated_at >= since - overlap
+            }
+
+
+order_feed = OrderFeed(
+    max_locations=settings.ORDER_FEED_MAX_LOCATIONS,
+    max_changes=settings.ORDER_FEED_MAX_CHANGES,
+    poll_interval=settings.ORDER_FEED_POLL_INTERVAL_SECONDS,
+    emit=emit_location_order_changed,
+)
@@ -1,13 +1,27 @@
 """Order business logic service"""
 
-from typing import Optional, List
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, List, Tuple
 from loguru import logger
 from datetime import datetime
+import asyncio
 import uuid
 
-from app.repositories.order_repository import OrderRepository
+from app.repositories.order_repository import (
+    ORDER_RECEIPT_VIEW,
+    ORDER_STATUS_VIEW,
+    OrderRepository,
+)
 from app.repositories.menu_repository import MenuRepository
-from app.core.exceptions import AppException
+from app.repositories.report_repository import ReportRepository
+from app.services.active_orders import ActiveOrder, active_order_board, encode_order_response
+from app.services.pricing import PricingEngine
+from app.core.exceptions import AppException, ConflictException, NotFoundException
+from app.core.streaming import (
+    decode_cursor,
+    encode_cursor,
+    stream_json_array,
+    stream_ndjson,
+)
 from app.models.schemas.order import (
     CreateOrderRequest,
     PreviewOrderRequest,
@@ -17,17 +31,62 @@ from app.models.schemas.order import (
     OrderConfirmationResponse,
     UpdateOrderStatusRequest,
     OrderStatus,
-    OrderItemResponse
+    OrderItemResponse,
+    OPEN_ORDER_STATUSES
 )
 from app.core.socketio import emit_order_accepted, emit_order_ready_for_pickup, emit_order_completed
 
+# Checkouts running in this process, keyed by previewOrderId
+_inflight_checkouts: Dict[str, asyncio.Task] = {}
+
+# Charges a preview: charge(previewOrderId, preview) -> payment result with a
+# transactionId. The previewOrderId is the processor's idempotency key.
+ChargeFunction = Callable[[str, dict], Awaitable[dict]]
+
+
+def _encoded(record: ActiveOrder) -> bytes:
+    if record.encoded is None:
+        raise ValueError(f"Order {record.order_id} does not encode as OrderResponse")
+    return record.encoded
+
+
+def order_from_preview(
+    preview: dict,
+    payment_id: Optional[str],
+    transaction_details: Any
+) -> dict:
+    """Order document fields for a checked-out preview"""
+    return {
+        "restaurantId": preview["restaurantId"],
+        "locationId": preview["locationId"],
+        "locationSlug": preview.get("locationSlug", ""),
+        "origin": preview.get("origin", {}),
+        "customer": preview.get("customer", {}),
+        "items": preview["items"],
+        "subtotalCents": preview["subtotalCents"],
+        "taxCents": preview["taxCents"],
+        "totalCents": preview["totalPriceCents"],
+        "paymentId": payment_id,
+        "transactionDetails": transaction_details,
+        "discount": preview.get("discount"),
+        "menuId": preview.get("menuId"),
+    }
+
 
 class OrderService:
     """Service for order business logic"""
 
-    def __init__(self, order_repo: OrderRepository, menu_repo: MenuRepository):
+    def __init__(
+        self,
+        order_repo: OrderRepository,
+        menu_repo: MenuRepository,
+        report_repo: Optional[ReportRepository] = None,
+        pricing: Optional[PricingEngine] = None
+    ):
         self.order_repo = order_repo
         self.menu_repo = menu_repo
+        self.report_repo = report_repo
+        self.pricing = pricing or PricingEngine(menu_repo)
 
     async def create_preview_order(
         self,
@@ -35,52 +94,13 @@ class OrderService:
     ) -> PreviewOrderResponse:
         """Create a preview order for price calculation"""
         try:
-            # Get sales tax rate (default to 8% if menu not specified)
-            sales_tax = 0.08
-
-            if request.menuId:
-                # Get menu to calculate sales tax
-                menu = await self.menu_repo.find_by_id(
-                    request.restaurantId,
-                    request.locationId,
-                    request.menuId
-                )
-
-                if menu:
-                    sales_tax = menu.get("salesTax", 0.08)
-
-            # Calculate totals
-            subtotal_cents = 0
-            for item in request.items:
-                item_subtotal = item.price * item.quantity
-
-                # Add variant pricing
-                for variant in item.variants:
-                    item_subtotal += variant.priceCents * item.quantity
-
-                # Add modifier prices with free choices logic
-                for modifier in item.modifiers:
-                    selected_count = len(modifier.options)
-                    free_choices = getattr(modifier, 'freeChoices', 0)
-                    extra_choice_price = getattr(modifier, 'extraChoicePriceCents', 0)
-
-                    if selected_count > free_choices:
-                        # Only charge for choices beyond free limit
-                        extra_count = selected_count - free_choices
-                        item_subtotal += (extra_count * extra_choice_price) * item.quantity
-                    # If selected_count <= free_choices, no extra charge
-
-                subtotal_cents += item_subtotal
-
-            # Calculate tax
-            tax_cents = int(subtotal_cents * sales_tax)
-
-            # Apply discount if provided
-            discount_cents = 0
-            if request.discount:
-                discount_cents = request.discount.get("amountCents", 0)
-
-            total_cents = subtotal_cents + tax_cents - discount_cents
+            cart = await self.pricing.price(
+                request.restaurantId,
+                request.locationId,
+                request.menuId,
+                request.items,
+                request.discount
+            )
 
             # Generate preview order ID
             preview_id = f"PREV-{uuid.uuid4().hex[:8].upper()}"
@@ -92,10 +112,10 @@ class OrderService:
                 "locationId": request.locationId,
                 "locationSlug": request.locationSlug,
                 "items": [item.model_dump() for item in request.items],
-                "subtotalCents": subtotal_cents,
-                "taxCents": tax_cents,
-                "discountCents": discount_cents,
-                "totalPriceCents": total_cents,
+                "subtotalCents": cart.subtotal_cents,
+                "taxCents": cart.tax_cents,
+                "discountCents": cart.discount_cents,
+                "totalPriceCents": cart.total_cents,
                 "customer": request.customer.model_dump() if request.customer else None,
                 "origin": request.origin.model_dump() if request.origin else None,
                 "getSms": request.getSms,
@@ -109,9 +129,9 @@ class OrderService:
 
             return PreviewOrderResponse(
                 previewOrderId=preview_id,
-                subtotalCents=subtotal_cents,
-                taxCents=tax_cents,
-                totalPriceCents=total_cents,
+                subtotalCents=cart.subtotal_cents,
+                taxCents=cart.tax_cents,
+                totalPriceCents=cart.total_cents,
                 items=request.items
             )
 
@@ -131,31 +151,16 @@ class OrderService:
     ) -> OrderConfirmationResponse:
         """Create a new order"""
         try:
-            # Calculate order totals
-            subtotal_cents = 0
-            order_items = []
-
-            for item in request.items:
-                item_subtotal = item.price * item.quantity
-
-                # Add variant pricing
-                for variant in item.variants:
-                    item_subtotal += variant.priceCents * item.quantity
-
-                # Add modifier prices with free choices logic
-                for modifier in item.modifiers:
-                    selected_count = len(modifier.options)
-                    free_choices = getattr(modifier, 'freeChoices', 0)
-                    extra_choice_price = getattr(modifier, 'extraChoicePriceCents', 0)
-
-                    if selected_count > free_choices:
-                        # Only charge for choices beyond free limit
-                        extra_count = selected_count - free_choices
-                        item_subtotal += (extra_count * extra_choice_price) * item.quantity
-
-                subtotal_cents += item_subtotal
+            cart = await self.pricing.price(
+                request.restaurantId,
+                request.locationId,
+                request.menuId,
+                request.items,
+                request.discount
+            )
 
-                order_items.append({
+            order_items = [
+                {
                     "id": item.id,
                     "menuItemId": item.menuItemId,
                     "name": item.name,
@@ -168,16 +173,9 @@ class OrderService:
                     "stationTags": item.stationTags,
                     "startedAt": None,
                     "completedAt": None
-                })
-
-            # Calculate tax (default 8% if not found)
-            tax_cents = int(subtotal_cents * 0.08)
-            total_cents = subtotal_cents + tax_cents
-
-            # Apply discount if provided
-            if request.discount:
-                discount_amount = request.discount.get("amountCents", 0)
-                total_cents -= discount_amount
+                }
+                for item, item_subtotal in zip(request.items, cart.item_subtotals)
+            ]
 
             # Create order document
             order_data = {
@@ -187,16 +185,18 @@ class OrderService:
                 "origin": request.origin.model_dump(),
                 "customer": request.customer.model_dump(),
                 "items": order_items,
-                "subtotalCents": subtotal_cents,
-                "taxCents": tax_cents,
-                "totalCents": total_cents,
+                "subtotalCents": cart.subtotal_cents,
+                "taxCents": cart.tax_cents,
+                "totalCents": cart.total_cents,
                 "paymentId": request.paymentId,
                 "transactionDetails": request.transactionDetails,
                 "discount": request.discount,
+                "menuId": request.menuId,
             }
 
             # Save order to database
             order = await self.order_repo.create_order(order_data)
+            active_order_board.apply(order)
 
             logger.info(f"Order created: {order['orderId']}")
 
@@ -207,6 +207,8 @@ class OrderService:
                 status=OrderStatus.ORDER_CREATED
             )
 
+        except AppException:
+            raise
         except Exception as e:
             logger.error(f"Error creating order: {e}")
             raise AppException(
@@ -215,9 +217,88 @@ class OrderService:
                 detail=str(e)
             )
 
+    async def checkout_preview(
+        self,
+        preview_order_id: str,
+        payment_id: Optional[str] = None,
+        transaction_details: Any = None,
+        charge: Optional[ChargeFunction] = None
+    ) -> dict:
+        """Turn a preview into an order, once per previewOrderId
+
+        Repeated submissions of the same preview (a double tap on "Pay")
+        share the running checkout in this process, and the unique
+        previewOrderId index returns the existing order across processes.
+        Before charging, the preview is claimed in MongoDB, so a submission
+        that lands on another worker mid-payment gets a 409 instead of
+        taking a second payment.
+
+        Args:
+            preview_order_id: Preview to check out
+            payment_id: Payment reference stored on the order
+            transaction_details: Payment details stored on the order
+            charge: Takes the payment once the preview is known to exist
+                and has no order yet. Its result replaces `payment_id`
+                (its transactionId) and `transaction_details`. Unknown
+                previews and repeated submissions are never charged.
+        """
+        task = _inflight_checkouts.get(preview_order_id)
+        if task is None:
+            task = asyncio.create_task(
+                self._checkout_preview(preview_order_id, payment_id, transaction_details, charge)
+            )
+            _inflight_checkouts[preview_order_id] = task
+            task.add_done_callback(lambda _: _inflight_checkouts.pop(preview_order_id, None))
+
+        # Shielded so one client disconnecting doesn't cancel the others' checkout
+        return await asyncio.shield(task)
+
+    async def _checkout_preview(
+        self,
+        preview_order_id: str,
+        payment_id: Optional[str],
+        transaction_details: Any,
+        charge: Optional[ChargeFunction] = None
+    ) -> dict:
+        preview = await self.order_repo.find_preview_by_id(preview_order_id)
+
+        if not preview or charge:
+            # Already checked out (the preview may not be deleted yet)
+            order = await self.order_repo.find_by_preview_id(preview_order_id)
+            if order:
+                return order
+            if not preview:
+                raise NotFoundException("Preview order", preview_order_id)
+
+        if charge:
+            if not await self.order_repo.claim_preview_checkout(preview_order_id):
+                # Another worker is taking this payment, or has just finished
+                order = await self.order_repo.find_by_preview_id(preview_order_id)
+                if order:
+                    return order
+                raise ConflictException(
+                    "Checkout already in progress",
+                    f"Preview order '{preview_order_id}' is being paid for",
+                )
+            try:
+                transaction_details = await charge(preview_order_id, preview)
+            except Exception:
+                await self.order_repo.release_preview_checkout(preview_order_id)
+                raise
+            payment_id = transaction_details["transactionId"]
+
+        order, _ = await self.order_repo.create_order_for_preview(
+            preview_order_id,
+            order_from_preview(preview, payment_id, transaction_details)
+        )
+        self.order_repo.discard_preview_order(preview_order_id)
+        active_order_board.apply(order)
+
+        return order
+
     async def get_order(self, order_id: str) -> OrderResponse:
         """Get order by ID"""
-        order = await self.order_repo.find_by_id(order_id)
+        order = await self.order_repo.find_by_id(order_id, projection=ORDER_RECEIPT_VIEW)
 
         if not order:
             raise AppException(
@@ -231,7 +312,7 @@ class OrderService:
 
     async def get_order_status(self, order_id: str) -> OrderStatusResponse:
         """Get order status"""
-        order = await self.order_repo.find_by_id(order_id)
+        order = await self.order_repo.find_by_id(order_id, projection=ORDER_STATUS_VIEW)
 
         if not order:
             raise AppException(
@@ -251,19 +332,12 @@ class OrderService:
         self,
         request: UpdateOrderStatusRequest
     ) -> OrderStatusResponse:
-        """Update order status"""
-        try:
-            # Get current order
-            order = await self.order_repo.find_by_id(request.orderId)
-
-            if not order:
-                raise AppException(
-                    status_code=404,
-                    message="Order not found",
-                    detail=f"Order with ID '{request.orderId}' does not exist"
-                )
+        """Update order status
 
-            # Update status in database
+        One conditional update applies the transition and returns the
+        updated order; the order is only read again to explain a refusal.
+        """
+        try:
             updated_order = await self.order_repo.update_status(
                 request.orderId,
                 request.status,
@@ -271,15 +345,29 @@ class OrderService:
             )
 
             if not updated_order:
-                raise AppException(
-                    status_code=500,
-                    message="Failed to update order status"
+                order = await self.order_repo.find_by_id(
+                    request.orderId, projection=ORDER_STATUS_VIEW
                 )
+                if not order:
+                    raise NotFoundException("Order", request.orderId)
+                raise ConflictException(
+                    message="Order status cannot be changed",
+                    detail=(
+                        f"Order '{request.orderId}' is {order['status']} "
+                        f"and cannot move to {request.status.value}"
+                    )
+                )
+
+            active_order_board.apply(updated_order)
+
+            # Only orders that are ready can be delivered, so this runs once per order
+            if request.status == OrderStatus.ORDER_DELIVERED:
+                await self._record_sales(updated_order)
 
             # Emit Socket.IO events based on status change
             await self._emit_status_events(
                 request.orderId,
-                order["restaurantId"],
+                updated_order["restaurantId"],
                 request.status
             )
 
@@ -302,6 +390,17 @@ class OrderService:
                 detail=str(e)
             )
 
+    async def _record_sales(self, order: dict):
+        """Add a delivered order to the sales rollups"""
+        if not self.report_repo:
+            return
+
+        try:
+            await self.report_repo.record_delivered_order(order)
+        except Exception as e:
+            # The rollups can be rebuilt; don't fail the status update
+            logger.error(f"Error recording sales for order {order.get('orderId')}: {e}")
+
     async def _emit_status_events(
         self,
         order_id: str,
@@ -331,7 +430,17 @@ class OrderService:
         location_id: str,
         status: Optional[OrderStatus] = None
     ) -> List[OrderResponse]:
-        """Get orders for a restaurant location"""
+        """Get orders for a restaurant location
+
+        Open statuses are read from the active order board once it is warm.
+        """
+        if status in OPEN_ORDER_STATUSES and active_order_board.ready:
+            return [
+                OrderResponse.model_validate_json(record.encoded)
+                for record in active_order_board.orders(restaurant_id, location_id, status)
+                if record.encoded is not None
+            ]
+
         orders = await self.order_repo.find_by_restaurant_and_location(
             restaurant_id,
             location_id,
@@ -340,6 +449,74 @@ class OrderService:
 
         return [OrderResponse(**order) for order in orders]
 
+    async def get_restaurant_orders_page(
+        self,
+        restaurant_id: str,
+        location_id: str,
+        status: Optional[OrderStatus],
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[OrderResponse], Optional[str]]:
+        """Get one page of orders, newest first, with the cursor for the next page"""
+        after = decode_cursor(cursor) if cursor else None
+        orders = await self.order_repo.find_by_restaurant_and_location(
+            restaurant_id,
+            location_id,
+            status,
+            limit=limit,
+            after=after
+        )
+
+        next_cursor = None
+        if len(orders) == limit:
+            last = orders[-1]
+            next_cursor = encode_cursor(last["createdAt"], last["_id"])
+
+        return [OrderResponse(**order) for order in orders], next_cursor
+
+    def stream_restaurant_orders(
+        self,
+        restaurant_id: str,
+        location_id: str,
+        status: Optional[OrderStatus] = None,
+        ndjson: bool = False
+    ) -> AsyncIterator[bytes]:
+        """Stream all orders for a location without materializing them
+
+        The JSON mode produces the same `ApiResponse` envelope as the
+        buffered response; NDJSON mode emits one order per line. Open
+        statuses are served from the active order board once it is warm,
+        already encoded.
+        """
+        if status in OPEN_ORDER_STATUSES and active_order_board.ready:
+            batches = self._active_order_batches(restaurant_id, location_id, status)
+            encode = _encoded
+        else:
+            batches = self.order_repo.iter_by_restaurant_and_location(
+                restaurant_id,
+                location_id,
+                status
+            )
+            encode = encode_order_response
+
+        if ndjson:
+            return stream_ndjson(batches, encode)
+
+        return stream_json_array(
+            batches,
+            encode,
+            prefix=b'{"data":',
+            suffix=b',"message":null,"success":true}'
+        )
+
+    @staticmethod
+    async def _active_order_batches(
+        restaurant_id: str,
+        location_id: str,
+        status: OrderStatus
+    ) -> AsyncIterator[List[ActiveOrder]]:
+        yield active_order_board.orders(restaurant_id, location_id, status)
+
     async def get_today_orders(
         self,
         restaurant_id: str,
@@ -348,7 +525,8 @@ class OrderService:
         """Get today's orders for a restaurant location"""
         orders = await self.order_repo.find_today_orders(
             restaurant_id,
-            location_id
+            location_id,
+            projection=ORDER_RECEIPT_VIEW
         )
 
         return [OrderResponse(**order) for order in orders]
@@ -0,0 +1,243 @@
+"""Server-side cart pricing
+
+Preview and order creation price carts through `PricingEngine`. The menu is
+indexed once by item, variant, modifier and option id and cached alongside
+the menu, so pricing a cart is a dictionary lookup per line and option.
+
+When a menu is known the menu is authoritative: client-sent prices are
+checked against it and any mismatch rejects the cart. Carts without a menu
+are priced from the client-sent prices, as before, at the default tax rate.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from loguru import logger
+
+from app.core.cache import TTLCache, menu_cache_key, price_index_cache
+from app.core.exceptions import BadRequestException, NotFoundException
+from app.models.schemas.order import OrderItemInput
+from app.repositories.menu_repository import MENU_PRICING_VIEW, MenuRepository
+
+DEFAULT_SALES_TAX = 0.08
+
+# Mismatches listed in the error detail
+MAX_REPORTED_MISMATCHES = 5
+
+
+def sales_tax_rate(sales_tax: Optional[float]) -> float:
+    """Menu `salesTax` as a fraction
+
+    Menus created through the admin store a percentage (10.25) while older
+    documents store a fraction (0.08); no real rate is above 100%.
+    """
+    if sales_tax is None:
+        return DEFAULT_SALES_TAX
+    return sales_tax / 100 if sales_tax > 1 else sales_tax
+
+
+class ModifierPrice(NamedTuple):
+    """Pricing rules of one modifier group"""
+
+    free_choices: int
+    extra_choice_price_cents: int
+    options: Dict[str, int]  # option id -> priceCents
+
+
+class ItemPrice(NamedTuple):
+    """Prices of one menu item"""
+
+    price_cents: int
+    variants: Dict[str, int]  # variant id -> priceCents
+    modifiers: Dict[str, ModifierPrice]
+
+
+class MenuPriceIndex:
+    """Menu prices keyed by id, built once per menu version"""
+
+    __slots__ = ("items", "sales_tax")
+
+    def __init__(self, items: Dict[str, ItemPrice], sales_tax: float):
+        self.items = items
+        self.sales_tax = sales_tax
+
+    @classmethod
+    def from_menu(cls, menu: dict) -> "MenuPriceIndex":
+        """Index a raw menu document"""
+        items = {}
+        for item in menu.get("items", []):
+            modifiers = {}
+            for modifier in item.get("modifiers", []):
+                modifiers[modifier.get("id", "")] = ModifierPrice(
+                    free_choices=modifier.get("freeChoices", 1),
+                    extra_choice_price_cents=modifier.get("extraChoicePriceCents", 0),
+                    options={
+                        option.get("id", ""): option.get("priceCents", 0)
+                        for option in modifier.get("options", [])
+                    },
+                )
+            items[item.get("id", "")] = ItemPrice(
+                price_cents=item.get("priceCents", 0),
+                variants={
+                    variant.get("id", ""): variant.get("priceCents", 0)
+                    for variant in item.get("variants", [])
+                },
+                modifiers=modifiers,
+            )
+        return cls(items, sales_tax_rate(menu.get("salesTax")))
+
+
+@dataclass
+class PricedCart:
+    """Totals for a cart, in cents"""
+
+    subtotal_cents: int
+    tax_cents: int
+    discount_cents: int
+    total_cents: int
+    item_subtotals: List[int] = field(default_factory=list)
+
+
+def modifier_charge(selected_count: int, free_choices: int, extra_choice_price_cents: int) -> int:
+    """Charge for one modifier group: only choices beyond the free limit are paid"""
+    if selected_count > free_choices:
+        return (selected_count - free_choices) * extra_choice_price_cents
+    return 0
+
+
+def _client_line_subtotal(item: OrderItemInput) -> int:
+    """Line subtotal from the prices the client sent"""
+    unit = item.price
+    for variant in item.variants:
+        unit += variant.priceCents
+    for modifier in item.modifiers:
+        unit += modifier_charge(
+            len(modifier.options), modifier.freeChoices, modifier.extraChoicePriceCents
+        )
+    return unit * item.quantity
+
+
+def _menu_line_subtotal(item: OrderItemInput, index: MenuPriceIndex, mismatches: List[str]) -> int:
+    """Line subtotal from the menu, recording where the client disagrees"""
+    menu_item = index.items.get(item.menuItemId)
+    if menu_item is None:
+        mismatches.append(f"item '{item.menuItemId}' is not on the menu")
+        return 0
+
+    if item.price != menu_item.price_cents:
+        mismatches.append(
+            f"item '{item.menuItemId}' costs {menu_item.price_cents}, got {item.price}"
+        )
+    unit = menu_item.price_cents
+
+    for variant in item.variants:
+        price = menu_item.variants.get(variant.id)
+        if price is None:
+            mismatches.append(f"variant '{variant.id}' is not offered for '{item.menuItemId}'")
+            continue
+        if variant.priceCents != price:
+            mismatches.append(f"variant '{variant.id}' costs {price}, got {variant.priceCents}")
+        unit += price
+
+    for modifier in item.modifiers:
+        rules = menu_item.modifiers.get(modifier.id)
+        if rules is None:
+            mismatches.append(f"modifier '{modifier.id}' is not offered for '{item.menuItemId}'")
+            continue
+        for option in modifier.options:
+            price = rules.options.get(option.id)
+            if price is None:
+                mismatches.append(f"option '{option.id}' is not part of modifier '{modifier.id}'")
+            elif option.priceCents != price:
+                mismatches.append(f"option '{option.id}' costs {price}, got {option.priceCents}")
+        unit += modifier_charge(
+            len(modifier.options), rules.free_choices, rules.extra_choice_price_cents
+        )
+
+    return unit * item.quantity
+
+
+def price_cart(
+    items: Sequence[OrderItemInput],
+    index: Optional[MenuPriceIndex] = None,
+    discount: Optional[dict] = None,
+) -> PricedCart:
+    """Price a cart in one pass over its lines and options
+
+    Args:
+        items: Cart lines as sent by the client
+        index: Price index of the menu the cart was built from. Without it
+            the client-sent prices are used at the default tax rate.
+        discount: Optional discount with `amountCents`
+
+    Raises:
+        BadRequestException: When the cart disagrees with the menu
+    """
+    if index is None:
+        item_subtotals = [_client_line_subtotal(item) for item in items]
+        sales_tax = DEFAULT_SALES_TAX
+    else:
+        mismatches: List[str] = []
+        item_subtotals = [_menu_line_subtotal(item, index, mismatches) for item in items]
+        if mismatches:
+            raise BadRequestException(
+                "Cart prices do not match the menu",
+                detail="; ".join(mismatches[:MAX_REPORTED_MISMATCHES]),
+            )
+        sales_tax = index.sales_tax
+
+    subtotal_cents = sum(item_subtotals)
+    tax_cents = int(subtotal_cents * sales_tax)
+    discount_cents = discount.get("amountCents", 0) if discount else 0
+
+    return PricedCart(
+        subtotal_cents=subtotal_cents,
+        tax_cents=tax_cents,
+        discount_cents=discount_cents,
+        total_cents=subtotal_cents + tax_cents - discount_cents,
+        item_subtotals=item_subtotals,
+    )
+
+
+class PricingEngine:
+    """Prices carts against cached menu price indexes"""
+
+    def __init__(self, menu_repo: MenuRepository, cache: TTLCache = price_index_cache):
+        self.menu_repo = menu_repo
+        self.cache = cache
+
+    async def get_index(
+        self, restaurant_id: str, location_id: str, menu_id: str
+    ) -> MenuPriceIndex:
+        """Price index for a menu, built on first use and on every menu change"""
+        key = menu_cache_key(restaurant_id, location_id, menu_id)
+        index = self.cache.get(key)
+        if index is not None:
+            return index
+
+        version = self.cache.version(key)
+        menu = await self.menu_repo.find_by_id(
+            restaurant_id, location_id, menu_id, projection=MENU_PRICING_VIEW
+        )
+        if not menu:
+            raise NotFoundException("Menu", menu_id)
+
+        index = MenuPriceIndex.from_menu(menu)
+        logger.debug(f"Indexed prices of menu {menu_id}: {len(index.items)} items")
+
+        self.cache.set(key, index, version=version)
+        return index
+
+    async def price(
+        self,
+        restaurant_id: str,
+        location_id: str,
+        menu_id: Optional[str],
+        items: Sequence[OrderItemInput],
+        discount: Optional[dict] = None,
+    ) -> PricedCart:
+        """Price a cart against its menu, or from client prices when no menu is given"""
+        index = (
+            await self.get_index(restaurant_id, location_id, menu_id) if menu_id else None
+        )
+        return price_cart(items, index, discount)
@@ -0,0 +1,93 @@
+"""Report service for sales dashboards"""
+
+from datetime import datetime, timedelta
+from typing import List
+
+from loguru import logger
+
+from app.repositories.report_repository import ReportRepository, RollupKind
+
+# Tax rate constant (should match NestJS TAX_RATE config)
+TAX_RATE = 0.08
+
+
+class ReportService:
+    """Service for sales reports served from precomputed rollups"""
+
+    def __init__(self, repository: ReportRepository):
+        self.repository = repository
+
+    async def get_sales_summary(
+        self, restaurant_id: str, location_id: str, days: int = 7
+    ) -> List[dict]:
+        """Daily sales for the last N local days, missing days filled with zeros
+
+        Args:
+            restaurant_id: The restaurant identifier
+            location_id: The location identifier
+            days: Number of days, including today
+
+        Returns:
+            List of {date, grossSales, tax} sorted by date
+        """
+        tz = await self.repository.find_timezone(restaurant_id, location_id)
+        today = datetime.now(tz=tz).replace(hour=0, minute=0, second=0, microsecond=0)
+        dates = [
+            (today - timedelta(days=days - 1 - i)).strftime("%Y-%m-%d") for i in range(days)
+        ]
+
+        if not dates:
+            return []
+
+        summary = {date: {"date": date, "grossSales": 0, "tax": 0} for date in dates}
+
+        for rollup in await self.repository.find_days(restaurant_id, location_id, dates[0]):
+            if rollup["date"] in summary:
+                gross_cents = rollup["grossSalesCents"]
+                tax_cents = gross_cents / (1 + TAX_RATE) * TAX_RATE
+                summary[rollup["date"]] = {
+                    "date": rollup["date"],
+                    "grossSales": gross_cents / 100,
+                    "tax": tax_cents / 100,
+                }
+
+        logger.debug(f"Returning {len(summary)} days of sales data")
+        return list(summary.values())
+
+    async def get_sales_by_item(
+        self, restaurant_id: str, location_id: str, date: str
+    ) -> List[dict]:
+        """Sales per menu item for one local day, highest sales first"""
+        rollups = await self.repository.find_breakdown(
+            RollupKind.ITEM, restaurant_id, location_id, date
+        )
+
+        logger.debug(f"Found sales data for {len(rollups)} items on {date}")
+        return [
+            {
+                "itemName": rollup.get("itemName"),
+                "soldCount": rollup["soldCount"],
+                "grossSales": rollup["grossSalesCents"] / 100,
+                "menuItemId": rollup.get("menuItemId"),
+            }
+            for rollup in rollups
+        ]
+
+    async def get_sales_by_origin(
+        self, restaurant_id: str, location_id: str, date: str
+    ) -> List[dict]:
+        """Sales per origin for one local day; soldCount is items, not orders"""
+        rollups = await self.repository.find_breakdown(
+            RollupKind.ORIGIN, restaurant_id, location_id, date
+        )
+
+        logger.debug(f"Found sales data for {len(rollups)} origins on {date}")
+        return [
+            {
+                "name": rollup.get("name"),
+                "soldCount": rollup["soldCount"],
+                "grossSales": rollup["grossSalesCents"] / 100,
+                "originId": rollup.get("originId"),
+            }
+            for rollup in rollups
+        ]
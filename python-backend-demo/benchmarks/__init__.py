@@ -0,0 +1 @@
+"""Load and micro-benchmarks for the API hot paths (not run by pytest)"""
@@ -0,0 +1,198 @@
+"""Deterministic benchmark fixtures
+
+Documents mirror what the NestJS admin writes, so the API serves them the
+same way it serves production data.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+RESTAURANT_ID = "bench-restaurant"
+LOCATION_ID = "bench-location"
+MENU_ID = "bench-menu"
+LOCATION_SLUG = "bench"
+TIMEZONE = "America/New_York"
+
+LANGUAGES = ("en", "es", "pt")
+STATUSES = ("order_created", "order_accepted", "ready_for_pickup", "order_delivered")
+
+
+def _text(value: str) -> dict:
+    return {language: f"{value} ({language})" for language in LANGUAGES}
+
+
+def item_price(i: int) -> int:
+    """Menu price of item `i`, shared by the menu and the generated carts"""
+    return 299 + (i * 37) % 2700
+
+
+def restaurant() -> dict:
+    return {"_id": RESTAURANT_ID, "name": "Benchmark Bistro", "concept": "bench", "logo": None}
+
+
+def location() -> dict:
+    return {
+        "_id": LOCATION_ID,
+        "restaurantId": RESTAURANT_ID,
+        "locationSlug": LOCATION_SLUG,
+        "name": "Benchmark Bistro Downtown",
+        "timezone": TIMEZONE,
+        "isActive": True,
+        "payment": {"acceptPayment": False},
+        "workingHours": [{"day": day, "isOpen": True} for day in range(7)],
+    }
+
+
+def origins(count: int) -> List[dict]:
+    return [
+        {
+            "_id": f"bench-origin-{i}",
+            "restaurantId": RESTAURANT_ID,
+            "locationId": LOCATION_ID,
+            "label": f"Table {i}",
+            "type": "table",
+        }
+        for i in range(count)
+    ]
+
+
+def menu(item_count: int, category_count: int = 20) -> dict:
+    """A menu with `item_count` items, each with two modifier groups"""
+    rng = random.Random(item_count)
+    categories = [
+        {
+            "id": f"cat-{c}",
+            "name": _text(f"Category {c}"),
+            "description": _text(f"Dishes of category {c}"),
+            "sortOrder": c,
+            "emoji": None,
+        }
+        for c in range(category_count)
+    ]
+    items = [
+        {
+            "id": f"item-{i}",
+            "name": _text(f"Item {i}"),
+            "description": _text(f"A generous portion of item {i}"),
+            "imageUrls": [f"https://example.com/items/{i}.jpg"],
+            "categoryId": f"cat-{i % category_count}",
+            "priceCents": item_price(i),
+            "makingCostCents": rng.randrange(100, 900),
+            "isAvailable": rng.random() > 0.05,
+            "stationTags": ["grill" if i % 2 else "fry"],
+            "variants": [
+                {"id": f"item-{i}-v{v}", "name": f"Size {v}", "priceCents": v * 150}
+                for v in range(2)
+            ],
+            "modifiers": [
+                {
+                    "id": f"item-{i}-m{m}",
+                    "name": _text(f"Extras {m}"),
+                    "type": "standard",
+                    "required": m == 0,
+                    "selectionMode": "single" if m == 0 else "multiple",
+                    "maxChoices": 1 if m == 0 else 3,
+                    "freeChoices": 0 if m == 0 else 1,
+                    "extraChoicePriceCents": 0 if m == 0 else 75,
+                    "options": [
+                        {
+                            "id": f"item-{i}-m{m}-o{o}",
+                            "name": _text(f"Option {o}"),
+                            "priceCents": o * 50,
+                        }
+                        for o in range(4)
+                    ],
+                }
+                for m in range(2)
+            ],
+        }
+        for i in range(item_count)
+    ]
+    return {
+        "_id": MENU_ID,
+        "restaurantId": RESTAURANT_ID,
+        "locationId": LOCATION_ID,
+        "menuSlug": "bench-menu",
+        "name": _text("Benchmark Menu"),
+        "categories": categories,
+        "items": items,
+        "salesTax": 0.08,
+    }
+
+
+def order_items(rng: random.Random, item_count: int) -> List[dict]:
+    """Order lines in the shape OrderService stores them"""
+    lines = []
+    for line in range(rng.randint(1, 5)):
+        i = rng.randrange(item_count)
+        price = item_price(i)
+        lines.append({
+            "id": f"line-{line}",
+            "menuItemId": f"item-{i}",
+            "name": f"Item {i}",
+            "price": price,
+            "quantity": 1,
+            "subtotalCents": price,
+            "notes": None,
+            "modifiers": [],
+            "variants": [],
+            "stationTags": ["grill"],
+            "startedAt": None,
+            "completedAt": None,
+        })
+    return lines
+
+
+def orders(
+    count: int, item_count: int, origin_count: int, days: int, seed: int = 7
+) -> Iterator[dict]:
+    """Orders spread over the last `days` days, a quarter of them today"""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    for n in range(count):
+        if n % 4 == 0:
+            age = timedelta(hours=rng.random() * 12)
+        else:
+            age = timedelta(days=rng.random() * days)
+        created_at = now - age
+        items = order_items(rng, item_count)
+        subtotal = sum(item["subtotalCents"] for item in items)
+        tax = int(subtotal * 0.08)
+        status = rng.choice(STATUSES)
+        origin = rng.randrange(origin_count)
+        yield {
+            "orderId": f"BENCH-{n:08d}",
+            "restaurantId": RESTAURANT_ID,
+            "locationId": LOCATION_ID,
+            "locationSlug": LOCATION_SLUG,
+            "origin": {"id": f"bench-origin-{origin}", "name": f"Table {origin}"},
+            "customer": {"name": f"Guest {n}", "phone": f"+1555{n % 10_000_000:07d}"},
+            "items": items,
+            "status": status,
+            "subtotalCents": subtotal,
+            "taxCents": tax,
+            "totalCents": subtotal + tax,
+            "createdAt": created_at,
+            "updatedAt": created_at,
+            "startedAt": created_at,
+            "endedAt": created_at + timedelta(minutes=15) if status == "order_delivered" else None,
+        }
+
+
+def order_request(rng: random.Random, item_count: int) -> dict:
+    """Body for POST /orders and /cart/preview-order"""
+    items = order_items(rng, item_count)
+    for item in items:
+        for key in ("subtotalCents", "startedAt", "completedAt"):
+            item.pop(key)
+    origin = rng.randrange(10)
+    return {
+        "restaurantId": RESTAURANT_ID,
+        "locationId": LOCATION_ID,
+        "locationSlug": LOCATION_SLUG,
+        "menuId": MENU_ID,
+        "origin": {"id": f"bench-origin-{origin}", "name": f"Table {origin}"},
+        "customer": {"name": "Load Test", "phone": "+15550000000"},
+        "items": items,
+    }
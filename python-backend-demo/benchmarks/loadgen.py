@@ -0,0 +1,233 @@
+"""Async load generator for the order, menu and report hot paths
+
+Usage:
+    python -m benchmarks.loadgen --base-url http://localhost:8000 --duration 30
+    python -m benchmarks.loadgen --in-process --orders 20000   # needs mongomock-motor
+    python -m benchmarks.loadgen --compare benchmarks/results/<baseline>.json
+
+Each scenario runs on its own for `--duration` seconds with `--concurrency`
+clients after a short warm-up. Latency percentiles and throughput are
+printed and written to benchmarks/results/ as JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+import httpx
+
+from benchmarks import data
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+@dataclass
+class Scenario:
+    """One request shape to drive"""
+
+    name: str
+    method: str
+    path: str
+    body: Optional[Callable[[random.Random], dict]] = None
+
+
+def scenarios(item_count: int) -> List[Scenario]:
+    r, l, m = data.RESTAURANT_ID, data.LOCATION_ID, data.MENU_ID
+    today = datetime.now(ZoneInfo(data.TIMEZONE)).strftime("%Y-%m-%d")
+    return [
+        Scenario("menu_get", "GET", f"/api/v1/order-app/restaurants/{r}/locations/{l}/menus/{m}"),
+        Scenario(
+            "preview_order",
+            "POST",
+            "/api/v1/order-app/cart/preview-order",
+            lambda rng: data.order_request(rng, item_count),
+        ),
+        Scenario(
+            "create_order",
+            "POST",
+            "/api/v1/order-app/orders",
+            lambda rng: data.order_request(rng, item_count),
+        ),
+        Scenario("orders_today", "GET", f"/restaurant/orders/today/{r}/{l}"),
+        Scenario("report_sales_summary", "GET", f"/report/sales_summary/{r}/{l}"),
+        Scenario("report_sales_by_item", "GET", f"/report/sales_by_item/{r}/{l}/{today}"),
+        Scenario("report_sales_by_origin", "GET", f"/report/sales_by_origin/{r}/{l}/{today}"),
+        Scenario("report_order_history", "GET", f"/report/order_history/{r}/{l}/{today}"),
+    ]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    # ceil(q * n), tolerant of float error such as 0.95 * 100 = 95.00000000000001
+    rank = math.ceil(round(q * len(sorted_values), 9))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> dict:
+    """Latency percentiles (milliseconds) and throughput for one scenario"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughputRps": round(count / elapsed, 1) if elapsed else 0.0,
+        "meanMs": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        "p50Ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95Ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99Ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "maxMs": round(ordered[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+    warmup: int,
+) -> dict:
+    """Drive one scenario with `concurrency` clients for `duration` seconds"""
+    latencies: List[float] = []
+    errors = 0
+
+    async def call(rng: random.Random) -> bool:
+        body = scenario.body(rng) if scenario.body else None
+        response = await client.request(scenario.method, scenario.path, json=body)
+        return response.status_code < 400
+
+    warmup_rng = random.Random(0)
+    for _ in range(warmup):
+        await call(warmup_rng)
+
+    deadline = time.perf_counter() + duration
+
+    async def worker(seed: int) -> None:
+        nonlocal errors
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                ok = await call(rng)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(seed) for seed in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print p50/p95/p99 changes against a previous run"""
+    print(f"\n{'scenario':<26}{'p50':>18}{'p95':>18}{'p99':>18}")
+    for name, current in results["scenarios"].items():
+        previous = baseline["scenarios"].get(name)
+        if not previous:
+            continue
+        cells = []
+        for key in ("p50Ms", "p95Ms", "p99Ms"):
+            change = (current[key] - previous[key]) / previous[key] * 100 if previous[key] else 0.0
+            cells.append(f"{current[key]:>8.2f} ({change:+6.1f}%)")
+        print(f"{name:<26}" + "".join(f"{cell:>18}" for cell in cells))
+
+
+async def in_process_client(args: argparse.Namespace) -> httpx.AsyncClient:
+    """Serve the app in this process over mongomock-motor"""
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("--in-process needs the mongomock-motor package")
+
+    from app.core.database import db
+    from app.main import app
+    from benchmarks.seed import seed
+
+    db.client = AsyncMongoMockClient()
+    db.db = db.client["orderbuddy_bench"]
+    await seed(db.db, args.orders, args.items, rollups=False)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+
+async def main(args: argparse.Namespace) -> dict:
+    if args.in_process:
+        client = await in_process_client(args)
+    else:
+        client = httpx.AsyncClient(
+            base_url=args.base_url,
+            limits=httpx.Limits(max_connections=args.concurrency),
+            timeout=30.0,
+        )
+
+    selected = [s for s in scenarios(args.items) if not args.scenario or s.name in args.scenario]
+    results: Dict[str, dict] = {}
+    async with client:
+        for scenario in selected:
+            summary = await run_scenario(
+                client, scenario, args.concurrency, args.duration, args.warmup
+            )
+            results[scenario.name] = summary
+            print(
+                f"{scenario.name:<26} {summary['throughputRps']:>9.1f} req/s  "
+                f"p50 {summary['p50Ms']:>8.2f}ms  p95 {summary['p95Ms']:>8.2f}ms  "
+                f"p99 {summary['p99Ms']:>8.2f}ms  errors {summary['errors']}"
+            )
+
+    return {
+        "startedAt": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "target": "in-process" if args.in_process else args.base_url,
+        "config": {
+            "concurrency": args.concurrency,
+            "durationSeconds": args.duration,
+            "warmupRequests": args.warmup,
+            "menuItems": args.items,
+        },
+        "scenarios": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the API hot paths")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="Serve the app over mongomock")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Requests before measuring")
+    parser.add_argument("--items", type=int, default=1_000, help="Menu items seeded")
+    parser.add_argument("--orders", type=int, default=20_000, help="Orders (in-process only)")
+    parser.add_argument("--scenario", action="append", help="Only run these scenarios")
+    parser.add_argument("--output", type=Path, help="Results file (default: results/<time>.json)")
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare with")
+    arguments = parser.parse_args()
+
+    run = asyncio.run(main(arguments))
+
+    output = arguments.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(run, indent=2))
+    print(f"\nResults written to {output}")
+
+    if arguments.compare:
+        compare(run, json.loads(arguments.compare.read_text()))
@@ -0,0 +1,127 @@
+"""Benchmark request throughput under each logging configuration
+
+Usage:
+    python -m benchmarks.logging_pipeline --requests 20000 --concurrency 32
+
+Serves a minimal FastAPI app in process (no MongoDB) whose handler logs the
+way the API handlers do: an INFO request line, a DEBUG line and an INFO
+result line. Console output goes to a temporary file, flushed per write like
+a pipe to the container runtime; `--write-latency-ms` adds a delay to every
+write, standing in for a slow terminal or a backed-up log pipe. Compares:
+
+- sync: the previous setup, formatting and writing on the event loop
+- queued: `setup_logging`, records batched and written by a writer thread
+- queued+sampled: the same, keeping 10% of INFO request lines
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from typing import Callable, Dict
+
+import httpx
+from fastapi import FastAPI
+from loguru import logger
+
+from app.config import settings
+from app.core.logging import CONSOLE_FORMAT, setup_logging
+
+
+class SlowStream:
+    """File wrapper that blocks for `latency` seconds on every write"""
+
+    def __init__(self, stream, latency: float):
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, text: str) -> None:
+        time.sleep(self.latency)
+        self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/orders/{order_id}")
+    async def get_order(order_id: str):
+        logger.info(f"GET /orders/{order_id}")
+        logger.debug(f"Found order: {order_id}")
+        logger.info(f"Returning order {order_id} with status order_created")
+        return {"orderId": order_id, "status": "order_created"}
+
+    return app
+
+
+def sync_logging(stream) -> None:
+    logger.remove()
+    logger.add(stream, format=CONSOLE_FORMAT, level="INFO", colorize=True)
+
+
+def queued_logging(sample_rate: float) -> Callable:
+    def configure(stream) -> None:
+        settings.LOG_REQUEST_SAMPLE_RATE = sample_rate
+        setup_logging(stream)
+
+    return configure
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int) -> float:
+    """Send `requests` requests from `concurrency` clients; returns elapsed seconds"""
+    transport = httpx.ASGITransport(app=app)
+    remaining = iter(range(requests))
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        for number in remaining:
+            response = await client.get(f"/orders/ORD-{number}")
+            response.raise_for_status()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return elapsed
+
+
+def run(
+    name: str, configure: Callable, requests: int, concurrency: int, write_latency: float
+) -> Dict:
+    with tempfile.TemporaryFile("w+") as output:
+        configure(SlowStream(output, write_latency) if write_latency else output)
+        elapsed = asyncio.run(drive(build_app(), requests, concurrency))
+        logger.remove()  # writes the last batch
+        output.seek(0)
+        lines = sum(1 for _ in output)
+    return {
+        "config": name,
+        "requests": requests,
+        "throughputRps": round(requests / elapsed, 1),
+        "logLines": lines,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the logging pipeline")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--write-latency-ms", type=float, default=0.0)
+    arguments = parser.parse_args()
+
+    configurations = {
+        "sync": sync_logging,
+        "queued": queued_logging(1.0),
+        "queued+sampled": queued_logging(0.1),
+    }
+    print(f"{'config':<16} {'req/s':>9} {'log lines':>10}")
+    for name, configure in configurations.items():
+        result = run(
+            name,
+            configure,
+            arguments.requests,
+            arguments.concurrency,
+            arguments.write_latency_ms / 1000,
+        )
+        print(f"{result['config']:<16} {result['throughputRps']:>9.1f} {result['logLines']:>10}")
@@ -0,0 +1,83 @@
+"""Micro-benchmark for the menu transform and encode path
+
+Usage:
+    python -m benchmarks.menu_transform --items 500 1000 2000
+
+Compares the reference `transform_menu` against `transform_menu_compiled`,
+and the per-call `ApiResponse[MenuResponse](...)` encode against the cached
+TypeAdapter. Both pairs must produce identical bytes; the run aborts if they
+do not.
+"""
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from app.core.transformers import transform_menu, transform_menu_compiled
+from app.models.schemas.menu import MenuResponse
+from app.models.schemas.response import ApiResponse
+from app.services.menu_service import encode_menu_response
+from benchmarks import data
+
+
+def best_ms(function: Callable[[], object], repeat: int) -> float:
+    """Fastest of `repeat` calls, in milliseconds; the minimum is the least noisy"""
+    function()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def model_encode(menu: dict) -> bytes:
+    """The encode path used before the TypeAdapter"""
+    return ApiResponse[MenuResponse](data=MenuResponse(**menu)).model_dump_json(
+        by_alias=True
+    ).encode()
+
+
+def run(item_count: int, repeat: int) -> dict:
+    raw = data.menu(item_count)
+    reference = transform_menu(raw)
+    compiled = transform_menu_compiled(raw)
+
+    if json.dumps(reference) != json.dumps(compiled):
+        raise SystemExit(f"Compiled transform differs from transform_menu ({item_count} items)")
+    if model_encode(reference) != encode_menu_response(compiled):
+        raise SystemExit(f"Adapter encode differs from the model encode ({item_count} items)")
+
+    transform = best_ms(lambda: transform_menu(raw), repeat)
+    transform_fast = best_ms(lambda: transform_menu_compiled(raw), repeat)
+    encode = best_ms(lambda: model_encode(reference), repeat)
+    encode_fast = best_ms(lambda: encode_menu_response(compiled), repeat)
+
+    return {
+        "items": item_count,
+        "transformMs": round(transform, 3),
+        "transformCompiledMs": round(transform_fast, 3),
+        "encodeMs": round(encode, 3),
+        "encodeAdapterMs": round(encode_fast, 3),
+        "totalSpeedup": round((transform + encode) / (transform_fast + encode_fast), 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the menu transform pipeline")
+    parser.add_argument("--items", type=int, nargs="+", default=[500, 1000, 2000])
+    parser.add_argument("--repeat", type=int, default=30)
+    arguments = parser.parse_args()
+
+    print(
+        f"{'items':>6} {'transform':>10} {'compiled':>10} {'encode':>10} "
+        f"{'adapter':>10} {'speedup':>8}"
+    )
+    for count in arguments.items:
+        result = run(count, arguments.repeat)
+        print(
+            f"{result['items']:>6} {result['transformMs']:>8.2f}ms "
+            f"{result['transformCompiledMs']:>8.2f}ms {result['encodeMs']:>8.2f}ms "
+            f"{result['encodeAdapterMs']:>8.2f}ms {result['totalSpeedup']:>7.2f}x"
+        )
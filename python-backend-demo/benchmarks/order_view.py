@@ -0,0 +1,87 @@
+"""Micro-benchmark for the restaurant app order view
+
+Usage:
+    python -m benchmarks.order_view --orders 100 1000 5000
+
+Times one day of a location's orders through the reference
+`transform_restaurant_order` plus FastAPI's `jsonable_encoder` (the path
+the restaurant endpoints used before), and through
+`transform_restaurant_order_compiled` plus `streaming.dumps`. Both must
+produce the same JSON; the run aborts if they do not.
+
+The `$project` fast path (`ORDER_VIEW_STAGE`) moves the transform into
+MongoDB, so it can only be measured against a database: compare the
+`orders_today` scenario of `benchmarks.loadgen` with ORDER_FEED_ENABLED=false
+before and after.
+"""
+
+import argparse
+import json
+import time
+from itertools import islice
+from typing import Callable, List
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from app.core.streaming import dumps
+from app.core.transformers import transform_restaurant_order, transform_restaurant_order_compiled
+from benchmarks import data
+
+
+def best_ms(function: Callable[[], object], repeat: int) -> float:
+    """Fastest of `repeat` calls, in milliseconds; the minimum is the least noisy"""
+    function()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def day_of_orders(count: int) -> List[dict]:
+    """Orders as the repository returns them (`_id` as a string)"""
+    orders = list(islice(data.orders(count, item_count=500, origin_count=10, days=1), count))
+    for order in orders:
+        order["_id"] = str(ObjectId())
+    return orders
+
+
+def reference(orders: List[dict]) -> bytes:
+    views = [transform_restaurant_order(order) for order in orders]
+    return json.dumps(jsonable_encoder(views), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def compiled(orders: List[dict]) -> bytes:
+    return dumps([transform_restaurant_order_compiled(order) for order in orders])
+
+
+def run(order_count: int, repeat: int) -> dict:
+    orders = day_of_orders(order_count)
+    if reference(orders) != compiled(orders):
+        raise SystemExit(f"Compiled order view differs from the reference ({order_count} orders)")
+
+    slow = best_ms(lambda: reference(orders), repeat)
+    fast = best_ms(lambda: compiled(orders), repeat)
+    return {
+        "orders": order_count,
+        "referenceMs": round(slow, 3),
+        "compiledMs": round(fast, 3),
+        "speedup": round(slow / fast, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the restaurant order view")
+    parser.add_argument("--orders", type=int, nargs="+", default=[100, 1_000, 5_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    arguments = parser.parse_args()
+
+    print(f"{'orders':>7} {'reference':>11} {'compiled':>11} {'speedup':>8}")
+    for count in arguments.orders:
+        result = run(count, arguments.repeat)
+        print(
+            f"{result['orders']:>7} {result['referenceMs']:>9.2f}ms "
+            f"{result['compiledMs']:>9.2f}ms {result['speedup']:>7.2f}x"
+        )
@@ -0,0 +1,85 @@
+"""Micro-benchmark for the cart pricing engine
+
+Usage:
+    python -m benchmarks.pricing --items 1000 --lines 10 100 1000
+
+Builds the price index of a seeded menu once, then prices carts of
+`--lines` lines, each with a variant and two modifier groups, both from the
+client-sent prices and verified against the menu.
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from app.models.schemas.order import OrderItemInput
+from app.services.pricing import MenuPriceIndex, price_cart
+from benchmarks import data
+
+
+def cart(menu: dict, lines: int, seed: int = 0) -> List[OrderItemInput]:
+    """A cart whose prices agree with `menu`"""
+    rng = random.Random(seed)
+    items = []
+    for line in range(lines):
+        item = rng.choice(menu["items"])
+        items.append(OrderItemInput(
+            id=f"line-{line}",
+            menuItemId=item["id"],
+            name=item["name"]["en"],
+            price=item["priceCents"],
+            quantity=rng.randint(1, 3),
+            variants=[item["variants"][1]],
+            modifiers=[
+                {
+                    "id": modifier["id"],
+                    "name": modifier["name"]["en"],
+                    "options": [
+                        {
+                            "id": option["id"],
+                            "name": option["name"]["en"],
+                            "priceCents": option["priceCents"],
+                        }
+                        for option in modifier["options"][: rng.randint(1, 3)]
+                    ],
+                    "freeChoices": modifier["freeChoices"],
+                    "extraChoicePriceCents": modifier["extraChoicePriceCents"],
+                }
+                for modifier in item["modifiers"]
+            ],
+        ))
+    return items
+
+
+def per_call_us(function: Callable[[], object], budget: float = 0.5) -> float:
+    """Mean microseconds per call over roughly `budget` seconds"""
+    function()  # warm up
+    calls = 0
+    started = time.perf_counter()
+    while (elapsed := time.perf_counter() - started) < budget:
+        function()
+        calls += 1
+    return elapsed / calls * 1_000_000
+
+
+def run(item_count: int, lines: List[int]) -> None:
+    menu = data.menu(item_count)
+    index_us = per_call_us(lambda: MenuPriceIndex.from_menu(menu))
+    index = MenuPriceIndex.from_menu(menu)
+    print(f"index build ({item_count} items): {index_us / 1000:.2f}ms, once per menu version\n")
+
+    print(f"{'lines':>6} {'client':>12} {'verified':>12} {'carts/s':>10}")
+    for count in lines:
+        items = cart(menu, count)
+        client = per_call_us(lambda: price_cart(items))
+        verified = per_call_us(lambda: price_cart(items, index))
+        print(f"{count:>6} {client:>10.1f}us {verified:>10.1f}us {1_000_000 / verified:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cart pricing")
+    parser.add_argument("--items", type=int, default=1_000, help="Menu items")
+    parser.add_argument("--lines", type=int, nargs="+", default=[10, 100, 1_000])
+    arguments = parser.parse_args()
+    run(arguments.items, arguments.lines)
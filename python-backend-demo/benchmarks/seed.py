@@ -0,0 +1,100 @@
+"""Seed MongoDB with benchmark data
+
+Usage:
+    python -m benchmarks.seed --orders 1000000 --items 2000
+
+Writes to DB_CONN_STRING / DB_NAME from the environment, replacing any
+previous benchmark documents. Point DB_NAME at a scratch database.
+"""
+
+import argparse
+import asyncio
+import time
+
+from loguru import logger
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config import settings
+from app.core.constants import Collections
+from app.core.database import close_mongo_connection, connect_to_mongo, get_database
+from app.core.indexes import ensure_indexes
+from app.repositories.report_repository import ReportRepository
+from benchmarks import data
+
+BATCH_SIZE = 10_000
+
+
+async def seed(
+    database: AsyncIOMotorDatabase,
+    order_count: int,
+    item_count: int,
+    origin_count: int = 50,
+    days: int = 30,
+    rollups: bool = True,
+) -> None:
+    """Replace the benchmark restaurant's documents and insert fresh ones
+
+    Args:
+        rollups: Rebuild the sales rollups with $merge. Stand-ins without
+            $merge support record delivered orders one by one instead.
+    """
+    scope = {"restaurantId": data.RESTAURANT_ID}
+    await database[Collections.RESTAURANTS].delete_many({"_id": data.RESTAURANT_ID})
+    for collection in (
+        Collections.LOCATIONS,
+        Collections.MENUS,
+        Collections.ORIGINS,
+        Collections.ORDERS,
+        Collections.SALES_ROLLUPS,
+    ):
+        await database[collection].delete_many(scope)
+
+    await ensure_indexes(database)
+    await database[Collections.RESTAURANTS].insert_one(data.restaurant())
+    await database[Collections.LOCATIONS].insert_one(data.location())
+    await database[Collections.ORIGINS].insert_many(data.origins(origin_count))
+    await database[Collections.MENUS].insert_one(data.menu(item_count))
+    logger.info(f"Seeded menu with {item_count} items and {origin_count} origins")
+
+    reports = ReportRepository(database)
+    started = time.perf_counter()
+    batch = []
+    inserted = 0
+    for order in data.orders(order_count, item_count, origin_count, days):
+        if not rollups and order["status"] == "order_delivered":
+            await reports.record_delivered_order(order)
+        batch.append(order)
+        if len(batch) == BATCH_SIZE:
+            await database[Collections.ORDERS].insert_many(batch, ordered=False)
+            inserted += len(batch)
+            batch = []
+            if inserted % (BATCH_SIZE * 10) == 0:
+                logger.info(f"Inserted {inserted}/{order_count} orders")
+    if batch:
+        await database[Collections.ORDERS].insert_many(batch, ordered=False)
+
+    logger.info(f"Inserted {order_count} orders in {time.perf_counter() - started:.1f}s")
+
+    if rollups:
+        await reports.rebuild(data.RESTAURANT_ID, data.LOCATION_ID)
+        logger.info("Rebuilt sales rollups")
+
+
+async def main(args: argparse.Namespace) -> None:
+    await connect_to_mongo()
+    try:
+        await seed(get_database(), args.orders, args.items, args.origins, args.days)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed MongoDB with benchmark data")
+    parser.add_argument("--orders", type=int, default=100_000, help="Number of orders")
+    parser.add_argument("--items", type=int, default=1_000, help="Menu items")
+    parser.add_argument("--origins", type=int, default=50, help="Tables / pickup points")
+    parser.add_argument("--days", type=int, default=30, help="Days of order history")
+    arguments = parser.parse_args()
+
+    logger.info(f"Seeding {settings.DB_NAME} at {settings.DB_CONN_STRING}")
+    asyncio.run(main(arguments))
@@ -0,0 +1,85 @@
+"""Benchmark session verification: MongoDB lookup vs signed access token
+
+Usage:
+    DB_NAME=orderbuddy_bench python -m benchmarks.session_verify --checks 5000
+
+Times `verify_session` for one session three ways:
+
+- mongo: opaque token, a `sessions` read per check (the session cache is
+  cleared before every check, which is the behaviour before the cache)
+- cached: opaque token through the per-worker session cache
+- jwt: signed token verified in process, no session read
+
+Needs a running MongoDB (DB_CONN_STRING / DB_NAME) and python-jose. The
+benchmark inserts one session document and deletes it afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Awaitable, Callable, Dict
+
+from app.api.v1.endpoints.auth import verify_session
+from app.config import settings
+from app.core.cache import session_cache
+from app.core.database import close_mongo_connection, connect_to_mongo, get_database
+from app.core.tokens import AccessTokenSigner
+from app.repositories.session_repository import SessionRepository
+
+
+async def time_checks(check: Callable[[], Awaitable[dict]], count: int) -> Dict:
+    await check()  # warm up
+    timings = []
+    for _ in range(count):
+        started = time.perf_counter()
+        result = await check()
+        timings.append(time.perf_counter() - started)
+        if result["status"] != "OK":
+            raise SystemExit(f"Session did not verify: {result}")
+    timings.sort()
+    return {
+        "meanUs": round(sum(timings) / count * 1e6, 1),
+        "p50Us": round(timings[count // 2] * 1e6, 1),
+        "p99Us": round(timings[min(count - 1, int(count * 0.99))] * 1e6, 1),
+    }
+
+
+async def main(count: int) -> None:
+    await connect_to_mongo()
+    sessions = SessionRepository(get_database())
+    session_id = f"bench-{uuid.uuid4()}"
+    await sessions.create(session_id, "bench-user", "+15550100")
+    opaque = f"access_{session_id}"
+    signed = AccessTokenSigner("bench-secret", "HS256", 900).sign(session_id, "bench-user")
+
+    async def mongo():
+        session_cache.invalidate(session_id)
+        return await verify_session(opaque, sessions)
+
+    async def cached():
+        return await verify_session(opaque, sessions)
+
+    async def jwt():
+        return await verify_session(signed, sessions)
+
+    settings.ACCESS_TOKEN_MODE = "jwt"
+    settings.ACCESS_TOKEN_SECRET = "bench-secret"
+    try:
+        print(f"{'path':<8} {'mean':>10} {'p50':>10} {'p99':>10}")
+        for name, check in (("mongo", mongo), ("cached", cached), ("jwt", jwt)):
+            result = await time_checks(check, count)
+            print(
+                f"{name:<8} {result['meanUs']:>8.1f}us {result['p50Us']:>8.1f}us "
+                f"{result['p99Us']:>8.1f}us"
+            )
+    finally:
+        await sessions.delete(session_id)
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark session verification")
+    parser.add_argument("--checks", type=int, default=5_000)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.checks))
@@ -0,0 +1,124 @@
+"""Cold start benchmark: import time and time to first request
+
+Usage:
+    python -m benchmarks.startup --runs 10
+    python -m benchmarks.startup --runs 5 --server   # needs uvicorn and MongoDB
+
+Every run starts a fresh interpreter, so nothing is cached in process.
+
+- import: `import app.main`, timed from process start
+- first request: process start until a first `GET /health` answers. By
+  default the request is served in process over ASGI without the lifespan,
+  so no database is needed. With `--server`, `python -m app.server` runs as
+  one worker with its full lifespan (MongoDB, indexes, order board), and the
+  clock stops when /health answers over HTTP.
+
+`--profile` prints the slowest imports from `python -X importtime`, grouped
+by top-level package (app modules are listed individually).
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+IMPORT_ONLY = "import app.main"
+
+FIRST_REQUEST = """
+import asyncio, httpx
+from app.main import app
+
+async def first_request():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+        (await client.get("/health")).raise_for_status()
+
+asyncio.run(first_request())
+"""
+
+
+def time_process(code: str) -> float:
+    """Seconds for a fresh interpreter to run `code`"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    return time.perf_counter() - started
+
+
+def time_server(port: int, timeout: float = 60.0) -> float:
+    """Seconds from launching one server worker until /health answers"""
+    env = {**os.environ, "WEB_CONCURRENCY": "1", "PORT": str(port)}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.server"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        raise SystemExit(f"Server did not answer /health within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def slowest_imports(limit: int) -> List[tuple]:
+    """Self time per top-level package (app modules individually), slowest first"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_ONLY],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    totals: Dict[str, int] = {}
+    for line in output.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)", line)
+        if not match:
+            continue
+        module = match.group(2)
+        group = module if module.startswith("app") else module.split(".")[0]
+        totals[group] = totals.get(group, 0) + int(match.group(1))
+    ranked = sorted(totals.items(), key=lambda item: -item[1])
+    return [(name, micros / 1000) for name, micros in ranked[:limit]]
+
+
+def describe(timings: List[float]) -> str:
+    ms = sorted(t * 1000 for t in timings)
+    return f"median {statistics.median(ms):8.1f}ms  min {ms[0]:8.1f}ms  max {ms[-1]:8.1f}ms"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold start")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--server", action="store_true", help="Time a real server worker")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", action="store_true", help="Show the slowest imports")
+    arguments = parser.parse_args()
+
+    baseline = [time_process("pass") for _ in range(arguments.runs)]
+    imports = [time_process(IMPORT_ONLY) for _ in range(arguments.runs)]
+    if arguments.server:
+        first = [time_server(arguments.port) for _ in range(arguments.runs)]
+    else:
+        first = [time_process(FIRST_REQUEST) for _ in range(arguments.runs)]
+
+    print(f"{'interpreter':<15} {describe(baseline)}")
+    print(f"{'import':<15} {describe(imports)}")
+    print(f"{'first request':<15} {describe(first)}")
+
+    if arguments.profile:
+        print("\nSlowest imports (self time):")
+        for name, ms in slowest_imports(20):
+            print(f"  {ms:8.1f}ms  {name}")
@@ -0,0 +1,18 @@
+"""Integration tests for index bootstrap and query plans"""
+
+import pytest
+
+from app.core.indexes import ensure_indexes, verify_query_plans
+
+
+@pytest.mark.asyncio
+async def test_no_query_shape_uses_collscan(test_db):
+    """Test every declared query shape is served by an index"""
+    # Arrange
+    await ensure_indexes(test_db)
+
+    # Act
+    collection_scans = await verify_query_plans(test_db)
+
+    # Assert
+    assert collection_scans == []
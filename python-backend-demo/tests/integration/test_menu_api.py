@@ -147,6 +147,27 @@ async def test_menu_response_structure(client: AsyncClient, test_db, sample_menu
     assert "options" in modifier
 
 
+@pytest.mark.asyncio
+async def test_get_menu_etag_not_modified(client: AsyncClient, test_db, sample_menu_data):
+    """Test repeat menu loads with a matching If-None-Match get 304"""
+    # Arrange
+    result = await test_db[Collections.MENUS].insert_one(sample_menu_data)
+    menu_id = str(result.inserted_id)
+    url = (
+        f"/api/v1/order-app/restaurants/{sample_menu_data['restaurantId']}"
+        f"/locations/{sample_menu_data['locationId']}/menus/{menu_id}"
+    )
+
+    # Act
+    first = await client.get(url)
+    second = await client.get(url, headers={"If-None-Match": first.headers["etag"]})
+
+    # Assert
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["etag"] == first.headers["etag"]
+
+
 @pytest.mark.asyncio
 async def test_health_check(client: AsyncClient):
     """Test health check endpoint"""
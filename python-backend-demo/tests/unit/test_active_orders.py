@@ -0,0 +1,186 @@
+"""Unit tests for the active order board"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.models.schemas.order import OrderResponse, OrderStatus
+from app.services.active_orders import ActiveOrder, ActiveOrderBoard
+
+
+def order(
+    order_id: str,
+    status: str = "order_created",
+    age: timedelta = timedelta(0),
+    location_id: str = "l1",
+) -> dict:
+    """An order at r1/`location_id`, created an hour ago and written `age` ago"""
+    now = datetime(2024, 1, 1, 12, 0)
+    return {
+        "_id": f"id-{order_id}",
+        "orderId": order_id,
+        "restaurantId": "r1",
+        "locationId": location_id,
+        "locationSlug": "main",
+        "origin": {"id": "o1", "name": "Counter"},
+        "customer": {"name": "Ana", "phone": "+15550100"},
+        "items": [
+            {
+                "id": "i1",
+                "menuItemId": "m1",
+                "name": "Burger",
+                "price": 10.0,
+                "quantity": 2,
+                "subtotalCents": 2000,
+                "stationTags": ["grill"],
+            }
+        ],
+        "status": status,
+        "subtotalCents": 2000,
+        "taxCents": 160,
+        "totalCents": 2160,
+        "createdAt": now - timedelta(hours=1) + timedelta(seconds=int(order_id[-1])),
+        "updatedAt": now - age,
+    }
+
+
+@pytest.fixture
+def board():
+    board = ActiveOrderBoard()
+    board.ready = True
+    return board
+
+
+def test_board_keeps_open_orders_only(board):
+    """Test delivered and cancelled orders leave the board"""
+    board.apply(order("ORD-1"))
+    board.apply(order("ORD-2", "order_accepted"))
+    board.apply(order("ORD-3", "order_delivered"))
+    board.apply(order("ORD-1", "order_cancelled", age=timedelta(seconds=-1)))
+
+    assert [record.order_id for record in board.orders("r1", "l1")] == ["ORD-2"]
+    assert len(board) == 1
+
+
+def test_board_records_summaries(board):
+    """Test records carry the kitchen fields and the encoded response"""
+    board.apply(order("ORD-1"))
+
+    record = board.orders("r1", "l1")[0]
+
+    assert record.station_tags == ("grill",)
+    assert (record.items[0].name, record.items[0].quantity) == ("Burger", 2)
+    response = OrderResponse.model_validate_json(record.encoded)
+    assert response.orderId == "ORD-1"
+    assert json.loads(record.view)["orderCode"] == "ORD-1"
+
+
+def test_board_ignores_older_writes(board):
+    """Test an out-of-order older write does not reopen an order"""
+    board.apply(order("ORD-1", "order_accepted"))
+    board.apply(order("ORD-1", "order_created", age=timedelta(minutes=5)))
+
+    assert board.orders("r1", "l1")[0].status == "order_accepted"
+
+
+def test_board_filters_by_location_and_status(board):
+    """Test orders are listed per location, newest first"""
+    board.apply(order("ORD-1"))
+    board.apply(order("ORD-2"))
+    board.apply(order("ORD-3", "order_accepted"))
+    board.apply(order("ORD-4", location_id="l2"))
+
+    assert [r.order_id for r in board.orders("r1", "l1")] == ["ORD-3", "ORD-2", "ORD-1"]
+    created = board.orders("r1", "l1", OrderStatus.ORDER_CREATED)
+    assert [r.order_id for r in created] == ["ORD-2", "ORD-1"]
+    assert [r.order_id for r in board.orders("r1", "l2")] == ["ORD-4"]
+    assert board.orders("r1", "l3") == []
+
+
+def test_board_ignores_writes_until_warmed():
+    """Test a board that was never warmed does not serve partial data"""
+    board = ActiveOrderBoard()
+    board.apply(order("ORD-1"))
+
+    assert not board.ready
+    assert board.orders("r1", "l1") == []
+
+
+@pytest.mark.asyncio
+async def test_warm_replays_writes_seen_while_loading():
+    """Test a status change during warm-up is not overwritten by the load"""
+    board = ActiveOrderBoard()
+    repository = MagicMock()
+
+    async def find_open_orders():
+        # The order is delivered while the warm-up query runs
+        board.apply(order("ORD-1", "order_delivered"))
+        return [order("ORD-1", age=timedelta(seconds=1)), order("ORD-2")]
+
+    repository.find_open_orders = AsyncMock(side_effect=find_open_orders)
+
+    await board.warm(repository)
+
+    assert board.ready
+    assert [record.order_id for record in board.orders("r1", "l1")] == ["ORD-2"]
+
+
+def test_board_keeps_orders_without_origin_or_customer(board):
+    """Test orders checked out from bare previews stay on the board"""
+    placed = order("ORD-1")
+    placed.update(origin=None, customer=None)
+
+    board.apply(placed)
+
+    record = board.orders("r1", "l1")[0]
+    assert record.order_id == "ORD-1"
+    assert json.loads(record.view)["orderCode"] == "ORD-1"
+    assert OrderResponse.model_validate_json(record.encoded).origin is None
+
+
+def test_board_keeps_orders_that_do_not_encode_as_responses(board):
+    """Test an open order is listed in kitchen views even when OrderResponse rejects it"""
+    legacy = order("ORD-1")
+    del legacy["locationSlug"]
+
+    board.apply(legacy)
+
+    record = board.orders("r1", "l1")[0]
+    assert record.encoded is None
+    assert json.loads(record.view)["orderCode"] == "ORD-1"
+
+
+def test_board_keeps_orders_with_missing_fields(board):
+    """Test sparse legacy documents still get a record"""
+    sparse = order("ORD-1")
+    del sparse["createdAt"]
+    sparse["items"] = None
+
+    board.apply(sparse)
+
+    record = board.orders("r1", "l1")[0]
+    assert record.created_at == sparse["updatedAt"]
+    assert record.items == ()
+
+
+@pytest.mark.asyncio
+async def test_warm_survives_a_broken_document(monkeypatch):
+    """Test one unreadable order does not leave the board disabled"""
+    board = ActiveOrderBoard()
+    real = ActiveOrder
+
+    def active_order(document):
+        if document["orderId"] == "ORD-1":
+            raise RuntimeError("corrupt document")
+        return real(document)
+
+    monkeypatch.setattr("app.services.active_orders.ActiveOrder", active_order)
+    repository = MagicMock()
+    repository.find_open_orders = AsyncMock(return_value=[order("ORD-1"), order("ORD-2")])
+
+    await board.warm(repository)
+
+    assert board.ready
+    assert [record.order_id for record in board.orders("r1", "l1")] == ["ORD-2"]
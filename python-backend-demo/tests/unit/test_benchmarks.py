@@ -0,0 +1,24 @@
+"""Unit tests for the benchmark statistics"""
+
+from benchmarks.loadgen import percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    """Test percentiles pick the nearest-rank sample"""
+    values = [i / 1000 for i in range(1, 101)]
+
+    assert percentile(values, 0.50) == 0.050
+    assert percentile(values, 0.95) == 0.095
+    assert percentile(values, 0.99) == 0.099
+    assert percentile([], 0.99) == 0.0
+
+
+def test_summarize_reports_milliseconds_and_throughput():
+    """Test the scenario summary units"""
+    summary = summarize([0.002, 0.001, 0.003, 0.004], errors=1, elapsed=2.0)
+
+    assert summary["requests"] == 4
+    assert summary["errors"] == 1
+    assert summary["throughputRps"] == 2.0
+    assert summary["p50Ms"] == 2.0
+    assert summary["maxMs"] == 4.0
@@ -0,0 +1,70 @@
+"""Unit tests for the in-process TTL cache"""
+
+from app.core.cache import TTLCache
+
+
+def test_lru_eviction():
+    """Test least recently used entries are evicted when full"""
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_expired_entries_are_misses():
+    """Test entries past their TTL are not served"""
+    cache = TTLCache("test", maxsize=2, ttl=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.misses == 1
+
+
+def test_stale_version_is_discarded():
+    """Test a load that raced with an invalidation is not stored"""
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    version = cache.version("a")
+    cache.invalidate("a")
+    cache.set("a", "stale", version=version)
+
+    assert cache.get("a") is None
+
+    cache.set("a", "fresh", version=cache.version("a"))
+    assert cache.get("a") == "fresh"
+
+
+def test_invalidation_stamps_are_bounded():
+    """Test invalidated keys are not tracked forever and races stay detected"""
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    version = cache.version("a")
+    cache.invalidate("a")
+    for key in range(100):
+        cache.invalidate(key)
+    cache.set("a", "stale", version=version)
+
+    assert len(cache._invalidated) == 2
+    assert cache.get("a") is None
+
+    other = cache.version("b")
+    cache.invalidate("c")
+    cache.set("b", "fresh", version=other)
+    assert cache.get("b") == "fresh"
+
+
+def test_stats():
+    """Test counters are reported"""
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hitRatio"] == 0.5
@@ -0,0 +1,102 @@
+"""Unit tests for the Socket.IO event bus"""
+
+import asyncio
+
+import pytest
+
+from app.core.event_bus import EventBus
+
+
+class RecordingEmitter:
+    """Collects emitted events, optionally blocking until released"""
+
+    def __init__(self):
+        self.emitted = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, event, data, rooms):
+        await self.release.wait()
+        self.emitted.append((event, data, rooms))
+
+
+def make_bus(emitter, maxsize=100, publish_timeout=0.01):
+    return EventBus(
+        emitter,
+        maxsize=maxsize,
+        batch_size=50,
+        coalesce_window=0.001,
+        publish_timeout=publish_timeout,
+    )
+
+
+@pytest.mark.asyncio
+async def test_emits_inline_when_not_started():
+    """Test events are delivered directly without a dispatcher"""
+    # Arrange
+    emitter = RecordingEmitter()
+    bus = make_bus(emitter)
+
+    # Act
+    await bus.publish("order_accepted", {"orderId": "ORD-1"}, rooms=["ORD-1", "rest-1"])
+
+    # Assert
+    assert emitter.emitted == [("order_accepted", {"orderId": "ORD-1"}, ["ORD-1", "rest-1"])]
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_coalesces_duplicate_events():
+    """Test a burst of identical events is emitted once, with the latest payload"""
+    # Arrange
+    emitter = RecordingEmitter()
+    bus = make_bus(emitter)
+    bus.start()
+
+    # Act
+    for i in range(3):
+        await bus.publish("order_accepted", {"orderId": "ORD-1", "n": i}, rooms=["ORD-1", "rest-1"])
+    await bus.publish("order_completed", {"orderId": "ORD-1"}, rooms=["ORD-1", "rest-1"])
+    await bus.stop()
+
+    # Assert
+    assert emitter.emitted == [
+        ("order_accepted", {"orderId": "ORD-1", "n": 2}, ["ORD-1", "rest-1"]),
+        ("order_completed", {"orderId": "ORD-1"}, ["ORD-1", "rest-1"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_after_timeout():
+    """Test publishers wait briefly for space, then drop the event"""
+    # Arrange - the dispatcher is stuck emitting the first event
+    emitter = RecordingEmitter()
+    emitter.release.clear()
+    bus = make_bus(emitter, maxsize=1)
+    bus.start()
+    await bus.publish("order_accepted", {"orderId": "ORD-1"}, rooms=["ORD-1"])
+    await asyncio.sleep(0.01)
+    await bus.publish("order_accepted", {"orderId": "ORD-2"}, rooms=["ORD-2"])
+
+    # Act
+    accepted = await bus.publish("order_accepted", {"orderId": "ORD-3"}, rooms=["ORD-3"])
+    emitter.release.set()
+    await bus.stop()
+
+    # Assert
+    assert accepted is False
+    assert [data["orderId"] for _, data, _ in emitter.emitted] == ["ORD-1", "ORD-2"]
+
+
+@pytest.mark.asyncio
+async def test_local_events_skip_the_pubsub_manager():
+    """Test local events are emitted with local=True"""
+    calls = []
+
+    async def emit(event, data, rooms, local=False):
+        calls.append((event, rooms, local))
+
+    bus = make_bus(emit)
+    await bus.publish("order_changed", {"orderId": "ORD-1"}, rooms=["r1_l1"], local=True)
+    await bus.publish("order_accepted", {"orderId": "ORD-1"}, rooms=["ORD-1"])
+
+    assert calls == [("order_changed", ["r1_l1"], True), ("order_accepted", ["ORD-1"], False)]
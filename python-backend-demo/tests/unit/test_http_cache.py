@@ -0,0 +1,58 @@
+"""Unit tests for pre-encoded HTTP payloads"""
+
+import gzip
+
+from starlette.requests import Request
+
+from app.core.http_cache import encode_payload, etag_matches, payload_response
+
+
+def make_request(headers: dict) -> Request:
+    """Build a bare request with the given headers"""
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+def test_etag_is_content_derived():
+    """Test equal bodies share an ETag and different bodies do not"""
+    assert encode_payload(b'{"a":1}').etag == encode_payload(b'{"a":1}').etag
+    assert encode_payload(b'{"a":1}').etag != encode_payload(b'{"a":2}').etag
+
+
+def test_etag_matches():
+    """Test If-None-Match parsing"""
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('"xyz", "abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"xyz"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_payload_response_not_modified():
+    """Test a matching If-None-Match gets 304 with no body"""
+    payload = encode_payload(b'{"data":[]}')
+    response = payload_response(make_request({"If-None-Match": payload.etag}), payload)
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == payload.etag
+
+
+def test_payload_response_gzip():
+    """Test gzip-capable clients get the pre-compressed body"""
+    body = b'{"data":"' + b"x" * 4096 + b'"}'
+    payload = encode_payload(body)
+    response = payload_response(make_request({"Accept-Encoding": "gzip, br"}), payload)
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(response.body) == body
+
+    plain = payload_response(make_request({}), payload)
+    assert plain.body == body
@@ -0,0 +1,41 @@
+"""Unit tests for index declarations"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.constants import Collections
+from app.core.indexes import INDEXES, QUERY_SHAPES, ensure_indexes
+
+
+def test_every_query_shape_has_a_usable_index():
+    """Test each query shape filters on the leading field of a declared index"""
+    for shape in QUERY_SHAPES:
+        assert shape.collection in INDEXES, f"No indexes declared for {shape.collection}"
+
+        leading_fields = {"_id"} | {
+            next(iter(index.document["key"])) for index in INDEXES[shape.collection]
+        }
+
+        assert leading_fields & shape.filter.keys(), shape.name
+
+
+@pytest.mark.asyncio
+async def test_ensure_indexes_unique_only():
+    """Test unique_only creates just the unique indexes, and the full run all of them"""
+    collections = {name: MagicMock(create_indexes=AsyncMock()) for name in INDEXES}
+    database = MagicMock()
+    database.__getitem__.side_effect = collections.__getitem__
+
+    await ensure_indexes(database, unique_only=True)
+
+    created = {
+        name: [index.document["name"] for index in collection.create_indexes.await_args.args[0]]
+        for name, collection in collections.items()
+        if collection.create_indexes.await_count
+    }
+    assert "previewOrderId_unique" in created[Collections.ORDERS]
+    assert all(name.endswith("_unique") for names in created.values() for name in names)
+
+    await ensure_indexes(database)
+    for name, collection in collections.items():
+        assert collection.create_indexes.await_args.args[0] == INDEXES[name]
@@ -0,0 +1,116 @@
+"""Unit tests for the logging pipeline"""
+
+import io
+import json
+import sys
+import time
+
+import pytest
+from loguru import logger
+
+from app.config import settings
+from app.core.logging import BatchedStream, request_log_filter, setup_logging
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts write calls"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        written = super().write(text)
+        self.writes += 1
+        return written
+
+
+@pytest.fixture
+def restore_logging():
+    yield
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+def test_batched_stream_writes_from_writer_thread():
+    """Test records are written in one call by the writer thread, not by write()"""
+    target = CountingStream()
+    stream = BatchedStream(target, max_bytes=1 << 20, interval=60)
+
+    for _ in range(5):
+        stream.write("0123456789\n")
+    assert target.writes == 0
+
+    stream.stop()
+    assert target.writes == 1
+    assert target.getvalue() == "0123456789\n" * 5
+
+
+def test_batched_stream_wakes_writer_when_full():
+    """Test a full batch is written without waiting for the interval"""
+    target = CountingStream()
+    stream = BatchedStream(target, max_bytes=20, interval=60)
+
+    stream.write("0123456789\n")
+    stream.write("0123456789\n")
+    deadline = time.monotonic() + 5
+    while not target.writes and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert target.getvalue() == "0123456789\n" * 2
+    stream.stop()
+
+
+def test_batched_stream_survives_a_closed_stream():
+    """Test the writer keeps draining batches after the target stream fails"""
+    target = io.StringIO()
+    stream = BatchedStream(target, max_bytes=10, interval=60)
+    target.close()
+
+    stream.write("0123456789\n")
+    deadline = time.monotonic() + 5
+    while stream._pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert stream._writer.is_alive()
+    stream.write("0123456789\n")
+    stream.stop()
+    assert stream._pending == []
+
+
+def test_request_log_filter_samples_only_info_request_lines():
+    """Test sampling drops INFO request lines and keeps everything else"""
+    keep = request_log_filter(0.0)
+
+    def record(level, message):
+        return {"level": type("Level", (), {"name": level}), "message": message}
+
+    assert keep(record("INFO", "GET /menus/r1/l1")) is False
+    assert keep(record("INFO", "Order ORD-1 created")) is True
+    assert keep(record("WARNING", "POST /orders - invalid menu item")) is True
+
+
+def test_setup_logging_writes_json_lines(monkeypatch, restore_logging):
+    """Test the queued, batched console sink writes one JSON object per record"""
+    monkeypatch.setattr(settings, "LOG_JSON", True)
+    monkeypatch.setattr(settings, "LOG_REQUEST_SAMPLE_RATE", 0.0)
+    target = io.StringIO()
+    setup_logging(target)
+
+    logger.info("GET /orders/ORD-1")
+    logger.bind(orderId="ORD-1").warning("Order {} is late", "ORD-1")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Failed")
+    logger.remove()  # drains the queue and flushes the batch
+
+    lines = [json.loads(line) for line in target.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == [
+        "Logging configured - Level: INFO",
+        "Order ORD-1 is late",
+        "Failed",
+    ]
+    assert lines[1]["level"] == "WARNING"
+    assert lines[1]["extra"] == {"orderId": "ORD-1"}
+    assert "ValueError: boom" in lines[2]["exception"]
@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 
 from app.services.menu_service import MenuService
+from app.core.cache import TTLCache
 from app.core.exceptions import NotFoundException
 
 
@@ -15,8 +16,12 @@ def mock_repository():
 
 @pytest.fixture
 def menu_service(mock_repository):
-    """Menu service with mocked repository"""
-    return MenuService(mock_repository)
+    """Menu service with mocked repository and an isolated cache"""
+    return MenuService(
+        mock_repository,
+        cache=TTLCache("test-menus", maxsize=8, ttl=60),
+        payload_cache=TTLCache("test-payloads", maxsize=8, ttl=60),
+    )
 
 
 @pytest.mark.asyncio
@@ -93,3 +98,53 @@ async def test_get_menus_by_location_empty(menu_service, mock_repository):
     # Assert
     assert result == []
     assert len(result) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_menu_served_from_cache(menu_service, mock_repository):
+    """Test repeat menu fetches skip the repository until invalidated"""
+    # Arrange
+    test_menu = {"_id": "menu1", "restaurantId": "rest1", "locationId": "loc1", "items": []}
+    mock_repository.find_by_id = AsyncMock(return_value=test_menu)
+
+    # Act
+    first = await menu_service.get_menu("rest1", "loc1", "menu1")
+    second = await menu_service.get_menu("rest1", "loc1", "menu1")
+
+    # Assert
+    assert first is second
+    assert mock_repository.find_by_id.call_count == 1
+    assert menu_service.cache.hits == 1
+    assert menu_service.cache.misses == 1
+
+    # Invalidation forces a reload
+    menu_service.cache.invalidate(("rest1", "loc1", "menu1"))
+    await menu_service.get_menu("rest1", "loc1", "menu1")
+    assert mock_repository.find_by_id.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_get_menu_payload_encoded_once(menu_service, mock_repository):
+    """Test the encoded menu body is reused across requests"""
+    # Arrange
+    test_menu = {
+        "_id": "menu1",
+        "restaurantId": "rest1",
+        "locationId": "loc1",
+        "menuSlug": "lunch",
+        "name": "Lunch",
+        "categories": [],
+        "items": [],
+        "salesTax": 0.08
+    }
+    mock_repository.find_by_id = AsyncMock(return_value=test_menu)
+
+    # Act
+    first = await menu_service.get_menu_payload("rest1", "loc1", "menu1")
+    second = await menu_service.get_menu_payload("rest1", "loc1", "menu1")
+
+    # Assert
+    assert first is second
+    assert first.etag.startswith('"')
+    assert b'"_id":"menu1"' in first.body
+    assert mock_repository.find_by_id.call_count == 1
@@ -0,0 +1,53 @@
+"""Unit tests for in-process metrics"""
+
+from app.core.metrics import Counter, Histogram, render_text
+
+
+def test_histogram_quantiles():
+    """Test quantiles resolve to bucket upper bounds"""
+    histogram = Histogram("test_latency_seconds", "test", buckets=(0.01, 0.1, 1.0))
+    for _ in range(98):
+        histogram.observe(0.005)
+    histogram.observe(0.05)
+    histogram.observe(5.0)
+
+    assert histogram.count() == 100
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(0.99) == 0.1
+    assert histogram.quantile(1.0) == float("inf")
+
+
+def test_counter_labels():
+    """Test counters keep separate values per label set"""
+    counter = Counter("test_total", "test", labelnames=("route",))
+    counter.inc(route="/a")
+    counter.inc(2, route="/a")
+    counter.inc(route="/b")
+
+    assert counter.values[("/a",)] == 3
+    assert counter.values[("/b",)] == 1
+
+
+def test_render_text_prometheus_format():
+    """Test the exporter writes cumulative buckets, sum and count per label set"""
+    counter = Counter("test_render_total", "Things \\ counted", labelnames=("route",))
+    counter.inc(3, route='/a"b')
+    histogram = Histogram("test_render_seconds", "test", labelnames=("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5.0, route="/a")
+
+    text = render_text([counter, histogram])
+
+    assert text.splitlines() == [
+        "# HELP test_render_total Things \\\\ counted",
+        "# TYPE test_render_total counter",
+        'test_render_total{route="/a\\"b"} 3',
+        "# HELP test_render_seconds test",
+        "# TYPE test_render_seconds histogram",
+        'test_render_seconds_bucket{route="/a",le="0.1"} 1',
+        'test_render_seconds_bucket{route="/a",le="1"} 2',
+        'test_render_seconds_bucket{route="/a",le="+Inf"} 3',
+        'test_render_seconds_sum{route="/a"} 5.55',
+        'test_render_seconds_count{route="/a"} 3',
+    ]
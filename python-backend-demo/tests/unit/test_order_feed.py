@@ -0,0 +1,222 @@
+"""Unit tests for the order change feed"""
+
+import asyncio
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import AutoReconnect, OperationFailure
+from socketio import packet
+
+from app.services.order_feed import CHANGE_STREAMS_UNSUPPORTED, LocationBoard, OrderFeed
+
+UTC = ZoneInfo("UTC")
+
+
+def order(order_id: str, status: str = "order_created", age: timedelta = timedelta(0)) -> dict:
+    """An order of today at location r1/l1, written `age` ago"""
+    now = datetime.utcnow() - age
+    return {
+        "_id": f"id-{order_id}",
+        "orderId": order_id,
+        "restaurantId": "r1",
+        "locationId": "l1",
+        "status": status,
+        "items": [],
+        "createdAt": now,
+        "updatedAt": now,
+    }
+
+
+def loaded_board(*orders, max_changes: int = 100) -> LocationBoard:
+    board = LocationBoard("r1", "l1", UTC, max_changes)
+    board.load(list(orders))
+    return board
+
+
+def test_board_applies_newer_writes_only():
+    """Test an out-of-order older write does not overwrite the board"""
+    board = loaded_board(order("ORD-1"))
+    cursor = board.cursor
+
+    assert board.apply(order("ORD-1", "order_accepted")) is not None
+    assert board.apply(order("ORD-1", "order_created", age=timedelta(minutes=5))) is None
+
+    assert [view["status"] for view in board.snapshot()] == ["order_accepted"]
+    assert [view["orderCode"] for view in board.changes_since(cursor)] == ["ORD-1"]
+
+
+def test_board_ignores_orders_of_other_days():
+    """Test yesterday's orders never enter today's board"""
+    board = loaded_board()
+
+    assert board.apply(order("ORD-OLD", age=timedelta(days=2))) is None
+    assert board.snapshot() == []
+
+
+def test_board_cursor_requires_reset():
+    """Test unknown, foreign and too old cursors ask for a reset"""
+    board = loaded_board(max_changes=2)
+    first = board.cursor
+    for n in range(3):
+        board.apply(order(f"ORD-{n}"))
+
+    assert board.changes_since(board.cursor) == []
+    assert board.changes_since(None) is None
+    assert board.changes_since("other.1") is None
+    assert board.changes_since(f"{board.epoch}.99") is None
+    # Only the last two changes are retained
+    assert board.changes_since(first) is None
+    assert len(board.changes_since(f"{board.epoch}.1")) == 2
+
+
+def test_board_replays_changes_made_while_loading():
+    """Test a write during the initial load is not lost"""
+    board = LocationBoard("r1", "l1", UTC, 100)
+    board.apply(order("ORD-1", "order_accepted"))
+    board.load([order("ORD-1", age=timedelta(seconds=1))])
+
+    assert [view["status"] for view in board.snapshot()] == ["order_accepted"]
+
+
+@pytest.fixture
+def repository():
+    """Order repository mock for a standalone mongod"""
+    repo = MagicMock()
+    repo.restaurant_repo.find_location_timezone = AsyncMock(return_value=UTC)
+    repo.load_today_orders = AsyncMock(return_value=[order("ORD-1")])
+    repo.watch_changes.side_effect = OperationFailure(
+        "The $changeStream stage is only supported on replica sets",
+        code=CHANGE_STREAMS_UNSUPPORTED,
+    )
+    repo.find_updated_since = AsyncMock(return_value=[])
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_feed_polls_without_change_streams(repository):
+    """Test the polling fallback applies writes and notifies the location room"""
+    # Arrange
+    emit = AsyncMock()
+    feed = OrderFeed(max_locations=8, max_changes=100, poll_interval=0.01, emit=emit)
+    feed.start(repository)
+    board = await feed.board("r1", "l1")
+    cursor = board.cursor
+
+    # Act
+    repository.find_updated_since.return_value = [order("ORD-2")]
+    for _ in range(50):
+        if emit.await_count:
+            break
+        await asyncio.sleep(0.01)
+    await feed.stop()
+
+    # Assert
+    assert feed.mode == "poll"
+    assert [view["orderCode"] for view in board.changes_since(cursor)] == ["ORD-2"]
+    emit.assert_awaited_once()
+    restaurant_id, location_id, data = emit.await_args.args
+    assert (restaurant_id, location_id) == ("r1", "l1")
+    assert data["cursor"] == board.cursor
+    assert data["order"]["orderCode"] == "ORD-2"
+    repository.load_today_orders.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_feed_poll_overlaps_to_catch_late_commits(repository):
+    """Test a write stamped before the last poll's newest order is still applied, once"""
+    # Arrange
+    emit = AsyncMock()
+    feed = OrderFeed(max_locations=8, max_changes=100, poll_interval=0.01, emit=emit)
+    feed.start(repository)
+    board = await feed.board("r1", "l1")
+    newer = order("ORD-2")
+    late = {**order("ORD-3"), "updatedAt": newer["updatedAt"] - timedelta(milliseconds=5)}
+    repository.find_updated_since.side_effect = lambda since: [
+        o for o in polls[0] if o["updatedAt"] >= since
+    ]
+
+    # Act: ORD-3 commits only after the poll that returned ORD-2
+    polls = [[newer]]
+    await _wait_for(lambda: emit.await_count == 1)
+    polls[0] = [late, newer]
+    await _wait_for(lambda: emit.await_count == 2)
+    await asyncio.sleep(0.05)
+    await feed.stop()
+
+    # Assert
+    assert {"ORD-2", "ORD-3"} <= {view["orderCode"] for view in board.snapshot()}
+    assert emit.await_count == 2
+
+
+async def _wait_for(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+@pytest.mark.asyncio
+async def test_feed_evicts_least_recently_used_board(repository):
+    """Test the number of tracked locations is bounded"""
+    feed = OrderFeed(max_locations=1, max_changes=100, poll_interval=60)
+    feed._repository = repository
+
+    await feed.board("r1", "l1")
+    await feed.board("r1", "l2")
+    await feed.board("r1", "l2")
+
+    assert list(feed._boards) == [("r1", "l2")]
+    assert repository.load_today_orders.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_feed_passes_every_write_to_listeners():
+    """Test listeners see writes for locations without a board"""
+    feed = OrderFeed(max_locations=8, max_changes=100, poll_interval=60)
+    seen = []
+    feed.add_listener(seen.append)
+
+    await feed.apply(order("ORD-1"))
+
+    assert [o["orderId"] for o in seen] == ["ORD-1"]
+
+
+@pytest.mark.asyncio
+async def test_feed_pushes_json_safe_deltas():
+    """Test the pushed order encodes as a real Socket.IO packet (dates as ISO strings)"""
+    emit = AsyncMock()
+    feed = OrderFeed(max_locations=8, max_changes=100, poll_interval=60, emit=emit)
+    feed._boards[("r1", "l1")] = loaded_board()
+    written = order("ORD-1")
+    written["items"] = [
+        {"id": "i1", "name": "Burger", "startedAt": datetime.utcnow(), "completedAt": None}
+    ]
+
+    await feed.apply(written)
+
+    restaurant_id, location_id, data = emit.await_args.args
+    event = ["order_changed", {"restaurantId": restaurant_id, **data}]
+    encoded = packet.Packet(packet.EVENT, data=event).encode()
+    assert written["createdAt"].isoformat() in encoded
+    assert data["order"]["items"][0]["startedAt"] == written["items"][0]["startedAt"].isoformat()
+
+
+@pytest.mark.asyncio
+async def test_feed_retries_a_failed_board_load(repository):
+    """Test a database error during the first load is not served as an empty day"""
+    feed = OrderFeed(max_locations=8, max_changes=100, poll_interval=60)
+    feed._repository = repository
+    repository.load_today_orders.side_effect = [
+        AutoReconnect("primary stepped down"),
+        [order("ORD-1")],
+    ]
+
+    with pytest.raises(AutoReconnect):
+        await feed.board("r1", "l1")
+    assert ("r1", "l1") not in feed._boards
+
+    board = await feed.board("r1", "l1")
+    assert [view["orderCode"] for view in board.snapshot()] == ["ORD-1"]
@@ -0,0 +1,112 @@
+"""Unit tests for OrderRepository"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.config import settings
+from app.core.cache import preview_cache
+from app.models.schemas.order import OrderStatus
+from app.repositories.order_repository import OrderRepository, flush_preview_writes
+
+
+@pytest.fixture
+def collections():
+    """Mock collections keyed by name"""
+    return {}
+
+
+@pytest.fixture
+def order_repository(collections):
+    """Order repository over mocked collections"""
+    db = MagicMock()
+    db.__getitem__.side_effect = lambda name: collections.setdefault(name, MagicMock())
+    return OrderRepository(db)
+
+
+@pytest.fixture
+def in_memory_previews(monkeypatch):
+    """Enable the in-memory preview store for one test"""
+    monkeypatch.setattr(settings, "PREVIEW_STORE_IN_MEMORY", True)
+    preview_cache.clear()
+    yield
+    preview_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_in_memory_preview_round_trip(order_repository, in_memory_previews):
+    """Test previews are served from memory and written behind to MongoDB"""
+    # Arrange
+    preview_collection = order_repository.preview_collection
+    preview_collection.insert_one = AsyncMock()
+    preview_collection.find_one = AsyncMock()
+    preview_collection.delete_one = AsyncMock(return_value=MagicMock(deleted_count=1))
+
+    # Act
+    saved = await order_repository.save_preview_order({"previewOrderId": "PREV-1", "items": []})
+    found = await order_repository.find_preview_by_id("PREV-1")
+    await flush_preview_writes()
+
+    # Assert
+    assert found["_id"] == saved["_id"]
+    preview_collection.find_one.assert_not_called()
+    inserted = preview_collection.insert_one.call_args.args[0]
+    assert inserted["previewOrderId"] == "PREV-1"
+    assert "createdAt" in inserted
+
+    # Deleting drops the in-memory copy as well
+    await order_repository.delete_preview_order("PREV-1")
+    assert preview_cache.get("PREV-1") is None
+    preview_collection.delete_one.assert_called_once_with({"previewOrderId": "PREV-1"})
+
+
+@pytest.mark.asyncio
+async def test_create_order_for_preview_is_idempotent(order_repository):
+    """Test a repeated checkout returns the order stored for the preview"""
+    # Arrange
+    existing = {"_id": "abc", "orderId": "ORD-FIRST", "previewOrderId": "PREV-1"}
+    order_repository.collection.find_one_and_update = AsyncMock(return_value=existing)
+
+    # Act
+    order, created = await order_repository.create_order_for_preview("PREV-1", {"items": []})
+
+    # Assert
+    assert order["orderId"] == "ORD-FIRST"
+    assert created is False
+    query, update = order_repository.collection.find_one_and_update.call_args.args
+    assert query == {"previewOrderId": "PREV-1"}
+    assert update["$setOnInsert"]["previewOrderId"] == "PREV-1"
+    assert order_repository.collection.find_one_and_update.call_args.kwargs["upsert"] is True
+
+
+@pytest.mark.asyncio
+async def test_create_order_for_preview_inserts_once(order_repository):
+    """Test the upserted document is reported as created"""
+    # Arrange
+    async def upsert(query, update, **kwargs):
+        return {"_id": "abc", **update["$setOnInsert"]}
+
+    order_repository.collection.find_one_and_update = upsert
+
+    # Act
+    order, created = await order_repository.create_order_for_preview("PREV-2", {"items": []})
+
+    # Assert
+    assert created is True
+    assert order["status"] == "order_created"
+    assert order["orderId"].startswith("ORD-")
+
+
+@pytest.mark.asyncio
+async def test_update_status_filters_on_allowed_transitions(order_repository):
+    """Test the transition rule is part of the update filter"""
+    # Arrange
+    order_repository.collection.find_one_and_update = AsyncMock(return_value=None)
+
+    # Act
+    result = await order_repository.update_status("ORD-1", OrderStatus.READY_FOR_PICKUP)
+
+    # Assert
+    assert result is None
+    query, update = order_repository.collection.find_one_and_update.call_args.args
+    assert query == {"orderId": "ORD-1", "status": {"$in": [OrderStatus.ORDER_ACCEPTED]}}
+    assert "readyAt" in update["$set"]
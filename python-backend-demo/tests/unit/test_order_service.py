@@ -0,0 +1,239 @@
+"""Unit tests for OrderService checkout and status transitions"""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.exceptions import ConflictException, NotFoundException
+from app.models.schemas.order import OrderStatus, UpdateOrderStatusRequest
+from app.services.active_orders import ActiveOrderBoard
+from app.services.order_service import OrderService
+from tests.unit.test_active_orders import order as open_order
+
+
+@pytest.fixture
+def order_repo():
+    """Mock order repository holding one preview"""
+    repo = MagicMock()
+    repo.find_preview_by_id = AsyncMock(return_value={
+        "previewOrderId": "PREV-1",
+        "restaurantId": "r1",
+        "locationId": "l1",
+        "items": [],
+        "subtotalCents": 1000,
+        "taxCents": 80,
+        "totalPriceCents": 1080,
+    })
+    repo.find_by_preview_id = AsyncMock(return_value=None)
+    repo.claim_preview_checkout = AsyncMock(return_value=True)
+    repo.release_preview_checkout = AsyncMock()
+    repo.discard_preview_order = MagicMock()
+    return repo
+
+
+@pytest.fixture
+def order_service(order_repo):
+    """Order service over the mocked repository"""
+    return OrderService(order_repo, MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_checkout_preview_shares_concurrent_submissions(order_service, order_repo):
+    """Test a double tap runs a single checkout"""
+    # Arrange
+    async def create(preview_id, order_data):
+        await asyncio.sleep(0.01)
+        return {"orderId": "ORD-1", **order_data}, True
+
+    order_repo.create_order_for_preview = AsyncMock(side_effect=create)
+
+    # Act
+    first, second = await asyncio.gather(
+        order_service.checkout_preview("PREV-1", transaction_details={"paymentMethod": "cash"}),
+        order_service.checkout_preview("PREV-1", transaction_details={"paymentMethod": "cash"}),
+    )
+
+    # Assert
+    assert first["orderId"] == second["orderId"] == "ORD-1"
+    assert first["totalCents"] == 1080
+    order_repo.create_order_for_preview.assert_awaited_once()
+    order_repo.discard_preview_order.assert_called_once_with("PREV-1")
+
+
+@pytest.mark.asyncio
+async def test_checkout_preview_after_preview_is_gone(order_service, order_repo):
+    """Test a late retry returns the order created from the preview"""
+    # Arrange
+    order_repo.find_preview_by_id.return_value = None
+    order_repo.find_by_preview_id.return_value = {"orderId": "ORD-1"}
+    order_repo.create_order_for_preview = AsyncMock()
+
+    # Act
+    order = await order_service.checkout_preview("PREV-1")
+
+    # Assert
+    assert order["orderId"] == "ORD-1"
+    order_repo.create_order_for_preview.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_checkout_unknown_preview(order_service, order_repo):
+    """Test an unknown preview is a 404"""
+    order_repo.find_preview_by_id.return_value = None
+
+    with pytest.raises(NotFoundException):
+        await order_service.checkout_preview("PREV-404")
+
+
+@pytest.mark.asyncio
+async def test_update_order_status_uses_post_image(order_service, order_repo, monkeypatch):
+    """Test a transition is one update, with events and sales taken from its result"""
+    # Arrange
+    updated = {
+        "orderId": "ORD-1",
+        "restaurantId": "r1",
+        "status": OrderStatus.ORDER_DELIVERED,
+        "updatedAt": datetime(2024, 1, 1),
+    }
+    order_repo.update_status = AsyncMock(return_value=updated)
+    order_repo.find_by_id = AsyncMock()
+    order_service.report_repo = MagicMock(record_delivered_order=AsyncMock())
+    emit = AsyncMock()
+    monkeypatch.setattr("app.services.order_service.emit_order_completed", emit)
+
+    # Act
+    response = await order_service.update_order_status(
+        UpdateOrderStatusRequest(orderId="ORD-1", status=OrderStatus.ORDER_DELIVERED)
+    )
+
+    # Assert
+    assert response.status == OrderStatus.ORDER_DELIVERED
+    order_repo.find_by_id.assert_not_awaited()
+    order_service.report_repo.record_delivered_order.assert_awaited_once_with(updated)
+    assert emit.await_args.args[:2] == ("ORD-1", "r1")
+
+
+@pytest.mark.asyncio
+async def test_update_order_status_rejects_invalid_transition(order_service, order_repo):
+    """Test a refused transition is a conflict, and a missing order a 404"""
+    order_repo.update_status = AsyncMock(return_value=None)
+    order_repo.find_by_id = AsyncMock(
+        return_value={"orderId": "ORD-1", "status": "order_delivered"}
+    )
+    request = UpdateOrderStatusRequest(orderId="ORD-1", status=OrderStatus.ORDER_ACCEPTED)
+
+    with pytest.raises(ConflictException):
+        await order_service.update_order_status(request)
+
+    order_repo.find_by_id.return_value = None
+    with pytest.raises(NotFoundException):
+        await order_service.update_order_status(request)
+
+
+@pytest.mark.asyncio
+async def test_open_orders_are_served_from_the_board(order_service, order_repo, monkeypatch):
+    """Test open statuses skip MongoDB once the board is warm, other filters don't"""
+    # Arrange
+    board = ActiveOrderBoard()
+    board.ready = True
+    board.apply(open_order("ORD-1"))
+    monkeypatch.setattr("app.services.order_service.active_order_board", board)
+    order_repo.find_by_restaurant_and_location = AsyncMock(return_value=[])
+
+    # Act
+    open_orders = await order_service.get_restaurant_orders("r1", "l1", OrderStatus.ORDER_CREATED)
+    delivered = await order_service.get_restaurant_orders("r1", "l1", OrderStatus.ORDER_DELIVERED)
+    chunks = [
+        chunk
+        async for chunk in order_service.stream_restaurant_orders(
+            "r1", "l1", OrderStatus.ORDER_CREATED
+        )
+    ]
+
+    # Assert
+    assert [o.orderId for o in open_orders] == ["ORD-1"]
+    assert delivered == []
+    order_repo.find_by_restaurant_and_location.assert_awaited_once()
+    body = json.loads(b"".join(chunks))
+    assert body["success"] is True
+    assert [o["orderId"] for o in body["data"]] == ["ORD-1"]
+
+
+@pytest.mark.asyncio
+async def test_checkout_preview_charges_only_new_orders(order_service, order_repo):
+    """Test the payment is taken once, after the preview is found, and stored on the order"""
+    # Arrange
+    async def create(preview_id, order_data):
+        await asyncio.sleep(0.01)
+        return {"orderId": "ORD-1", **order_data}, True
+
+    order_repo.create_order_for_preview = AsyncMock(side_effect=create)
+    charge = AsyncMock(return_value={"transactionId": "PAY-1", "status": "Approved"})
+
+    # Act
+    first, second = await asyncio.gather(
+        order_service.checkout_preview("PREV-1", charge=charge),
+        order_service.checkout_preview("PREV-1", charge=charge),
+    )
+
+    # Assert
+    charge.assert_awaited_once()
+    assert charge.await_args.args[0] == "PREV-1"
+    assert first["paymentId"] == second["paymentId"] == "PAY-1"
+    assert first["transactionDetails"]["status"] == "Approved"
+
+
+@pytest.mark.asyncio
+async def test_checkout_preview_does_not_charge_unknown_or_placed_previews(
+    order_service, order_repo
+):
+    """Test an unknown preview is a 404 and an existing order is returned, both without charging"""
+    charge = AsyncMock()
+    order_repo.create_order_for_preview = AsyncMock()
+
+    # The preview's order already exists, the preview is not deleted yet
+    order_repo.find_by_preview_id.return_value = {"orderId": "ORD-1", "paymentId": "PAY-1"}
+    order = await order_service.checkout_preview("PREV-1", charge=charge)
+    assert order["paymentId"] == "PAY-1"
+
+    order_repo.find_preview_by_id.return_value = None
+    order_repo.find_by_preview_id.return_value = None
+    with pytest.raises(NotFoundException):
+        await order_service.checkout_preview("PREV-404", charge=charge)
+
+    charge.assert_not_awaited()
+    order_repo.create_order_for_preview.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_checkout_preview_claimed_by_another_worker(order_service, order_repo):
+    """Test a submission that loses the checkout claim is never charged"""
+    charge = AsyncMock()
+    order_repo.create_order_for_preview = AsyncMock()
+    order_repo.claim_preview_checkout.return_value = False
+
+    # Still charging elsewhere
+    with pytest.raises(ConflictException):
+        await order_service.checkout_preview("PREV-1", charge=charge)
+
+    # Finished elsewhere between our order lookup and the claim
+    order_repo.find_by_preview_id.side_effect = [None, {"orderId": "ORD-1"}]
+    order = await order_service.checkout_preview("PREV-1", charge=charge)
+
+    assert order["orderId"] == "ORD-1"
+    charge.assert_not_awaited()
+    order_repo.create_order_for_preview.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_checkout_preview_releases_claim_when_charge_fails(order_service, order_repo):
+    """Test a declined or failed payment lets the preview be paid for again"""
+    charge = AsyncMock(side_effect=RuntimeError("declined"))
+
+    with pytest.raises(RuntimeError):
+        await order_service.checkout_preview("PREV-1", charge=charge)
+
+    order_repo.release_preview_checkout.assert_awaited_once_with("PREV-1")
@@ -0,0 +1,132 @@
+"""Unit tests for the pricing engine"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.cache import TTLCache
+from app.core.exceptions import BadRequestException, NotFoundException
+from app.models.schemas.order import OrderItemInput
+from app.services.pricing import MenuPriceIndex, PricingEngine, price_cart, sales_tax_rate
+
+
+@pytest.fixture
+def menu():
+    """Menu with one item, a variant and a modifier with one free choice"""
+    return {
+        "_id": "menu-1",
+        "salesTax": 0.1,
+        "items": [
+            {
+                "id": "burger",
+                "priceCents": 1000,
+                "variants": [{"id": "large", "name": "Large", "priceCents": 200}],
+                "modifiers": [
+                    {
+                        "id": "toppings",
+                        "freeChoices": 1,
+                        "extraChoicePriceCents": 50,
+                        "options": [
+                            {"id": "cheese", "priceCents": 0},
+                            {"id": "bacon", "priceCents": 0},
+                        ],
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def line(**overrides) -> OrderItemInput:
+    """A burger line whose prices agree with the menu fixture"""
+    values = {
+        "id": "line-1",
+        "menuItemId": "burger",
+        "name": "Burger",
+        "price": 1000,
+        "quantity": 2,
+        "variants": [{"id": "large", "name": "Large", "priceCents": 200}],
+        "modifiers": [
+            {
+                "id": "toppings",
+                "name": "Toppings",
+                "options": [
+                    {"id": "cheese", "name": "Cheese", "priceCents": 0},
+                    {"id": "bacon", "name": "Bacon", "priceCents": 0},
+                ],
+            }
+        ],
+    }
+    values.update(overrides)
+    return OrderItemInput(**values)
+
+
+def test_price_cart_uses_menu_rules_and_tax(menu):
+    """Test the menu's free choices and sales tax are applied"""
+    cart = price_cart([line()], MenuPriceIndex.from_menu(menu), discount={"amountCents": 100})
+
+    # (1000 + 200 + one extra topping at 50) * 2
+    assert cart.item_subtotals == [2500]
+    assert cart.subtotal_cents == 2500
+    assert cart.tax_cents == 250
+    assert cart.discount_cents == 100
+    assert cart.total_cents == 2650
+
+
+def test_price_cart_without_menu_uses_client_prices():
+    """Test carts without a menu keep the client-priced behavior"""
+    cart = price_cart([line(price=500, modifiers=[])])
+
+    assert cart.subtotal_cents == (500 + 200) * 2
+    assert cart.tax_cents == int(1400 * 0.08)
+
+
+def test_price_cart_rejects_price_mismatch(menu):
+    """Test a tampered price is rejected with every problem listed"""
+    index = MenuPriceIndex.from_menu(menu)
+    items = [
+        line(price=1),
+        line(menuItemId="pizza"),
+        line(variants=[{"id": "huge", "name": "Huge", "priceCents": 0}]),
+    ]
+
+    with pytest.raises(BadRequestException) as error:
+        price_cart(items, index)
+
+    assert "burger' costs 1000, got 1" in error.value.detail
+    assert "'pizza' is not on the menu" in error.value.detail
+    assert "variant 'huge'" in error.value.detail
+
+
+def test_sales_tax_rate_accepts_percentages():
+    """Test menus storing a percentage and menus storing a fraction"""
+    assert sales_tax_rate(10.25) == pytest.approx(0.1025)
+    assert sales_tax_rate(0.08) == 0.08
+    assert sales_tax_rate(None) == 0.08
+
+
+@pytest.mark.asyncio
+async def test_pricing_engine_caches_index_per_menu(menu):
+    """Test the menu is read once until it is invalidated"""
+    menu_repo = MagicMock()
+    menu_repo.find_by_id = AsyncMock(return_value=menu)
+    cache = TTLCache("test-prices", maxsize=8, ttl=60)
+    engine = PricingEngine(menu_repo, cache=cache)
+
+    await engine.price("r1", "l1", "menu-1", [line()])
+    await engine.price("r1", "l1", "menu-1", [line()])
+    assert menu_repo.find_by_id.await_count == 1
+
+    cache.invalidate(("r1", "l1", "menu-1"))
+    await engine.price("r1", "l1", "menu-1", [line()])
+    assert menu_repo.find_by_id.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_pricing_engine_unknown_menu():
+    """Test a missing menu is a 404 rather than an unverified cart"""
+    menu_repo = MagicMock()
+    menu_repo.find_by_id = AsyncMock(return_value=None)
+    engine = PricingEngine(menu_repo, cache=TTLCache("test-prices", maxsize=8, ttl=60))
+
+    with pytest.raises(NotFoundException):
+        await engine.price("r1", "l1", "missing", [line()])
@@ -0,0 +1,207 @@
+"""Unit tests for the named repository projections"""
+
+from datetime import datetime
+from typing import Iterable, Set
+from zoneinfo import ZoneInfo
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.transformers import transform_restaurant_order
+from app.models.schemas.order import OrderResponse, OrderStatusResponse
+from app.repositories.menu_repository import MENU_PRICING_VIEW, MenuRepository
+from app.repositories.order_repository import (
+    ORDER_KITCHEN_VIEW,
+    ORDER_RECEIPT_VIEW,
+    ORDER_STATUS_VIEW,
+    OrderRepository,
+)
+from app.services.order_service import OrderService
+from app.services.pricing import MenuPriceIndex, PricingEngine
+
+
+class RecordingDict(dict):
+    """Dict that records the dotted path of every key read from it"""
+
+    def __init__(self, data: dict, seen: Set[str], prefix: str = ""):
+        super().__init__(data)
+        self._seen = seen
+        self._prefix = prefix
+
+    def _read(self, key, value):
+        path = f"{self._prefix}{key}"
+        self._seen.add(path)
+        if isinstance(value, dict):
+            return RecordingDict(value, self._seen, path + ".")
+        if isinstance(value, list):
+            return [
+                RecordingDict(v, self._seen, path + ".") if isinstance(v, dict) else v
+                for v in value
+            ]
+        return value
+
+    def __getitem__(self, key):
+        return self._read(key, super().__getitem__(key))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self._read(key, super().__getitem__(key))
+        self._seen.add(f"{self._prefix}{key}")
+        return default
+
+
+def uncovered(paths: Iterable[str], projection) -> Set[str]:
+    """Paths the projection would not return"""
+    return {
+        path
+        for path in paths
+        if path != "_id"
+        and not any(path == key or path.startswith(key + ".") for key in projection)
+    }
+
+
+ORDER = {
+    "_id": "abc",
+    "orderId": "ORD-1",
+    "restaurantId": "r1",
+    "locationId": "l1",
+    "locationSlug": "main",
+    "origin": {"id": "o1", "name": "Counter"},
+    "customer": {"name": "Ana", "phone": "+15550100"},
+    "items": [
+        {
+            "id": "i1",
+            "menuItemId": "m1",
+            "name": "Burger",
+            "price": 10.0,
+            "quantity": 1,
+            "subtotalCents": 1000,
+            "modifiers": [],
+            "variants": [],
+            "stationTags": ["grill"],
+        }
+    ],
+    "status": "order_created",
+    "subtotalCents": 1000,
+    "taxCents": 80,
+    "totalCents": 1080,
+    "paymentId": "pay-1",
+    "createdAt": datetime(2024, 1, 1, 12, 0),
+    "updatedAt": datetime(2024, 1, 1, 12, 0),
+}
+
+
+def test_status_view_covers_status_response():
+    """Test the status view holds every OrderStatusResponse field"""
+    assert uncovered(OrderStatusResponse.model_fields, ORDER_STATUS_VIEW) == set()
+
+
+def test_receipt_view_covers_order_response():
+    """Test the receipt view holds every OrderResponse field"""
+    fields = {field.alias or name for name, field in OrderResponse.model_fields.items()}
+    assert uncovered(fields, ORDER_RECEIPT_VIEW) == set()
+
+
+def test_kitchen_view_covers_restaurant_transform():
+    """Test the kitchen view holds what the restaurant app format and the order feed read"""
+    seen: Set[str] = set()
+    transform_restaurant_order(RecordingDict(ORDER, seen))
+
+    assert uncovered(seen, ORDER_KITCHEN_VIEW) == set()
+    # The order feed files and orders changes by these
+    filtered = {"restaurantId", "locationId", "createdAt", "updatedAt"}
+    assert uncovered(filtered, ORDER_KITCHEN_VIEW) == set()
+
+
+def test_pricing_view_covers_price_index():
+    """Test the pricing view holds every menu field the price index reads"""
+    menu = {
+        "_id": "menu-1",
+        "name": "Lunch",
+        "salesTax": 8.0,
+        "items": [
+            {
+                "id": "burger",
+                "name": "Burger",
+                "priceCents": 1000,
+                "variants": [{"id": "large", "priceCents": 200}],
+                "modifiers": [
+                    {
+                        "id": "toppings",
+                        "freeChoices": 1,
+                        "extraChoicePriceCents": 50,
+                        "options": [{"id": "cheese", "priceCents": 0}],
+                    }
+                ],
+            }
+        ],
+    }
+    seen: Set[str] = set()
+    MenuPriceIndex.from_menu(RecordingDict(menu, seen))
+
+    # Whole lists are read to iterate them; their elements' fields are listed too
+    lists = {"items", "items.variants", "items.modifiers", "items.modifiers.options"}
+    assert uncovered(seen - lists, MENU_PRICING_VIEW) == set()
+
+
+@pytest.fixture
+def db():
+    collections = {}
+    db = MagicMock()
+    db.__getitem__.side_effect = lambda name: collections.setdefault(name, MagicMock())
+    return db
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("projection", [ORDER_STATUS_VIEW, ORDER_KITCHEN_VIEW, ORDER_RECEIPT_VIEW])
+async def test_order_find_by_id_passes_projection(db, projection):
+    """Test find_by_id sends the projection to MongoDB"""
+    repository = OrderRepository(db)
+    repository.collection.find_one = AsyncMock(return_value={"_id": "abc", "orderId": "ORD-1"})
+
+    await repository.find_by_id("ORD-1", projection=projection)
+
+    repository.collection.find_one.assert_awaited_once_with({"orderId": "ORD-1"}, projection)
+
+
+@pytest.mark.asyncio
+async def test_find_today_orders_passes_projection(db):
+    """Test find_today_orders sends the projection to MongoDB"""
+    repository = OrderRepository(db)
+    repository.restaurant_repo.find_location_timezone = AsyncMock(return_value=ZoneInfo("UTC"))
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.__aiter__.return_value = iter([])
+    repository.collection.find = MagicMock(return_value=cursor)
+
+    await repository.find_today_orders("r1", "l1", projection=ORDER_KITCHEN_VIEW)
+
+    assert repository.collection.find.call_args.args[1] is ORDER_KITCHEN_VIEW
+
+
+@pytest.mark.asyncio
+async def test_menu_find_by_id_passes_projection(db):
+    """Test MenuRepository.find_by_id sends the projection to MongoDB"""
+    repository = MenuRepository(db)
+    repository.collection.find_one = AsyncMock(return_value=None)
+
+    await repository.find_by_id("r1", "l1", "menu-1", projection=MENU_PRICING_VIEW)
+
+    assert repository.collection.find_one.call_args.args[1] is MENU_PRICING_VIEW
+
+
+@pytest.mark.asyncio
+async def test_hot_reads_use_named_views():
+    """Test status polling and pricing read only their views"""
+    order_repo = MagicMock()
+    order_repo.find_by_id = AsyncMock(return_value=ORDER)
+    menu_repo = MagicMock()
+    menu_repo.find_by_id = AsyncMock(return_value={"_id": "menu-1", "items": []})
+
+    await OrderService(order_repo, menu_repo).get_order_status("ORD-1")
+    await PricingEngine(menu_repo, cache=MagicMock(get=MagicMock(return_value=None))).get_index(
+        "r1", "l1", "menu-1"
+    )
+
+    assert order_repo.find_by_id.await_args.kwargs["projection"] is ORDER_STATUS_VIEW
+    assert menu_repo.find_by_id.await_args.kwargs["projection"] is MENU_PRICING_VIEW
@@ -0,0 +1,58 @@
+"""Unit tests for the Socket.IO pub/sub client managers"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+import socketio
+
+from app.core.pubsub import LocalPubSubManager
+
+
+def make_worker(channel: str) -> socketio.AsyncServer:
+    """A Socket.IO server standing in for one uvicorn worker"""
+    server = socketio.AsyncServer(
+        async_mode="asgi", client_manager=LocalPubSubManager(channel=channel)
+    )
+    server.manager.initialize()
+    server.manager_initialized = True
+    server._send_eio_packet = AsyncMock()
+    return server
+
+
+@pytest.mark.asyncio
+async def test_emit_reaches_rooms_on_other_workers():
+    """Test an emit on one worker reaches order and location rooms on others"""
+    # Arrange - a dashboard on worker B, a mobile client on worker C
+    worker_a, worker_b, worker_c = (make_worker("test-rooms") for _ in range(3))
+    await asyncio.sleep(0)  # let the listeners subscribe
+
+    dashboard = await worker_b.manager.connect("eio-b", "/")
+    await worker_b.manager.enter_room(dashboard, "/", "rest-1_loc-1")
+    mobile = await worker_c.manager.connect("eio-c", "/")
+    await worker_c.manager.enter_room(mobile, "/", "ORD-1")
+
+    # Act
+    await worker_a.emit("order_accepted", {"orderId": "ORD-1"}, to=["ORD-1", "rest-1_loc-1"])
+    await asyncio.sleep(0.01)
+
+    # Assert
+    worker_a._send_eio_packet.assert_not_called()
+    assert worker_b._send_eio_packet.await_args.args[0] == "eio-b"
+    assert worker_c._send_eio_packet.await_args.args[0] == "eio-c"
+
+    for worker in (worker_a, worker_b, worker_c):
+        worker.manager.thread.cancel()
+
+
+@pytest.mark.asyncio
+async def test_payloads_must_be_json_serializable():
+    """Test the local broker rejects payloads a real backend could not carry"""
+    # Arrange
+    worker = make_worker("test-json")
+
+    # Act / Assert
+    with pytest.raises(TypeError):
+        await worker.emit("order_accepted", {"at": object()}, to="ORD-1")
+
+    worker.manager.thread.cancel()
@@ -0,0 +1,143 @@
+"""Unit tests for sales rollups and ReportService"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.cache import location_cache
+from app.repositories.report_repository import ReportRepository, RollupKind
+from app.services.report_service import ReportService
+
+
+@pytest.fixture
+def collections():
+    """Mock collections keyed by name"""
+    return {}
+
+
+@pytest.fixture
+def report_repository(collections):
+    """Report repository over mocked collections"""
+    location_cache.clear()
+    db = MagicMock()
+    db.__getitem__.side_effect = lambda name: collections.setdefault(name, MagicMock())
+    repository = ReportRepository(db)
+    repository.locations_collection.find_one = AsyncMock(
+        return_value={"_id": "loc-1", "restaurantId": "rest-1", "timezone": "America/New_York"}
+    )
+    repository.collection.bulk_write = AsyncMock()
+    return repository
+
+
+@pytest.mark.asyncio
+async def test_record_delivered_order_uses_local_day(report_repository):
+    """Test a delivered order increments day, item and origin rollups"""
+    # Arrange - 02:00 UTC is still the previous day in New York
+    order = {
+        "orderId": "ORD-1",
+        "restaurantId": "rest-1",
+        "locationId": "loc-1",
+        "endedAt": datetime(2024, 3, 2, 2, 0),
+        "totalCents": 2700,
+        "origin": {"id": "table-4", "name": "Table 4"},
+        "items": [
+            {"menuItemId": "burger", "name": "Burger", "price": 1000},
+            {"menuItemId": "burger", "name": "Burger", "price": 1000},
+            {"menuItemId": "fries", "name": "Fries", "price": 500},
+        ],
+    }
+
+    # Act
+    await report_repository.record_delivered_order(order)
+
+    # Assert
+    operations = report_repository.collection.bulk_write.call_args.args[0]
+    updates = {op._filter["_id"]: op._doc["$inc"] for op in operations}
+    assert updates == {
+        "day|rest-1|loc-1|2024-03-01|": {"grossSalesCents": 2700, "orderCount": 1},
+        "item|rest-1|loc-1|2024-03-01|burger": {"soldCount": 2, "grossSalesCents": 2000},
+        "item|rest-1|loc-1|2024-03-01|fries": {"soldCount": 1, "grossSalesCents": 500},
+        "origin|rest-1|loc-1|2024-03-01|table-4": {"soldCount": 3, "grossSalesCents": 2700},
+    }
+    assert all(op._upsert for op in operations)
+
+
+@pytest.mark.asyncio
+async def test_sales_summary_fills_missing_days(report_repository):
+    """Test the summary covers every day and applies the tax formula"""
+    # Arrange
+    service = ReportService(report_repository)
+    tz = await report_repository.find_timezone("rest-1", "loc-1")
+    today = datetime.now(tz=tz).strftime("%Y-%m-%d")
+    report_repository.find_days = AsyncMock(
+        return_value=[{"kind": RollupKind.DAY, "date": today, "grossSalesCents": 10800}]
+    )
+
+    # Act
+    summary = await service.get_sales_summary("rest-1", "loc-1", days=3)
+
+    # Assert
+    assert len(summary) == 3
+    assert summary[0] == {"date": summary[0]["date"], "grossSales": 0, "tax": 0}
+    assert summary[-1]["date"] == today
+    assert summary[-1]["grossSales"] == 108.0
+    assert summary[-1]["tax"] == pytest.approx(8.0)
+
+
+class AsyncIter:
+    """Async iterator over a list, standing in for a Motor cursor"""
+
+    def __init__(self, items):
+        self.items = list(items)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.items:
+            raise StopAsyncIteration
+        return self.items.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_rebuild_swaps_in_staged_rollups(report_repository, collections):
+    """Test live rollups are only touched after the staging build, never emptied first"""
+    # Arrange
+    calls = []
+    report_repository.collection.name = "sales_rollups"
+    report_repository.orders_collection.aggregate = MagicMock(
+        side_effect=lambda pipeline: (
+            calls.append(("aggregate", pipeline[-1]["$merge"]["into"])) or AsyncIter([])
+        )
+    )
+    staged = {"_id": "day|rest-1|loc-1|2024-01-01|", "kind": RollupKind.DAY, "grossSalesCents": 500}
+    report_repository.collection.bulk_write = AsyncMock(
+        side_effect=lambda ops, **kw: calls.append(("swap", len(ops)))
+    )
+    report_repository.collection.delete_many = AsyncMock(
+        side_effect=lambda query: calls.append(("delete", query))
+    )
+
+    def staging_collection(name):
+        if name.startswith("sales_rollups_rebuild_"):
+            staging = collections.setdefault(name, MagicMock())
+            staging.name = name
+            staging.find = MagicMock(return_value=AsyncIter([staged]))
+            staging.drop = AsyncMock(side_effect=lambda: calls.append(("drop", name)))
+            return staging
+        return collections.setdefault(name, MagicMock())
+
+    report_repository.db.__getitem__.side_effect = staging_collection
+
+    # Act
+    await report_repository._rebuild_location("rest-1", "loc-1", "UTC")
+
+    # Assert
+    staging_name = calls[0][1]
+    assert staging_name.startswith("sales_rollups_rebuild_")
+    assert [c[0] for c in calls] == [
+        "aggregate", "aggregate", "aggregate", "swap", "delete", "drop"
+    ]
+    assert all(c[1] == staging_name for c in calls[:3])
+    delete_query = calls[4][1]
+    assert delete_query["restaurantId"] == "rest-1" and "$ne" in delete_query["rebuildId"]
@@ -0,0 +1,81 @@
+"""Unit tests for the per-route request metrics middleware"""
+
+import contextvars
+from types import SimpleNamespace
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.core.mongo_monitoring import CommandMetricsListener, request_timer
+from app.core.request_metrics import (
+    UNMATCHED_ROUTE,
+    RequestMetricsMiddleware,
+    request_mongo_seconds,
+    request_seconds,
+    requests_in_flight,
+    response_size_bytes,
+)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(RequestMetricsMiddleware)
+    listener = CommandMetricsListener()
+
+    @app.get("/metrics-test/orders/{order_id}")
+    async def get_order(order_id: str):
+        # Stands in for two driver round trips
+        for micros in (2000, 3000):
+            listener.succeeded(SimpleNamespace(duration_micros=micros, command_name="find"))
+        return Response(content=b"x" * 120, media_type="application/json")
+
+    @app.get("/metrics-test/fail")
+    async def fail():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_records_route_template_size_and_mongo_time():
+    """Test requests are labelled by route template with their Mongo time and body size"""
+    client = TestClient(build_app())
+    route = "/metrics-test/orders/{order_id}"
+    before = request_seconds.count(method="GET", route=route, status="200")
+
+    client.get("/metrics-test/orders/ORD-1")
+    client.get("/metrics-test/orders/ORD-2")
+
+    assert request_seconds.count(method="GET", route=route, status="200") == before + 2
+    assert ("GET", "/metrics-test/orders/ORD-1", "200") not in request_seconds.values
+    counts, total = request_mongo_seconds.values[("GET", route)]
+    assert round(total, 6) >= 0.01
+    assert response_size_bytes.values[("GET", route)][1] >= 240
+    assert requests_in_flight.values[("GET",)] == 0
+
+
+def test_unmatched_and_failed_requests():
+    """Test 404s share one label and unhandled errors count as 500s"""
+    client = TestClient(build_app(), raise_server_exceptions=False)
+    unmatched = request_seconds.count(method="GET", route=UNMATCHED_ROUTE, status="404")
+    failed = request_seconds.count(method="GET", route="/metrics-test/fail", status="500")
+
+    client.get("/metrics-test/nope/1")
+    client.get("/metrics-test/fail")
+
+    assert request_seconds.count(method="GET", route=UNMATCHED_ROUTE, status="404") == unmatched + 1
+    failures = request_seconds.count(method="GET", route="/metrics-test/fail", status="500")
+    assert failures == failed + 1
+    assert requests_in_flight.values[("GET",)] == 0
+
+
+def test_request_timer_sees_commands_from_copied_context():
+    """Test commands run in a copied context (as Motor's executor does) add to the request"""
+    listener = CommandMetricsListener()
+    event = SimpleNamespace(duration_micros=1500, command_name="find")
+
+    with request_timer() as mongo_seconds:
+        contextvars.copy_context().run(listener.succeeded, event)
+    # Outside a request there is nothing to add to
+    listener.succeeded(event)
+
+    assert mongo_seconds[0] == 0.0015
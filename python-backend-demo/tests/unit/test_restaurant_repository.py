@@ -0,0 +1,53 @@
+"""Unit tests for RestaurantRepository location metadata caching"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.cache import location_cache
+from app.repositories.restaurant_repository import RestaurantRepository, resolve_timezone
+
+
+@pytest.fixture
+def restaurant_repository():
+    """Restaurant repository over a mocked locations collection"""
+    location_cache.clear()
+    db = MagicMock()
+    repository = RestaurantRepository(db)
+    repository.locations_collection = MagicMock()
+    repository.locations_collection.find_one = AsyncMock(return_value={
+        "_id": "loc-1",
+        "restaurantId": "rest-1",
+        "timezone": "America/Chicago",
+    })
+    yield repository
+    location_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_location_served_from_cache_until_invalidated(restaurant_repository):
+    """Test repeated lookups share one query and invalidation reloads"""
+    # Act
+    first = await restaurant_repository.find_location_timezone("rest-1", "loc-1")
+    second = await restaurant_repository.find_location_timezone("rest-1", "loc-1")
+    restaurant_repository.invalidate_location("loc-1")
+    await restaurant_repository.find_location_by_id("rest-1", "loc-1")
+
+    # Assert
+    assert first is second is resolve_timezone("America/Chicago")
+    assert restaurant_repository.locations_collection.find_one.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_location_of_other_restaurant_is_not_returned(restaurant_repository):
+    """Test the restaurant scoped lookup rejects a foreign location"""
+    # Act
+    location = await restaurant_repository.find_restaurant_location("rest-2", "loc-1")
+
+    # Assert
+    assert location is None
+
+
+def test_invalid_timezone_falls_back_to_utc():
+    """Test an unknown timezone name resolves to UTC"""
+    assert resolve_timezone("Not/AZone").key == "UTC"
+    assert resolve_timezone(None).key == "UTC"
@@ -0,0 +1,86 @@
+"""Unit tests for the production launcher and per-worker resources"""
+
+import os
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.config import settings
+from app.core import database
+from app.core.socketio import disconnect_all_clients, sio
+
+
+@pytest.mark.asyncio
+async def test_connect_to_mongo_replaces_inherited_client(monkeypatch):
+    """Test a worker never reuses a client created by its parent process"""
+    created = []
+
+    def client_factory(*args, **kwargs):
+        client = MagicMock()
+        client.admin.command = AsyncMock()
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(database, "AsyncIOMotorClient", client_factory)
+    inherited = MagicMock()
+    monkeypatch.setattr(database.db, "client", inherited)
+    monkeypatch.setattr(database.db, "db", MagicMock())
+    monkeypatch.setattr(database.db, "pid", os.getpid() + 1)
+
+    await database.connect_to_mongo()
+
+    assert database.db.client is created[0]
+    assert database.db.pid == os.getpid()
+    inherited.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_all_clients(monkeypatch):
+    """Test shutdown closes every Socket.IO session and stops background tasks"""
+    monkeypatch.setattr(sio.eio, "sockets", {"a": MagicMock(), "b": MagicMock()})
+    monkeypatch.setattr(sio.eio, "disconnect", AsyncMock())
+    monkeypatch.setattr(sio, "shutdown", AsyncMock())
+
+    await disconnect_all_clients()
+
+    sio.eio.disconnect.assert_awaited_once_with()
+    sio.shutdown.assert_awaited_once()
+
+
+def test_server_config_from_settings(monkeypatch):
+    """Test worker count and tuning come from settings"""
+    pytest.importorskip("uvicorn")
+    from app.server import available_cpus, server_config
+
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "SERVER_KEEPALIVE_SECONDS", 75)
+    config = server_config()
+
+    assert config.workers == 1
+    assert config.timeout_keep_alive == 75
+    assert config.backlog == settings.SERVER_BACKLOG
+
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 3)
+    assert server_config().workers == 3
+
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 0)
+    assert server_config().workers == available_cpus()
+
+
+def test_several_workers_require_shared_state(monkeypatch):
+    """Test the launcher refuses per-process Socket.IO rooms and previews with several workers"""
+    pytest.importorskip("uvicorn")
+    from app.server import check_worker_settings
+
+    monkeypatch.setattr(settings, "SOCKETIO_MANAGER", "memory")
+    monkeypatch.setattr(settings, "PREVIEW_STORE_IN_MEMORY", False)
+    check_worker_settings(1)
+    with pytest.raises(RuntimeError, match="SOCKETIO_MANAGER"):
+        check_worker_settings(2)
+
+    monkeypatch.setattr(settings, "SOCKETIO_MANAGER", "redis")
+    check_worker_settings(2)
+
+    monkeypatch.setattr(settings, "PREVIEW_STORE_IN_MEMORY", True)
+    with pytest.raises(RuntimeError, match="PREVIEW_STORE_IN_MEMORY"):
+        check_worker_settings(2)
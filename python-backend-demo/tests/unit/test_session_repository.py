@@ -0,0 +1,152 @@
+"""Unit tests for the cached session store"""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.config import settings
+from app.core.cache import session_cache
+from app.core.constants import Collections
+from app.core.indexes import INDEXES
+from app.repositories.session_repository import SessionRepository
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    session_cache.clear()
+    yield
+    session_cache.clear()
+
+
+@pytest.fixture
+def repository():
+    collection = MagicMock()
+    collection.update_one = AsyncMock()
+    collection.find_one = AsyncMock(return_value=None)
+    collection.delete_one = AsyncMock(return_value=MagicMock(deleted_count=1))
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return SessionRepository(db)
+
+
+def session(created_at: datetime) -> dict:
+    return {"sessionId": "s1", "userId": "u1", "phoneNumber": "+15550100", "createdAt": created_at}
+
+
+@pytest.mark.asyncio
+async def test_create_writes_created_at_as_date(repository):
+    """Test sessions are written with a BSON date the TTL index can expire"""
+    created = await repository.create("s1", "u1", "+15550100")
+
+    update = repository.collection.update_one.await_args.args[1]["$set"]
+    assert isinstance(update["createdAt"], datetime)
+    assert created["userId"] == "u1"
+
+
+@pytest.mark.asyncio
+async def test_find_reads_mongodb_once(repository):
+    """Test repeated lookups of a live session are served from the cache"""
+    repository.collection.find_one.return_value = session(datetime.utcnow())
+
+    first = await repository.find("s1")
+    second = await repository.find("s1")
+
+    assert first == second
+    assert first["userId"] == "u1"
+    repository.collection.find_one.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unknown_sessions_are_negatively_cached(repository):
+    """Test repeated lookups of an unknown id do not reach MongoDB"""
+    assert await repository.find("nope") is None
+    assert await repository.find("nope") is None
+
+    repository.collection.find_one.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_create_clears_negative_entry(repository):
+    """Test a session created after a failed lookup is found"""
+    await repository.find("s1")
+    await repository.create("s1", "u1", "+15550100")
+    repository.collection.find_one.return_value = session(datetime.utcnow())
+
+    assert (await repository.find("s1"))["userId"] == "u1"
+
+
+@pytest.mark.asyncio
+async def test_delete_invalidates_cached_session(repository):
+    """Test signing out stops the session verifying in this worker immediately"""
+    repository.collection.find_one.return_value = session(datetime.utcnow())
+    await repository.find("s1")
+
+    repository.collection.find_one.return_value = None
+    assert await repository.delete("s1") is True
+
+    assert await repository.find("s1") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_session_is_not_found(repository):
+    """Test sessions past SESSION_TTL_SECONDS are rejected before the TTL monitor runs"""
+    expired = datetime.utcnow() - timedelta(seconds=settings.SESSION_TTL_SECONDS + 1)
+    repository.collection.find_one.return_value = session(expired)
+
+    assert await repository.find("s1") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_entry_does_not_outlive_session(repository):
+    """Test a session about to expire is cached only until its expiry"""
+    almost = datetime.utcnow() - timedelta(seconds=settings.SESSION_TTL_SECONDS - 60)
+    repository.collection.find_one.return_value = session(almost)
+
+    await repository.find("s1")
+
+    _, expires_at, _ = session_cache._data["s1"]
+    assert expires_at - time.monotonic() <= 60
+
+
+@pytest.mark.asyncio
+async def test_cache_entry_does_not_outlive_access_token(repository, monkeypatch):
+    """Test a session is cached for at most one access token lifetime"""
+    monkeypatch.setattr(settings, "SESSION_CACHE_TTL_SECONDS", 3600.0)
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_TTL_SECONDS", 60)
+    repository.collection.find_one.return_value = session(datetime.utcnow())
+
+    await repository.find("s1")
+
+    _, expires_at, _ = session_cache._data["s1"]
+    assert expires_at - time.monotonic() <= 60
+
+
+@pytest.mark.asyncio
+async def test_uncached_find_sees_signout_on_another_worker(repository):
+    """Test cached=False reads the session even when this worker has it cached"""
+    repository.collection.find_one.return_value = session(datetime.utcnow())
+    assert await repository.find("s1") is not None
+
+    # Deleted by another worker: this worker's cache still has it
+    repository.collection.find_one.return_value = None
+    assert await repository.find("s1") is not None
+    assert await repository.find("s1", cached=False) is None
+    assert await repository.find("s1") is None
+
+
+def test_sessions_have_ttl_index():
+    """Test sessions expire via a TTL index on createdAt"""
+    ttl = [
+        index.document
+        for index in INDEXES[Collections.SESSIONS]
+        if "expireAfterSeconds" in index.document
+    ]
+    assert ttl == [
+        {
+            "key": {"createdAt": 1},
+            "name": "createdAt_ttl",
+            "expireAfterSeconds": settings.SESSION_TTL_SECONDS,
+        }
+    ]
@@ -0,0 +1,71 @@
+"""Unit tests for cold start: import footprint and lazy startup"""
+
+import asyncio
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+import app.main as main
+from app.config import settings
+
+# Optional or unused subsystems the API must not load at import time
+NOT_IMPORTED = (
+    "supertokens_python",
+    "app.core.supertokens",
+    "jose",
+    "uvicorn",
+    "pydantic.v1",
+)
+
+
+def test_import_does_not_load_optional_subsystems():
+    """Test importing the app leaves optional subsystems unloaded"""
+    code = (
+        "import sys, app.main; "
+        f"print('loaded: ' + ','.join(m for m in {NOT_IMPORTED!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    # Logging also writes to stdout, so pick out the line the check printed
+    loaded = [line for line in result.stdout.splitlines() if line.startswith("loaded:")]
+    assert loaded == ["loaded: "]
+
+
+@pytest.mark.asyncio
+async def test_lazy_startup_serves_before_indexes_are_ensured(monkeypatch):
+    """Test LAZY_STARTUP creates unique indexes first, the rest in a task cancelled on shutdown"""
+    unique_created = asyncio.Event()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_ensure_indexes(database, unique_only=False):
+        if unique_only:
+            unique_created.set()
+            return
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(settings, "LAZY_STARTUP", True)
+    monkeypatch.setattr(settings, "DB_ENSURE_INDEXES", True)
+    monkeypatch.setattr(settings, "DB_VERIFY_QUERY_PLANS", False)
+    monkeypatch.setattr(settings, "ORDER_FEED_ENABLED", False)
+    monkeypatch.setattr(main, "connect_to_mongo", AsyncMock())
+    monkeypatch.setattr(main, "close_mongo_connection", AsyncMock())
+    monkeypatch.setattr(main, "get_database", MagicMock())
+    monkeypatch.setattr(main, "ensure_indexes", slow_ensure_indexes)
+
+    async with asyncio.timeout(5):
+        async with main.lifespan(None):
+            # Serving: unique indexes exist, the rest are still being created
+            assert unique_created.is_set()
+            await started.wait()
+
+    assert cancelled.is_set()
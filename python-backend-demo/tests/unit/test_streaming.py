@@ -0,0 +1,115 @@
+"""Unit tests for streaming encoders and pagination cursors"""
+
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.core.exceptions import BadRequestException
+from app.core.streaming import (
+    decode_cursor,
+    dumps,
+    encode_cursor,
+    stream_json_array,
+    stream_ndjson,
+)
+
+
+async def batches_of(*batches):
+    """Async iterator over the given batches"""
+    for batch in batches:
+        yield batch
+
+
+async def collect(stream) -> bytes:
+    """Concatenate an async byte stream"""
+    return b"".join([chunk async for chunk in stream])
+
+
+@pytest.mark.asyncio
+async def test_stream_json_array_with_envelope():
+    """Test batches are joined into one valid JSON envelope"""
+    stream = stream_json_array(
+        batches_of([{"a": 1}, {"a": 2}], [], [{"a": 3}]),
+        dumps,
+        prefix=b'{"data":',
+        suffix=b',"success":true}',
+    )
+
+    body = json.loads(await collect(stream))
+
+    assert body == {"data": [{"a": 1}, {"a": 2}, {"a": 3}], "success": True}
+
+
+@pytest.mark.asyncio
+async def test_stream_json_array_empty():
+    """Test an empty result is still a JSON array"""
+    assert await collect(stream_json_array(batches_of(), dumps)) == b"[]"
+
+
+@pytest.mark.asyncio
+async def test_stream_ndjson():
+    """Test NDJSON emits one document per line"""
+    body = await collect(stream_ndjson(batches_of([{"a": 1}], [{"a": 2}]), dumps))
+
+    assert body.splitlines() == [b'{"a":1}', b'{"a":2}']
+
+
+def test_dumps_encodes_bson_types():
+    """Test datetimes and ObjectIds encode like FastAPI responses"""
+    oid = ObjectId()
+    body = json.loads(dumps({"_id": oid, "createdAt": datetime(2024, 5, 1, 12, 30)}))
+
+    assert body == {"_id": str(oid), "createdAt": "2024-05-01T12:30:00"}
+
+
+def test_cursor_round_trip():
+    """Test cursors decode back to the sort key"""
+    oid = ObjectId()
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000)
+
+    assert decode_cursor(encode_cursor(created_at, str(oid))) == (created_at, oid)
+
+
+def test_invalid_cursor():
+    """Test malformed cursors are rejected"""
+    with pytest.raises(BadRequestException):
+        decode_cursor("not-a-cursor")
+
+
+def failing_on(bad_value):
+    """Encoder that fails for one document"""
+    def encode(document):
+        if document["a"] == bad_value:
+            raise ValueError("legacy document")
+        return dumps(document)
+    return encode
+
+
+@pytest.mark.asyncio
+async def test_stream_skips_documents_that_fail_to_encode():
+    """Test one bad document is left out without cutting the list short"""
+    array = stream_json_array(batches_of([{"a": 1}, {"a": 2}], [{"a": 3}]), failing_on(2))
+    ndjson = stream_ndjson(batches_of([{"a": 1}, {"a": 2}], [{"a": 3}]), failing_on(2))
+
+    assert json.loads(await collect(array)) == [{"a": 1}, {"a": 3}]
+    assert (await collect(ndjson)).splitlines() == [b'{"a":1}', b'{"a":3}']
+
+
+@pytest.mark.asyncio
+async def test_stream_source_error_is_not_reported_as_success():
+    """Test a cursor failing halfway aborts the body instead of closing the envelope"""
+    async def failing_batches():
+        yield [{"a": 1}]
+        raise RuntimeError("cursor killed")
+
+    stream = stream_json_array(
+        failing_batches(), dumps, prefix=b'{"data":', suffix=b',"success":true}'
+    )
+    chunks = []
+    with pytest.raises(RuntimeError):
+        async for chunk in stream:
+            chunks.append(chunk)
+
+    assert b"success" not in b"".join(chunks)
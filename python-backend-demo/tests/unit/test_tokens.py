@@ -0,0 +1,85 @@
+"""Unit tests for access tokens and session verification"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.api.v1.endpoints.auth import verify_session
+from app.config import settings
+from app.core.tokens import access_token_signer, issue_access_token, read_access_token
+
+
+@pytest.fixture
+def jwt_mode(monkeypatch):
+    pytest.importorskip("jose")
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_MODE", "jwt")
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_SECRET", "test-secret")
+    access_token_signer.cache_clear()
+    yield
+    access_token_signer.cache_clear()
+
+
+def sessions(found=None):
+    repository = MagicMock()
+    repository.find = AsyncMock(return_value=found)
+    return repository
+
+
+def test_opaque_tokens_carry_only_the_session():
+    """Test opaque mode keeps the access_{sessionId} format"""
+    token = issue_access_token("s1", "u1")
+
+    assert token == "access_s1"
+    assert read_access_token(token).session_id == "s1"
+    assert read_access_token(token).user_id is None
+    assert read_access_token("eyJhbGciOiJIUzI1NiJ9.e30.x") is None
+    assert read_access_token(None) is None
+
+
+@pytest.mark.asyncio
+async def test_verify_opaque_token_reads_session():
+    """Test opaque tokens are checked against the session store"""
+    repository = sessions({"userId": "u1"})
+
+    result = await verify_session("access_s1", repository)
+
+    assert result["session"] == {"handle": "s1", "userId": "u1", "userDataInJWT": {}}
+    repository.find.assert_awaited_once_with("s1")
+    assert (await verify_session("access_s2", sessions(None)))["status"] == "UNAUTHORISED"
+
+
+def test_signed_token_round_trip(jwt_mode, monkeypatch):
+    """Test signed tokens verify locally and reject tampering and expiry"""
+    token = issue_access_token("s1", "u1")
+    claims = read_access_token(token)
+
+    assert claims.session_id == "s1"
+    assert claims.user_id == "u1"
+    assert read_access_token(token[:-2] + "xx") is None
+
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_TTL_SECONDS", -10)
+    access_token_signer.cache_clear()
+    expired = issue_access_token("s1", "u1")
+    assert read_access_token(expired) is None
+    assert read_access_token(expired, verify_expiry=False).session_id == "s1"
+
+
+@pytest.mark.asyncio
+async def test_verify_signed_token_skips_session_read(jwt_mode):
+    """Test signed access tokens are verified without reading the session"""
+    repository = sessions()
+
+    result = await verify_session(issue_access_token("s1", "u1"), repository)
+
+    assert result["status"] == "OK"
+    assert result["session"]["userId"] == "u1"
+    repository.find.assert_not_awaited()
+
+
+def test_signed_mode_requires_secret(monkeypatch):
+    """Test jwt mode refuses to sign with an empty secret"""
+    monkeypatch.setattr(settings, "ACCESS_TOKEN_SECRET", "")
+    access_token_signer.cache_clear()
+
+    with pytest.raises(ValueError):
+        access_token_signer()
+    access_token_signer.cache_clear()
@@ -0,0 +1,189 @@
+"""Unit tests for the compiled menu and order view transformers"""
+
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.core.transformers import (
+    ORDER_VIEW_STAGE,
+    compile_transformer,
+    transform_menu,
+    transform_menu_compiled,
+    transform_restaurant_order,
+    transform_restaurant_order_compiled,
+)
+from app.services.menu_service import encode_menu_response
+from app.models.schemas.menu import MenuResponse
+from app.models.schemas.response import ApiResponse
+from benchmarks import data
+
+
+def assert_same_output(menu: dict) -> None:
+    """Compiled and reference transforms must serialize identically, key order included"""
+    assert json.dumps(transform_menu_compiled(menu)) == json.dumps(transform_menu(menu))
+
+
+def test_compiled_matches_reference_for_benchmark_menu():
+    """Test a full multilingual menu"""
+    assert_same_output(data.menu(50))
+
+
+def test_compiled_matches_reference_for_missing_fields():
+    """Test defaults for absent keys at every level"""
+    assert_same_output({})
+    assert_same_output({
+        "items": [{"modifiers": [{"options": [{}]}], "variants": [{}]}],
+        "categories": [{}],
+    })
+
+
+@pytest.mark.parametrize("name", ["Coffee", None, 42, {"en": "Coffee"}, {}])
+def test_compiled_matches_reference_for_name_shapes(name):
+    """Test plain strings, None, non-text values and partial translations"""
+    assert_same_output({
+        "name": name,
+        "categories": [{"id": "c1", "name": name, "description": name}],
+        "items": [
+            {"id": "i1", "name": name, "modifiers": [{"name": name, "options": [{"name": name}]}]}
+        ],
+    })
+
+
+def test_compiled_transformer_exposes_source():
+    """Test the generated source is kept for debugging"""
+    transformer = compile_transformer([("id", "value", "")], "transform_id")
+
+    assert transformer({"id": "x", "other": 1}) == {"id": "x"}
+    assert transformer.__name__ == "transform_id"
+    assert "def transform_id(document)" in transformer.source
+
+
+def test_compile_transformer_rejects_unknown_kind():
+    """Test a typo in a spec fails at build time"""
+    with pytest.raises(ValueError):
+        compile_transformer([("id", "number", 0)], "broken")
+
+
+def test_encode_menu_response_matches_model_encode():
+    """Test the adapter produces the same bytes as building the response model"""
+    menu = transform_menu(data.menu(20))
+    expected = ApiResponse[MenuResponse](data=MenuResponse(**menu)).model_dump_json(by_alias=True)
+
+    assert encode_menu_response(transform_menu_compiled(data.menu(20))) == expected.encode()
+
+
+# Restaurant order view
+
+MISSING = object()
+
+
+def evaluate(expression, document, variables=None):
+    """Evaluate the aggregation operators the order view stage uses"""
+    variables = variables or {}
+    if isinstance(expression, str) and expression.startswith("$$"):
+        name, *path = expression[2:].split(".")
+        value = variables[name]
+        for key in path:
+            value = value.get(key, MISSING) if isinstance(value, dict) else MISSING
+        return value
+    if isinstance(expression, str) and expression.startswith("$"):
+        value = document
+        for key in expression[1:].split("."):
+            value = value.get(key, MISSING) if isinstance(value, dict) else MISSING
+        return value
+    if isinstance(expression, list):
+        return [evaluate(e, document, variables) for e in expression]
+    if not isinstance(expression, dict):
+        return expression
+
+    if len(expression) == 1:
+        (operator, argument), = expression.items()
+        if operator == "$literal":
+            return argument
+        if operator == "$type":
+            return "missing" if evaluate(argument, document, variables) is MISSING else "other"
+        if operator == "$eq":
+            left, right = (evaluate(a, document, variables) for a in argument)
+            return left == right
+        if operator == "$cond":
+            condition, then, otherwise = argument
+            chosen = then if evaluate(condition, document, variables) else otherwise
+            return evaluate(chosen, document, variables)
+        if operator == "$ifNull":
+            value = evaluate(argument[0], document, variables)
+            return evaluate(argument[1], document, variables) if value in (None, MISSING) else value
+        if operator == "$toString":
+            return str(evaluate(argument, document, variables))
+        if operator == "$map":
+            elements = evaluate(argument["input"], document, variables)
+            return [
+                evaluate(argument["in"], document, {**variables, argument["as"]: element})
+                for element in elements
+            ]
+
+    result = {}
+    for key, value in expression.items():
+        value = evaluate(value, document, variables)
+        if value is not MISSING:
+            result[key] = value
+    return result
+
+
+def raw_order(**overrides) -> dict:
+    """Order as stored in MongoDB"""
+    order = {
+        "_id": ObjectId(),
+        "orderId": "ORD-1",
+        "restaurantId": "r1",
+        "locationId": "l1",
+        "paymentId": None,
+        "customer": {"name": "Ana", "phone": "+15550100"},
+        "origin": None,
+        "items": [
+            {
+                "id": "i1",
+                "menuItemId": "m1",
+                "name": "Burger",
+                "price": 1000,
+                "stationTags": ["grill"],
+            },
+            {"id": "i2", "startedAt": datetime(2024, 1, 1, 12, 5), "notes": None},
+        ],
+        "status": "order_accepted",
+        "totalCents": 1080,
+        "createdAt": datetime(2024, 1, 1, 12, 0),
+    }
+    order.update(overrides)
+    return order
+
+
+@pytest.mark.parametrize("order", [
+    raw_order(),
+    raw_order(items=None, customer=None),
+    raw_order(correlationId="corr-1", pickedUpAt=datetime(2024, 1, 1, 12, 30)),
+    {"_id": ObjectId()},
+])
+def test_order_view_paths_agree(order):
+    """Test the reference, compiled and $project order views are identical, key order included"""
+    as_read = {**order, "_id": str(order["_id"])}
+
+    reference = transform_restaurant_order(as_read)
+    compiled = transform_restaurant_order_compiled(as_read)
+    projected = evaluate(ORDER_VIEW_STAGE["$project"], order)
+
+    assert list(compiled) == list(reference)
+    assert compiled == reference
+    assert projected == reference
+    assert list(projected) == list(reference)
+
+
+def test_order_view_correlation_id_is_stable():
+    """Test repeated polls see the same correlation id"""
+    order = raw_order(_id="abc")
+
+    first = transform_restaurant_order_compiled(order)["meta"]["correlationId"]
+    second = transform_restaurant_order(order)["meta"]["correlationId"]
+
+    assert first == second == "abc"